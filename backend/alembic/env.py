@@ -15,7 +15,15 @@ from app.core.config import settings
 from app.db.session import Base
 
 # Import all models here to ensure they're registered with Base
-from app.models import JobHistory, Lead, StripeEvent, SystemState, User  # noqa: F401
+from app.models import (  # noqa: F401
+    DailyRunShard,
+    JobHistory,
+    Lead,
+    SheetRowFingerprint,
+    StripeEvent,
+    SystemState,
+    User,
+)
 
 # this is the Alembic Config object
 config = context.config
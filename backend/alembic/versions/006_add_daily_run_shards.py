@@ -0,0 +1,49 @@
+"""Add daily_run_shards table for resumable daily processing
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_run_shards",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("run_date", sa.Date(), nullable=False),
+        sa.Column("shard_index", sa.Integer(), nullable=False),
+        sa.Column("shard_count", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=10), server_default=sa.text("'pending'"), nullable=False),
+        sa.Column("last_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("users_processed", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("users_failed", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("drafts_created", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("invoices_checked", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("NOW()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("NOW()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("run_date", "shard_index", name="uq_daily_run_shards_date_index"),
+        sa.CheckConstraint(
+            "status IN ('pending', 'running', 'done')", name="check_daily_run_shard_status"
+        ),
+    )
+    op.create_index("idx_daily_run_shards_run_date", "daily_run_shards", ["run_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_daily_run_shards_run_date", table_name="daily_run_shards")
+    op.drop_table("daily_run_shards")
@@ -0,0 +1,30 @@
+"""Add cached Google access token columns to users table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+Stores the short-lived access token (Fernet-encrypted, like the refresh
+token) and its expiry so API calls across requests and cron runs reuse it
+instead of hitting the token endpoint every time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("google_access_token_encrypted", sa.Text(), nullable=True))
+    op.add_column("users", sa.Column("google_access_token_expires_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "google_access_token_expires_at")
+    op.drop_column("users", "google_access_token_encrypted")
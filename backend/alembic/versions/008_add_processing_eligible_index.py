@@ -0,0 +1,39 @@
+"""Add partial index on users eligible for daily processing
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+The daily run selects only eligible user ids in id order per shard; this
+index covers exactly those rows so the scan never touches inactive,
+disconnected or sheet-less users.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROCESSING_ELIGIBLE_SQL = (
+    "active AND sheet_id IS NOT NULL"
+    " AND google_refresh_token_encrypted IS NOT NULL"
+    " AND NOT google_token_revoked"
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_users_processing_eligible",
+        "users",
+        ["id"],
+        postgresql_where=sa.text(PROCESSING_ELIGIBLE_SQL),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_users_processing_eligible", table_name="users")
@@ -0,0 +1,43 @@
+"""Add sheet_row_fingerprints table for incremental sheet processing
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sheet_row_fingerprints",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sheet_id", sa.Text(), nullable=False),
+        sa.Column("row_number", sa.Integer(), nullable=False),
+        sa.Column("invoice_number", sa.Text(), server_default=sa.text("''"), nullable=False),
+        sa.Column("fingerprint", sa.Text(), nullable=False),
+        sa.Column("paid", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("amount", sa.Numeric(precision=12, scale=2), server_default=sa.text("0"), nullable=False),
+        sa.Column("next_action_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("NOW()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint("user_id", "row_number", name="uq_sheet_row_fingerprints_user_row"),
+    )
+    op.create_index("idx_sheet_row_fingerprints_user", "sheet_row_fingerprints", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_sheet_row_fingerprints_user", table_name="sheet_row_fingerprints")
+    op.drop_table("sheet_row_fingerprints")
@@ -0,0 +1,47 @@
+"""Add users.next_action_date so the daily run skips users with nothing due
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+The processing-eligibility partial index is rebuilt to include the column,
+so the per-shard keyset scan filters on it from the index alone.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROCESSING_ELIGIBLE_SQL = (
+    "active AND sheet_id IS NOT NULL"
+    " AND google_refresh_token_encrypted IS NOT NULL"
+    " AND NOT google_token_revoked"
+)
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("next_action_date", sa.Date(), nullable=True))
+    op.drop_index("idx_users_processing_eligible", table_name="users")
+    op.create_index(
+        "idx_users_processing_eligible",
+        "users",
+        ["id", "next_action_date"],
+        postgresql_where=sa.text(PROCESSING_ELIGIBLE_SQL),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_users_processing_eligible", table_name="users")
+    op.create_index(
+        "idx_users_processing_eligible",
+        "users",
+        ["id"],
+        postgresql_where=sa.text(PROCESSING_ELIGIBLE_SQL),
+    )
+    op.drop_column("users", "next_action_date")
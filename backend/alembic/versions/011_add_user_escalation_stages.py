@@ -0,0 +1,26 @@
+"""Add users.escalation_stages for per-user reminder schedules
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+NULL keeps the default 7/14/21/28/35/42-day schedule.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("escalation_stages", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "escalation_stages")
@@ -1,18 +1,33 @@
 """
 Cron-triggered API routes.
 """
+import asyncio
 import logging
+import time
+from datetime import date
 from typing import Any
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, session_factory_for
+from app.models.daily_run_shard import DailyRunShard
 from app.models.user import User
 from app.services.system_state import get_system_paused
 from app.services.daily_processing import process_user_invoices
+from app.services.daily_run import (
+    DailyRunSummary,
+    checkpoint_shard,
+    claim_next_shard,
+    complete_shard,
+    count_unfinished_shards,
+    ensure_run_shards,
+    hold_shard_lease,
+    next_user_chunk,
+    release_shard,
+)
 from app.services.alerts import report_exception, send_discord_alert
 
 router = APIRouter(prefix="/api/cron", tags=["cron"])
@@ -27,6 +42,115 @@ def _require_cron_secret(x_cron_secret: str | None) -> None:
         raise HTTPException(status_code=401, detail="Invalid cron secret")
 
 
+async def _process_user(
+    user_id: UUID,
+    session_factory: async_sessionmaker,
+    summary: DailyRunSummary,
+) -> None:
+    """
+    Process one user in its own DB session and fold the outcome into summary.
+
+    Each user gets an independent session so a failure (and rollback) for
+    one user never discards another user's job_history or token updates.
+    """
+    async with session_factory() as session:
+        try:
+            user = await session.get(User, user_id)
+            if user is None:
+                return
+            proc_result = await process_user_invoices(user, session)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            summary.failed += 1
+            summary.errors.append(f"{user_id}: {e}")
+            logger.exception("Daily cron processing failed for user %s", user_id)
+            await report_exception(
+                "Daily cron processing failed",
+                e,
+                {
+                    "route": "/api/cron/trigger-daily",
+                    "user_id": str(user_id),
+                },
+            )
+            return
+
+    summary.drafts_created += proc_result.drafts_created
+    summary.invoices_checked += proc_result.invoices_checked
+    if proc_result.errors:
+        summary.failed += 1
+        summary.errors.append(f"{user_id}: {proc_result.errors}")
+        await send_discord_alert(
+            "Daily cron user processing errors",
+            "process_user_invoices returned errors",
+            {
+                "route": "/api/cron/trigger-daily",
+                "user_id": str(user_id),
+                "errors": [str(error) for error in proc_result.errors],
+            },
+        )
+    else:
+        summary.processed += 1
+
+
+async def _run_users_concurrently(
+    user_ids: list[UUID],
+    session_factory: async_sessionmaker,
+) -> DailyRunSummary:
+    """
+    Process users with at most DAILY_PROCESSING_CONCURRENCY running at once.
+
+    Counts are aggregated into a single summary so the cron response shape
+    is the same as the old sequential loop.
+    """
+    summary = DailyRunSummary()
+    semaphore = asyncio.Semaphore(max(1, settings.daily_processing_concurrency))
+
+    async def _bounded(user_id: UUID) -> None:
+        async with semaphore:
+            await _process_user(user_id, session_factory, summary)
+
+    await asyncio.gather(*(_bounded(user_id) for user_id in user_ids))
+    return summary
+
+
+async def _run_shard(
+    shard: DailyRunShard,
+    db: AsyncSession,
+    session_factory: async_sessionmaker,
+    summary: DailyRunSummary,
+    deadline: float,
+) -> tuple[int, bool]:
+    """
+    Work through a claimed shard chunk by chunk, checkpointing after each.
+
+    At least one chunk is processed per call so every trigger makes progress.
+    Returns (users attempted, whether the shard finished). An unfinished shard
+    is released back to pending with its checkpoint for the next trigger.
+    """
+    users_attempted = 0
+    while True:
+        user_ids = await next_user_chunk(db, shard, max(1, settings.daily_run_chunk_size))
+        if not user_ids:
+            await complete_shard(db, shard)
+            return users_attempted, True
+
+        last_user_id = user_ids[-1]
+        async with hold_shard_lease(session_factory, shard):
+            chunk = await _run_users_concurrently(user_ids, session_factory)
+        await checkpoint_shard(db, shard, last_user_id, chunk)
+        summary.merge(chunk)
+        users_attempted += len(user_ids)
+
+        if time.monotonic() >= deadline:
+            logger.info(
+                "Daily run time budget reached; releasing shard %s/%s at %s",
+                shard.shard_index, shard.shard_count, last_user_id,
+            )
+            await release_shard(db, shard)
+            return users_attempted, False
+
+
 @router.post("/trigger-daily")
 async def trigger_daily_processing(
     db: AsyncSession = Depends(get_db),
@@ -35,7 +159,12 @@ async def trigger_daily_processing(
     """
     Trigger daily invoice processing for all active users.
 
-    Processes each user's invoices directly via Google APIs.
+    Processes each user's invoices directly via Google APIs, up to
+    DAILY_PROCESSING_CONCURRENCY users at a time, each in its own session.
+
+    The run is split into user-id shards with checkpoints in daily_run_shards.
+    Each call works until DAILY_RUN_TIME_BUDGET_SECONDS is spent, then returns;
+    calling again (or from several workers at once) resumes unfinished shards.
     Protected by DIGEST_CRON_SECRET via x-cron-secret header.
     """
     try:
@@ -45,64 +174,39 @@ async def trigger_daily_processing(
         if paused:
             return {"success": True, "message": "System is paused", "users_total": 0, "processed": 0}
 
-        # Get active users with a sheet and valid Google connection
-        result = await db.execute(select(User).where(User.active))
-        all_users = result.scalars().all()
-        eligible_users = [
-            u for u in all_users
-            if u.sheet_id
-            and u.google_refresh_token_encrypted
-            and not u.google_token_revoked
-        ]
-
-        processed = 0
-        failed = 0
-        total_drafts = 0
-        total_invoices = 0
-        errors: list[str] = []
-
-        for user in eligible_users:
-            try:
-                proc_result = await process_user_invoices(user, db)
-                total_drafts += proc_result.drafts_created
-                total_invoices += proc_result.invoices_checked
-                if proc_result.errors:
-                    failed += 1
-                    errors.append(f"{user.id}: {proc_result.errors}")
-                    await send_discord_alert(
-                        "Daily cron user processing errors",
-                        "process_user_invoices returned errors",
-                        {
-                            "route": "/api/cron/trigger-daily",
-                            "user_id": str(user.id),
-                            "errors": [str(error) for error in proc_result.errors],
-                        },
-                    )
-                else:
-                    processed += 1
-            except Exception as e:
-                failed += 1
-                errors.append(f"{user.id}: {e}")
-                logger.exception("Daily cron processing failed for user %s", user.id)
-                await report_exception(
-                    "Daily cron processing failed",
-                    e,
-                    {
-                        "route": "/api/cron/trigger-daily",
-                        "user_id": str(user.id),
-                    },
-                )
-
-        await db.commit()
+        run_date = date.today()
+        deadline = time.monotonic() + settings.daily_run_time_budget_seconds
+        await ensure_run_shards(db, run_date)
+
+        summary = DailyRunSummary()
+        users_total = 0
+        shards_completed = 0
+        session_factory = session_factory_for(db)
+
+        while True:
+            shard = await claim_next_shard(db, run_date)
+            if shard is None:
+                break
+            shard_users, finished = await _run_shard(shard, db, session_factory, summary, deadline)
+            users_total += shard_users
+            if not finished:
+                break
+            shards_completed += 1
+            if time.monotonic() >= deadline:
+                break
+
+        shards_remaining = await count_unfinished_shards(db, run_date)
 
         return {
-            "success": failed == 0,
-            "users_total": len(eligible_users),
-            "processed": processed,
-            "failed": failed,
-            "drafts_created": total_drafts,
-            "invoices_checked": total_invoices,
-            "errors": errors,
+            "success": summary.failed == 0,
+            "users_total": users_total,
+            "processed": summary.processed,
+            "failed": summary.failed,
+            "drafts_created": summary.drafts_created,
+            "invoices_checked": summary.invoices_checked,
+            "errors": summary.errors,
+            "shards_completed": shards_completed,
+            "shards_remaining": shards_remaining,
         }
     except HTTPException:
         raise
@@ -6,14 +6,12 @@ Provides endpoints for:
 """
 import logging
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.session import get_db
-from app.models.user import User
 from app.schemas.digest import DigestSendRequest, DigestSendResponse
-from app.services.digest import calculate_digest, send_digest_email
+from app.services.digest import digest_from_row, iter_weekly_digest_rows, send_digest_email
 
 router = APIRouter(prefix="/api/digest", tags=["digest"])
 logger = logging.getLogger(__name__)
@@ -47,47 +45,30 @@ async def send_weekly_digests(
         logger.warning("Invalid digest cron secret provided")
         raise HTTPException(status_code=401, detail="Invalid cron secret")
     
-    # Query all active users
-    result = await db.execute(
-        select(User).where(User.active == True)
-    )
-    users = result.scalars().all()
-    
-    logger.info(f"Starting weekly digest send for {len(users)} active users")
-    
-    # Send digest to each user
+    logger.info("Starting weekly digest send for active users")
+
+    # Digests for all active users with drafts this week, one grouped query
+    # streamed in chunks (users without drafts are not returned)
     emails_sent = 0
     emails_failed = 0
-    
-    for user in users:
-        try:
-            # Calculate digest data
-            digest_data = await calculate_digest(user.id, db)
-            
-            if not digest_data:
-                logger.warning(f"Could not calculate digest for user {user.id}")
-                emails_failed += 1
-                continue
-            
-            # Skip users with no activity (0 drafts)
-            if digest_data.drafts_count == 0:
-                logger.debug(f"Skipping user {user.id} - no drafts this week")
-                continue
-            
-            # Send email
-            success = await send_digest_email(digest_data)
-            
-            if success:
-                emails_sent += 1
-                logger.info(f"Digest sent successfully to {user.email}")
-            else:
+
+    async for rows in iter_weekly_digest_rows(db):
+        for row in rows:
+            try:
+                digest_data = digest_from_row(row)
+                success = await send_digest_email(digest_data)
+
+                if success:
+                    emails_sent += 1
+                    logger.info(f"Digest sent successfully to {row.email}")
+                else:
+                    emails_failed += 1
+                    logger.error(f"Failed to send digest to {row.email}")
+
+            except Exception as e:
                 emails_failed += 1
-                logger.error(f"Failed to send digest to {user.email}")
-                
-        except Exception as e:
-            emails_failed += 1
-            logger.error(f"Error processing digest for user {user.id}: {str(e)}")
-    
+                logger.error(f"Error processing digest for user {row.id}: {str(e)}")
+
     # Return summary
     total_processed = emails_sent + emails_failed
     success = emails_failed == 0
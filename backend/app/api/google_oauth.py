@@ -17,7 +17,14 @@ from app.core.auth import require_auth
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
-from app.services.google_tokens import encrypt_token, get_google_credentials, GOOGLE_SCOPES
+from app.services.google_executor import run_google_call
+from app.services.google_tokens import (
+    encrypt_token,
+    ensure_fresh_credentials,
+    forget_access_token,
+    get_google_credentials,
+    GOOGLE_SCOPES,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +54,14 @@ def _build_flow(state: str | None = None) -> Flow:
     return flow
 
 
+def _fetch_userinfo(credentials) -> dict:
+    """Fetch the Google account's userinfo (blocking; run via run_google_call)."""
+    from app.services.google_clients import get_service
+
+    oauth2_service = get_service("oauth2", "v2", credentials)
+    return oauth2_service.userinfo().get().execute()
+
+
 @router.get("/connect")
 async def connect_google(current_user: User = Depends(require_auth)):
     """
@@ -130,7 +145,7 @@ async def google_callback(
     if code_verifier:
         flow.code_verifier = code_verifier
     try:
-        flow.fetch_token(code=code)
+        await run_google_call(flow.fetch_token, code=code)
     except Exception as e:
         import traceback
         tb = traceback.format_exc()
@@ -153,10 +168,7 @@ async def google_callback(
 
         # If we didn't get email from ID token, fetch it from userinfo
         if not google_email:
-            from googleapiclient.discovery import build
-
-            oauth2_service = build("oauth2", "v2", credentials=credentials, cache_discovery=False)
-            user_info = oauth2_service.userinfo().get().execute()
+            user_info = await run_google_call(_fetch_userinfo, credentials)
             google_email = user_info.get("email")
     except Exception as e:
         logger.error(f"Failed to get Google email: {type(e).__name__}: {e}")
@@ -172,9 +184,11 @@ async def google_callback(
             raise HTTPException(status_code=404, detail="User not found")
 
         user.google_refresh_token_encrypted = encrypt_token(credentials.refresh_token)
+        forget_access_token(user)
         user.google_email = google_email
         user.google_connected_at = datetime.utcnow()
         user.google_token_revoked = False
+        user.next_action_date = None  # evaluate on the next run
 
         await db.commit()
 
@@ -204,10 +218,8 @@ async def get_picker_config(current_user: User = Depends(require_auth)):
         raise HTTPException(status_code=503, detail="Google API key not configured")
 
     try:
-        creds = get_google_credentials(current_user)
-        # Force a token refresh to get a valid access token
-        from google.auth.transport.requests import Request as GoogleAuthRequest
-        creds.refresh(GoogleAuthRequest())
+        # Reuse the cached access token; refreshes only when close to expiry
+        creds = await ensure_fresh_credentials(current_user, get_google_credentials(current_user))
 
         return {
             "api_key": settings.google_api_key,
@@ -248,6 +260,7 @@ async def disconnect_google(
     current_user.google_email = None
     current_user.google_connected_at = None
     current_user.google_token_revoked = True
+    forget_access_token(current_user)
 
     await db.commit()
 
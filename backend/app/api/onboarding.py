@@ -18,7 +18,7 @@ from app.core.auth import require_auth
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema
-from app.services.google_tokens import get_google_credentials
+from app.services.google_tokens import ensure_fresh_credentials, get_google_credentials
 from app.services import google_sheets
 
 logger = logging.getLogger(__name__)
@@ -84,8 +84,8 @@ async def validate_sheet(
     _require_google_connected(current_user)
 
     try:
-        creds = get_google_credentials(current_user)
-        columns = google_sheets.validate_sheet_columns(creds, request.sheet_id)
+        creds = await ensure_fresh_credentials(current_user, get_google_credentials(current_user))
+        columns = await google_sheets.validate_sheet_columns_async(creds, request.sheet_id)
         missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
         return SheetValidationResponse(
             valid=len(missing_columns) == 0,
@@ -112,6 +112,7 @@ async def select_sheet(
     sheet_id = match.group(1) if match else raw
 
     current_user.sheet_id = sheet_id
+    current_user.next_action_date = None  # new sheet: evaluate on the next run
     await db.commit()
     await db.refresh(current_user)
 
@@ -128,8 +129,8 @@ async def create_template(current_user: User = Depends(require_auth)):
     _require_google_connected(current_user)
 
     try:
-        creds = get_google_credentials(current_user)
-        result = google_sheets.create_template_sheet(creds)
+        creds = await ensure_fresh_credentials(current_user, get_google_credentials(current_user))
+        result = await google_sheets.create_template_sheet_async(creds)
         return CreateTemplateResponse(sheet_id=result["sheet_id"], sheet_url=result["sheet_url"])
     except Exception as e:
         logger.error(f"Failed to create template for user {current_user.id}: {e}")
@@ -15,6 +15,8 @@ from app.core.auth import require_auth
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate, UserConfig
+from app.services.escalation import schedule_for
+from app.services.row_fingerprints import clear_row_fingerprints
 from app.services.system_state import get_system_paused
 
 router = APIRouter(prefix="/api/users", tags=["users"])
@@ -37,7 +39,8 @@ async def get_user_config(
     """
     Get user configuration for daily processing.
 
-    Returns sheet_id, sender_name, business_name, plan, and invoice_limit.
+    Returns sheet_id, sender_name, business_name, plan, invoice_limit and the
+    effective escalation_stages.
     """
     # Fetch user from database
     result = await db.execute(
@@ -63,6 +66,7 @@ async def get_user_config(
         paused=paused,
         plan=user.plan,
         invoice_limit=invoice_limit,
+        escalation_stages=list(schedule_for(user.escalation_stages).stages),
     )
 
 
@@ -106,8 +110,21 @@ async def update_user(
     
     # Update fields
     update_data = user_update.model_dump(exclude_unset=True)
+    sheet_changed = "sheet_id" in update_data and update_data["sheet_id"] != user.sheet_id
+    stages_changed = (
+        "escalation_stages" in update_data
+        and update_data["escalation_stages"] != user.escalation_stages
+    )
     for field, value in update_data.items():
         setattr(user, field, value)
+
+    if sheet_changed:
+        user.next_action_date = None  # new sheet: evaluate on the next run
+
+    if stages_changed:
+        # Stored next-action dates follow the old schedule: re-evaluate every row
+        user.next_action_date = None
+        await clear_row_fingerprints(db, user)
     
     await db.commit()
     await db.refresh(user)
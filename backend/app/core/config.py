@@ -65,7 +65,23 @@ class Settings(BaseSettings):
     google_client_secret: str = ""
     google_redirect_uri: str = ""
     google_token_encryption_key: str = ""  # Fernet key for encrypting refresh tokens
+    google_access_token_refresh_margin_seconds: int = 300  # Refresh access tokens this early
     google_api_key: str = ""  # API key for Google Picker JS (browser-side)
+    google_api_max_workers: int = 16  # Thread pool size for blocking Google API calls
+    google_api_batch_max_workers: int = 16  # Separate pool for daily-run calls (quota waits sleep there)
+    google_http_pool_maxsize: int = 16  # Keep-alive connections per Google host
+    google_http_connect_timeout_seconds: float = 10.0
+    google_http_read_timeout_seconds: float = 60.0
+    # Google API quotas, enforced client-side with token buckets (0 = no limit)
+    google_sheets_reads_per_minute: int = 300  # Per project
+    google_sheets_reads_per_minute_per_user: int = 60
+    google_sheets_writes_per_minute: int = 300  # Per project
+    google_sheets_writes_per_minute_per_user: int = 60
+    google_gmail_units_per_minute: int = 1_200_000  # Per project (drafts.create = 10 units)
+    google_gmail_units_per_minute_per_user: int = 15_000
+    google_api_max_retries: int = 5  # Retries of a rate-limited (429) Google call
+    google_api_backoff_seconds: float = 1.0  # First retry window; doubles per attempt (jittered)
+    google_api_backoff_max_seconds: float = 60.0  # Longest retry wait, incl. Retry-After
 
     # Resend
     resend_api_key: str = ""
@@ -73,6 +89,20 @@ class Settings(BaseSettings):
 
     # Digest Cron
     digest_cron_secret: str = ""
+    digest_chunk_size: int = 500  # Users' digests fetched per round trip by the send run
+
+    # Daily processing
+    daily_processing_concurrency: int = 5  # Users processed in parallel per cron run
+    daily_run_shard_count: int = 8  # User-id ranges a day's run is split into
+    daily_run_chunk_size: int = 50  # Users processed between shard checkpoints
+    daily_run_time_budget_seconds: int = 240  # Stop claiming work after this (serverless timeout)
+    daily_run_shard_lease_seconds: int = 600  # A running shard idle this long is reclaimable
+    sheet_write_batch_size: int = 50  # Row write-backs buffered per values.batchUpdate
+    gmail_draft_batch_size: int = 50  # Drafts per Gmail batch request (API max 100)
+    draft_pipeline_depth: int = 2  # Gmail draft batches in flight at once per user
+    next_action_rescan_days: int = 7  # Re-read a quiet user's sheet at least this often
+    sheet_snapshot_cache_max_rows: int = 100_000  # Rows of parsed sheets kept in memory (LRU)
+    sheet_read_window_rows: int = 1000  # Data rows fetched per request when streaming a sheet
 
     # System control
     system_control_secret: str = ""
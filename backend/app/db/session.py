@@ -37,6 +37,23 @@ def _get_session_factory():
     return _session_factory
 
 
+def session_factory_for(db: AsyncSession) -> async_sessionmaker:
+    """
+    Session factory bound to the same engine as an existing session.
+
+    Used by fan-out work (e.g. the daily cron) that needs one independent
+    session per task while still honoring whatever engine the request
+    session was given — including test overrides.
+    """
+    return async_sessionmaker(
+        db.bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
 async def get_db() -> AsyncSession:
     """Dependency for getting async database sessions"""
     factory = _get_session_factory()
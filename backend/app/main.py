@@ -17,6 +17,7 @@ from contextlib import asynccontextmanager
 from sentry_sdk.integrations.logging import LoggingIntegration
 
 from app.core.config import settings
+from app.services.google_executor import shutdown_google_executor
 
 
 def _logging_level() -> int:
@@ -72,6 +73,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Smart Invoice SaaS Backend env=%s", settings.environment)
     yield
     logger.info("Shutting down Smart Invoice SaaS Backend")
+    shutdown_google_executor()
 
 
 # Create FastAPI application
@@ -6,5 +6,7 @@ from app.models.job_history import JobHistory
 from app.models.system_state import SystemState
 from app.models.stripe_event import StripeEvent
 from app.models.lead import Lead
+from app.models.daily_run_shard import DailyRunShard
+from app.models.sheet_row_fingerprint import SheetRowFingerprint
 
-__all__ = ["User", "JobHistory", "SystemState", "StripeEvent", "Lead"]
+__all__ = ["User", "JobHistory", "SystemState", "StripeEvent", "Lead", "DailyRunShard", "SheetRowFingerprint"]
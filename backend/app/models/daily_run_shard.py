@@ -0,0 +1,65 @@
+"""
+Daily run shard checkpoint model.
+"""
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import CheckConstraint, Date, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class DailyRunShard(Base):
+    """
+    Progress of one user-id range of a day's invoice processing run.
+
+    The daily cron splits the user table into ``shard_count`` contiguous
+    user-id ranges. Each invocation claims unfinished shards, walks users in
+    id order and checkpoints ``last_user_id`` after every chunk, so a timed
+    out or crashed invocation is resumed by the next trigger instead of
+    starting over.
+    """
+
+    __tablename__ = "daily_run_shards"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    run_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    shard_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    shard_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # pending → running → done (running shards with a stale lease are reclaimable)
+    status: Mapped[str] = mapped_column(
+        String(10), default="pending", server_default="pending", nullable=False
+    )
+    last_user_id: Mapped[UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # Running totals for the shard across all invocations
+    users_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    users_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    drafts_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    invoices_checked: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.utcnow(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.utcnow(),
+        onupdate=lambda: datetime.utcnow(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("run_date", "shard_index", name="uq_daily_run_shards_date_index"),
+        CheckConstraint(
+            "status IN ('pending', 'running', 'done')", name="check_daily_run_shard_status"
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DailyRunShard(run_date={self.run_date}, shard={self.shard_index}/{self.shard_count}, "
+            f"status={self.status})>"
+        )
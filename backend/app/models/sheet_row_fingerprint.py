@@ -0,0 +1,60 @@
+"""
+Sheet row fingerprint model.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class SheetRowFingerprint(Base):
+    """
+    Last evaluated state of one row of a user's invoice sheet.
+
+    The daily run hashes the columns that drive reminders for every row and
+    compares the hash with the stored one. Unchanged rows reuse the stored
+    paid flag and amount, and are only re-evaluated once ``next_action_date``
+    (the day the next escalation stage is reached) has arrived.
+    """
+
+    __tablename__ = "sheet_row_fingerprints"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    sheet_id: Mapped[str] = mapped_column(Text, nullable=False)
+    row_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    invoice_number: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    fingerprint: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Cached parse results for unchanged rows
+    paid: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=Decimal("0"))
+    # NULL = no reminder can become due without the row changing
+    next_action_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.utcnow(),
+        onupdate=lambda: datetime.utcnow(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "row_number", name="uq_sheet_row_fingerprints_user_row"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SheetRowFingerprint(user_id={self.user_id}, row={self.row_number}, "
+            f"invoice={self.invoice_number}, next_action={self.next_action_date})>"
+        )
@@ -1,15 +1,22 @@
 """
 User database model.
 """
-from datetime import datetime
+from datetime import date, datetime
 from uuid import uuid4
 
-from sqlalchemy import Boolean, String, Text, DateTime, CheckConstraint
+from sqlalchemy import Boolean, JSON, String, Text, Date, DateTime, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
 
+# Users the daily run should process; backs the partial index below
+PROCESSING_ELIGIBLE_SQL = (
+    "active AND sheet_id IS NOT NULL"
+    " AND google_refresh_token_encrypted IS NOT NULL"
+    " AND NOT google_token_revoked"
+)
+
 
 class User(Base):
     """User model representing a SaaS customer."""
@@ -29,12 +36,18 @@ class User(Base):
     
     # Google Sheets integration
     sheet_id: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Earliest day the daily run has work for this user (NULL = unknown, process)
+    next_action_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # Custom escalation stages in days overdue, e.g. [30, 45, 60] (NULL = default STAGES)
+    escalation_stages: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
 
     # Google OAuth (direct API)
     google_refresh_token_encrypted: Mapped[str | None] = mapped_column(Text, nullable=True)
     google_email: Mapped[str | None] = mapped_column(Text, nullable=True)
     google_connected_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     google_token_revoked: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    google_access_token_encrypted: Mapped[str | None] = mapped_column(Text, nullable=True)
+    google_access_token_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     
     # Account status
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -69,6 +82,13 @@ class User(Base):
     # Table constraints
     __table_args__ = (
         CheckConstraint("plan IN ('free', 'paid')", name='check_plan_values'),
+        Index(
+            'idx_users_processing_eligible',
+            'id',
+            'next_action_date',
+            postgresql_where=text(PROCESSING_ELIGIBLE_SQL),
+            sqlite_where=text(PROCESSING_ELIGIBLE_SQL),
+        ),
     )
     
     def __repr__(self) -> str:
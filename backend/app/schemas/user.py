@@ -5,7 +5,9 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, model_validator
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator, model_validator
+
+from app.services.escalation import validate_stages
 
 
 class UserBase(BaseModel):
@@ -26,6 +28,16 @@ class UserUpdate(BaseModel):
     business_name: Optional[str] = Field(None, min_length=1, max_length=255)
     sheet_id: Optional[str] = Field(None, max_length=255)
     active: Optional[bool] = None
+    # Days overdue at which each reminder stage is drafted; null restores the default
+    escalation_stages: Optional[list[int]] = None
+
+    @field_validator("escalation_stages")
+    @classmethod
+    def check_escalation_stages(cls, stages):
+        """Stages must form a valid schedule (see escalation.validate_stages)."""
+        if stages is None:
+            return None
+        return list(validate_stages(stages))
 
 
 class User(UserBase):
@@ -37,6 +49,7 @@ class User(UserBase):
     google_connected: bool = False
     active: bool
     plan: str
+    escalation_stages: Optional[list[int]] = None
     stripe_customer_id: Optional[str] = None
     stripe_subscription_id: Optional[str] = None
     created_at: datetime
@@ -66,6 +79,7 @@ class User(UserBase):
                 ),
                 "active": data.active,
                 "plan": data.plan,
+                "escalation_stages": data.escalation_stages,
                 "stripe_customer_id": data.stripe_customer_id,
                 "stripe_subscription_id": data.stripe_subscription_id,
                 "created_at": data.created_at,
@@ -89,5 +103,6 @@ class UserConfig(BaseModel):
     paused: bool  # Global kill switch status
     plan: str
     invoice_limit: int  # 3 for free, 100 for paid
+    escalation_stages: list[int]  # Effective schedule (the default if not customised)
 
     model_config = ConfigDict(from_attributes=True)
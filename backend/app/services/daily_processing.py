@@ -5,23 +5,51 @@ Replaces the Make.com Daily Processing scenario with direct Google API calls.
 For each user: reads their sheet, finds overdue unpaid invoices, determines
 escalation stage, creates Gmail drafts, and updates the sheet.
 """
+import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.job_history import JobHistory
+from app.models.sheet_row_fingerprint import SheetRowFingerprint
 from app.models.user import User
-from app.services.escalation import days_overdue, stage_for, should_send_draft
+from app.services.date_parsing import SheetDateParser
+from app.services.escalation import (
+    DEFAULT_SCHEDULE,
+    EscalationSchedule,
+    days_overdue,
+    schedule_for,
+    should_send_draft,
+)
 from app.services.email_templates import get_subject, get_body_html
-from app.services.google_tokens import get_google_credentials
-from app.services.google_sheets import read_invoice_rows, update_row_cells, validate_sheet_columns
-from app.services.google_gmail import create_draft
+from app.services.google_tokens import (
+    ensure_fresh_credentials,
+    get_google_credentials,
+    remember_access_token,
+)
+from app.services.google_sheets import (
+    InvoiceSheet,
+    batch_update_rows_async,
+    iter_invoice_sheet_cached_async,
+)
+from app.services.invoice_rows import InvoiceRow, invoice_rows
+from app.services.google_gmail import DraftRequest, DraftResult, create_drafts_batch_async
+from app.services.row_fingerprints import (
+    FINGERPRINT_COLUMNS,
+    RowState,
+    is_unchanged,
+    load_row_fingerprints,
+    row_fingerprint,
+    save_row_fingerprints,
+    sheet_fingerprints,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,50 +66,6 @@ class ProcessingResult:
     skipped_reason: Optional[str] = None
 
 
-def _parse_date(value: str) -> Optional[date]:
-    """Parse a date string from a Google Sheet cell. Tries common formats."""
-    if not value or not value.strip():
-        return None
-    value = value.strip()
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d/%m/%Y", "%B %d, %Y", "%b %d, %Y"):
-        try:
-            return datetime.strptime(value, fmt).date()
-        except ValueError:
-            continue
-    # Last resort: dateutil
-    try:
-        from dateutil import parser as dateutil_parser
-        return dateutil_parser.parse(value).date()
-    except Exception:
-        return None
-
-
-def _parse_amount(value: str) -> Decimal:
-    """Parse an amount string, stripping currency symbols."""
-    if not value or not value.strip():
-        return Decimal("0")
-    cleaned = value.strip().replace("$", "").replace(",", "").replace(" ", "")
-    try:
-        return Decimal(cleaned)
-    except Exception:
-        return Decimal("0")
-
-
-def _is_paid(value: str) -> bool:
-    """Check if the Paid column indicates payment."""
-    return value.strip().upper() in ("TRUE", "YES", "PAID", "1")
-
-
-def _parse_last_stage(value: str) -> Optional[int]:
-    """Parse Last_Stage_Sent column to int."""
-    if not value or not value.strip():
-        return None
-    try:
-        return int(value.strip())
-    except ValueError:
-        return None
-
-
 async def process_user_invoices(
     user: User,
     db: AsyncSession,
@@ -91,11 +75,17 @@ async def process_user_invoices(
     Process all overdue invoices for a single user.
 
     Steps:
-    1. Get Google credentials from encrypted refresh token
-    2. Read all rows from the user's sheet
-    3. Filter to unpaid invoices
-    4. For each unpaid row: determine stage, check if draft needed, create draft, update sheet
-    5. Record results to job_history
+    1. Get Google credentials (cached access token or encrypted refresh token)
+    2. Stream the user's sheet in fixed-size row windows (or reuse a cached
+       snapshot if the file is unchanged)
+    3. Per window: skip rows unchanged since the last run unless their next
+       stage is due (row fingerprints), and count unpaid invoices
+    4. Per window: for each due row determine stage, check if draft needed;
+       create the drafts in Gmail batch requests
+    5. Write Last_Stage_Sent / Last_Sent_At back in batched sheet updates,
+       overlapping with rendering and draft creation (_DraftPipeline)
+    6. Store the user's next_action_date so quiet days skip the sheet entirely
+    7. Record results to job_history
 
     Args:
         user: User model with sheet_id and google credentials
@@ -137,125 +127,57 @@ async def process_user_invoices(
         await _record_job(user, result, db)
         return result
 
+    run = _SheetRun(
+        user=user, creds=creds, db=db, today=today, invoice_limit=invoice_limit, result=result,
+        schedule=schedule_for(user.escalation_stages),
+    )
+    # Only the reminder-relevant columns are fetched; raw rows feed nothing else
+    windows = iter_invoice_sheet_cached_async(creds, user.sheet_id, columns=FINGERPRINT_COLUMNS)
     try:
-        # Read all rows
-        rows = read_invoice_rows(creds, user.sheet_id)
-        headers = validate_sheet_columns(creds, user.sheet_id)
+        # Reuse the cached access token, refreshing only if it is about to expire
+        await ensure_fresh_credentials(user, creds)
+
+        # Stream the sheet in fixed-size row windows (or one cached snapshot if
+        # the file's Drive modifiedTime has not changed)
+        window = await anext(windows, None)
     except Exception as e:
-        error_str = str(e)
-        logger.error(f"Failed to read sheet for user {user.id}: {error_str}")
-        # Detect revoked token
-        if "401" in error_str or "403" in error_str or "invalid_grant" in error_str:
-            user.google_token_revoked = True
-            await db.flush()
-            result.errors.append({"type": "auth_revoked", "message": error_str})
-        else:
-            result.errors.append({"type": "sheet_read", "message": error_str})
+        await windows.aclose()
+        await _record_read_error(user, result, db, e)
         await _record_job(user, result, db)
         return result
 
-    # Filter to unpaid invoices
-    unpaid_rows = [r for r in rows if not _is_paid(r.get("Paid", ""))]
-    result.invoices_checked = len(unpaid_rows)
-
-    # Track outstanding total
-    for row in unpaid_rows:
-        result.total_outstanding += _parse_amount(row.get("Amount", ""))
-
-    # Process each unpaid invoice (up to limit)
-    drafts_this_run = 0
-    for row in unpaid_rows:
-        if drafts_this_run >= invoice_limit:
-            logger.info(
-                f"User {user.id}: draft limit reached ({drafts_this_run}/{invoice_limit}), stopping"
-            )
+    # Rows are compared with the fingerprints stored on the previous run, and
+    # drafts for a window are created before the next window is fetched.
+    known = await load_row_fingerprints(db, user)
+    dates: Optional[SheetDateParser] = None
+    while window is not None and not user.google_token_revoked:
+        run.headers = window.headers
+        if dates is None:
+            # Learn the sheet's due-date format once; repeated strings hit an LRU
+            dates = SheetDateParser.for_values(window.column("Due_Date"))
+        candidates = _classify_window(run, window, known, dates)
+        await _draft_candidates(run, candidates)
+        try:
+            window = await anext(windows, None)
+        except Exception as e:
+            await _record_read_error(user, result, db, e)
             break
+    sheet_complete = window is None
+    await windows.aclose()
 
-        try:
-            due_date = _parse_date(row.get("Due_Date", ""))
-            if due_date is None:
-                continue  # Can't determine overdue status without a date
-
-            overdue_days = days_overdue(due_date, today)
-            stage = stage_for(overdue_days)
-            if stage is None:
-                continue  # Not overdue enough for any reminder
-
-            last_stage = _parse_last_stage(row.get("Last_Stage_Sent", ""))
-            last_sent = _parse_date(row.get("Last_Sent_At", ""))
-
-            if not should_send_draft(stage, last_stage, last_sent, today):
-                continue
-
-            # Build email
-            client_email = row.get("Client_Email", "").strip()
-            if not client_email:
-                continue
-
-            subject = get_subject(
-                stage,
-                row.get("Invoice_Number", "N/A"),
-                user.business_name,
-            )
-            body_html = get_body_html(
-                stage_days=stage,
-                sender_name=user.name,
-                business_name=user.business_name,
-                client_name=row.get("Client_Name", ""),
-                invoice_number=row.get("Invoice_Number", "N/A"),
-                amount=row.get("Amount", ""),
-                due_date=row.get("Due_Date", ""),
-                days_overdue=overdue_days,
-            )
-
-            # Create Gmail draft
-            create_draft(creds, client_email, subject, body_html)
-
-            # Increment counter IMMEDIATELY after draft creation, BEFORE
-            # update_row_cells — if the sheet update throws, the draft was
-            # still created and must count toward the limit (#5265).
-            drafts_this_run += 1
-            result.drafts_created += 1
-            logger.info(
-                f"Draft {drafts_this_run}/{invoice_limit} created for {row.get('Invoice_Number')}"
-            )
-
-            # Defensive safety cap: stop even if we somehow got here
-            # with drafts_this_run already at or past the limit.
-            if result.drafts_created >= invoice_limit:
-                logger.info(
-                    f"User {user.id}: safety cap reached ({result.drafts_created}/{invoice_limit}), stopping"
-                )
-                break
+    # Write back whatever is still buffered, including the row that hit the cap
+    if not user.google_token_revoked:
+        await _flush_row_updates(creds, user, run.headers, run.pending_updates, result)
 
-            # Update sheet: Last_Stage_Sent + Last_Sent_At
-            update_row_cells(
-                creds,
-                user.sheet_id,
-                row["_row_number"],
-                {
-                    "Last_Stage_Sent": str(stage),
-                    "Last_Sent_At": today.isoformat(),
-                },
-                headers=headers,
-            )
+    # Keep any token refreshed mid-run for the next request or cron run
+    if not user.google_token_revoked:
+        remember_access_token(user, creds)
 
-        except Exception as e:
-            error_str = str(e)
-            logger.warning(
-                f"Error processing row {row.get('_row_number')} for user {user.id}: {error_str}"
-            )
-            # Detect auth revocation mid-processing
-            if "401" in error_str or "invalid_grant" in error_str:
-                user.google_token_revoked = True
-                await db.flush()
-                result.errors.append({"type": "auth_revoked", "message": error_str})
-                break
-            result.errors.append({
-                "type": "row_processing",
-                "row": row.get("_row_number"),
-                "message": error_str,
-            })
+    # Only prune fingerprints of vanished rows if the whole sheet was read
+    await save_row_fingerprints(
+        db, user, known, list(run.row_states.values()), run.row_numbers if sheet_complete else None
+    )
+    user.next_action_date = _user_next_action_date(run.next_actions.values(), result, today)
 
     result.duration_ms = int((time.time() - start_time) * 1000)
 
@@ -269,6 +191,420 @@ async def process_user_invoices(
     return result
 
 
+@dataclass
+class _SheetRun:
+    """Per-user run state carried across sheet windows."""
+    user: User
+    creds: Any
+    db: AsyncSession
+    today: date
+    invoice_limit: int
+    result: ProcessingResult
+    # The user's compiled escalation stages
+    schedule: EscalationSchedule = DEFAULT_SCHEDULE
+    headers: list[str] = field(default_factory=list)
+    # Fingerprint-store states to persist, keyed by row number
+    row_states: dict[int, RowState] = field(default_factory=dict)
+    # Next-stage date of every unpaid invoice, keyed by row number
+    next_actions: dict[int, date] = field(default_factory=dict)
+    pending_updates: list[tuple[int, dict[str, str]]] = field(default_factory=list)
+    row_numbers: set[int] = field(default_factory=set)
+
+
+async def _record_read_error(user: User, result: ProcessingResult, db: AsyncSession, e: Exception) -> None:
+    """Record a failed sheet read, marking the token revoked on auth errors."""
+    error_str = str(e)
+    logger.error(f"Failed to read sheet for user {user.id}: {error_str}")
+    # Detect revoked token
+    if "401" in error_str or "403" in error_str or "invalid_grant" in error_str:
+        user.google_token_revoked = True
+        await db.flush()
+        result.errors.append({"type": "auth_revoked", "message": error_str})
+    else:
+        result.errors.append({"type": "sheet_read", "message": error_str})
+
+
+def _classify_window(
+    run: _SheetRun,
+    window: InvoiceSheet,
+    known: dict[int, SheetRowFingerprint],
+    dates: SheetDateParser,
+) -> list[tuple[InvoiceRow, dict[str, Any]]]:
+    """
+    Count one window's unpaid invoices and pick the rows due for a reminder.
+
+    Unchanged rows reuse their stored paid flag and amount and are only
+    re-evaluated once their next escalation stage is due; changed rows are
+    parsed afresh, column by column. Returns (record, raw row) per candidate.
+    """
+    result = run.result
+    fingerprints = sheet_fingerprints(window)
+    invoice_numbers = [str(v).strip() for v in window.column("Invoice_Number")]
+    run.row_numbers.update(window.row_numbers)
+
+    states: list[RowState | SheetRowFingerprint | None] = []
+    changed: list[int] = []
+    for index, row_number in enumerate(window.row_numbers):
+        stored = known.get(row_number)
+        if is_unchanged(stored, invoice_numbers[index], fingerprints[index]):
+            states.append(stored)
+        else:
+            states.append(None)
+            changed.append(index)
+
+    # Parse changed rows into typed records once; these feed both the
+    # fingerprint store and draft planning.
+    records: dict[int, InvoiceRow] = {}
+    for index, invoice in zip(changed, invoice_rows(window, changed, dates)):
+        records[index] = invoice
+        state = _row_state(invoice, fingerprints[index], run.schedule)
+        states[index] = state
+        run.row_states[state.row_number] = state
+
+    unpaid = [index for index, state in enumerate(states) if not state.paid]
+    result.invoices_checked += len(unpaid)
+    result.total_outstanding += sum((states[i].amount for i in unpaid), Decimal("0"))
+    for i in unpaid:
+        if states[i].next_action_date is not None:
+            run.next_actions[states[i].row_number] = states[i].next_action_date
+
+    due_indices = [
+        i for i in unpaid
+        if states[i].next_action_date is not None and states[i].next_action_date <= run.today
+    ]
+    unparsed = [i for i in due_indices if i not in records]
+    records.update(zip(unparsed, invoice_rows(window, unparsed, dates)))
+    return [(records[i], window.row(i)) for i in due_indices]
+
+
+async def _draft_candidates(run: _SheetRun, candidates: list[tuple[InvoiceRow, dict[str, Any]]]) -> None:
+    """Create drafts for due candidates, up to the plan limit (see _DraftPipeline)."""
+    if candidates:
+        await _DraftPipeline(run).process(candidates)
+
+
+class _DraftPipeline:
+    """
+    Overlapping render → draft → write-back stages for one user's candidates.
+
+    The render stage plans Gmail batch requests while up to
+    DRAFT_PIPELINE_DEPTH batches are in flight, and the write-back stage
+    flushes created rows in SHEET_WRITE_BATCH_SIZE chunks while later drafts
+    are still being created; stages hand work over bounded queues.
+
+    Limit accounting stays exact: rendering reserves a slot for every draft
+    it sends, so in-flight drafts never exceed the remaining limit. A draft
+    counts the moment its batch returns (before any write-back), and a
+    failed draft releases its slot for the next eligible row.
+    """
+
+    def __init__(self, run: _SheetRun):
+        self.run = run
+        self.depth = max(1, settings.draft_pipeline_depth)
+        self.batches: asyncio.Queue = asyncio.Queue(maxsize=self.depth)
+        self.writes: asyncio.Queue = asyncio.Queue(maxsize=max(1, settings.sheet_write_batch_size))
+        self.slots_changed = asyncio.Condition()
+        self.in_flight = 0
+
+    def _free_slots(self) -> int:
+        return self.run.invoice_limit - self.run.result.drafts_created - self.in_flight
+
+    async def process(self, candidates: list[tuple[InvoiceRow, dict[str, Any]]]) -> None:
+        stages = [
+            asyncio.ensure_future(self._render(candidates)),
+            *(asyncio.ensure_future(self._create()) for _ in range(self.depth)),
+        ]
+        writer = asyncio.ensure_future(self._write_back())
+        try:
+            await asyncio.gather(*stages)
+            await self.writes.put(None)
+            await writer
+        except BaseException:
+            for task in (*stages, writer):
+                task.cancel()
+            raise
+
+    async def _render(self, candidates: list[tuple[InvoiceRow, dict[str, Any]]]) -> None:
+        """Plan draft batches as slots allow, then tell each draft worker to stop."""
+        run = self.run
+        user, result = run.user, run.result
+        remaining_rows = iter(candidates)
+        rows_exhausted = False
+        while not rows_exhausted:
+            # Wait for a free slot, or for in-flight drafts to settle the count
+            async with self.slots_changed:
+                await self.slots_changed.wait_for(
+                    lambda: self._free_slots() > 0 or self.in_flight == 0 or user.google_token_revoked
+                )
+            if user.google_token_revoked:
+                break
+            slots = self._free_slots()
+            if slots <= 0:
+                logger.info(
+                    f"User {user.id}: draft limit reached ({result.drafts_created}/{run.invoice_limit}), stopping"
+                )
+                break
+
+            drafts: list[DraftRequest] = []
+            planned_rows: dict[int, tuple[InvoiceRow, int, dict[str, Any]]] = {}
+            batch_size = min(slots, settings.gmail_draft_batch_size)
+            for invoice, raw in remaining_rows:
+                try:
+                    planned = _plan_draft(invoice, user, run.today, run.schedule)
+                except Exception as e:
+                    logger.warning(
+                        f"Error processing row {invoice.row_number} for user {user.id}: {e}"
+                    )
+                    result.errors.append({
+                        "type": "row_processing",
+                        "row": invoice.row_number,
+                        "message": str(e),
+                    })
+                    # Leave no fingerprint so the row is retried on the next run
+                    run.row_states.pop(invoice.row_number, None)
+                    continue
+                if planned is None:
+                    continue
+                draft, stage = planned
+                drafts.append(draft)
+                planned_rows[draft.key] = (invoice, stage, raw)
+                if len(drafts) >= batch_size:
+                    break
+            else:
+                rows_exhausted = True
+
+            if not drafts:
+                break
+            self.in_flight += len(drafts)
+            await self.batches.put((drafts, planned_rows))
+
+        for _ in range(self.depth):
+            await self.batches.put(None)
+
+    async def _create(self) -> None:
+        """Draft worker: send planned batches and count what was created."""
+        run = self.run
+        user, result = run.user, run.result
+        while (item := await self.batches.get()) is not None:
+            drafts, planned_rows = item
+            created: list[int] = []
+            if not user.google_token_revoked:
+                created = await _create_drafts(run.creds, user, drafts, result)
+
+            updates_by_row = {}
+            async with self.slots_changed:
+                self.in_flight -= len(drafts)
+                for row_number in created:
+                    # Count every created draft BEFORE the sheet write-back — if the
+                    # sheet update throws, the draft still counts toward the limit (#5265).
+                    result.drafts_created += 1
+                    logger.info(f"Draft {result.drafts_created}/{run.invoice_limit} created for row {row_number}")
+                    invoice, stage, raw = planned_rows[row_number]
+                    updates_by_row[row_number] = _record_created_draft(run, invoice, stage, raw)
+                self.slots_changed.notify_all()
+
+            # Queue sheet update (Last_Stage_Sent + Last_Sent_At) for the writer
+            for row_number, updates in updates_by_row.items():
+                await self.writes.put((row_number, updates))
+
+    async def _write_back(self) -> None:
+        """Writer: buffer created rows' updates and flush them in chunks."""
+        run = self.run
+        write_batch_size = max(1, settings.sheet_write_batch_size)
+        while (item := await self.writes.get()) is not None:
+            run.pending_updates.append(item)
+            if not run.user.google_token_revoked and len(run.pending_updates) >= write_batch_size:
+                chunk = run.pending_updates[:write_batch_size]
+                del run.pending_updates[:write_batch_size]
+                await _flush_row_updates(run.creds, run.user, run.headers, chunk, run.result)
+
+
+def _record_created_draft(
+    run: _SheetRun,
+    invoice: InvoiceRow,
+    stage: int,
+    raw: dict[str, Any],
+) -> dict[str, str]:
+    """Update run state for a created draft; returns the row's sheet write-back."""
+    updates = {
+        "Last_Stage_Sent": str(stage),
+        "Last_Sent_At": run.today.isoformat(),
+    }
+    # Fingerprint the row as it will read after the write-back
+    written = {**raw, **updates}
+    next_action = run.schedule.next_action_date(invoice.due_date, stage)
+    run.row_states[invoice.row_number] = RowState(
+        row_number=invoice.row_number,
+        invoice_number=invoice.invoice_number,
+        fingerprint=row_fingerprint(written),
+        paid=False,
+        amount=invoice.amount,
+        next_action_date=next_action,
+    )
+    run.next_actions.pop(invoice.row_number, None)
+    if next_action is not None:
+        run.next_actions[invoice.row_number] = next_action
+    return updates
+
+
+def _user_next_action_date(row_dates, result: ProcessingResult, today: date) -> date:
+    """
+    Earliest day the daily run needs to look at this user's sheet again.
+
+    That is the earliest next-stage date of any unpaid invoice, but never
+    later than NEXT_ACTION_RESCAN_DAYS from today, so invoices added to the
+    sheet in the meantime are picked up. A run with errors is retried on the
+    next run.
+    """
+    if result.errors:
+        return today
+    rescan = today + timedelta(days=max(1, settings.next_action_rescan_days))
+    return min([*row_dates, rescan])
+
+
+def _row_state(
+    invoice: InvoiceRow,
+    fingerprint: str,
+    schedule: EscalationSchedule = DEFAULT_SCHEDULE,
+) -> RowState:
+    """Fingerprint-store state for a freshly parsed row."""
+    next_action = None
+    if not invoice.paid and invoice.due_date is not None:
+        next_action = schedule.next_action_date(invoice.due_date, invoice.last_stage)
+    return RowState(
+        row_number=invoice.row_number,
+        invoice_number=invoice.invoice_number,
+        fingerprint=fingerprint,
+        paid=invoice.paid,
+        amount=invoice.amount,
+        next_action_date=next_action,
+    )
+
+
+def _plan_draft(
+    invoice: InvoiceRow,
+    user: User,
+    today: date,
+    schedule: EscalationSchedule = DEFAULT_SCHEDULE,
+) -> Optional[tuple[DraftRequest, int]]:
+    """
+    Decide whether an invoice needs a reminder draft today.
+
+    Returns (draft request keyed by sheet row number, escalation stage), or
+    None if the row is not due for a reminder.
+    """
+    if invoice.due_date is None:
+        return None  # Can't determine overdue status without a date
+
+    overdue_days = days_overdue(invoice.due_date, today)
+    stage = schedule.stage_for(overdue_days)
+    if stage is None:
+        return None  # Not overdue enough for any reminder
+
+    if not should_send_draft(stage, invoice.last_stage, invoice.last_sent, today):
+        return None
+
+    # Build email
+    if not invoice.client_email:
+        return None
+
+    subject = get_subject(
+        stage,
+        invoice.invoice_number or "N/A",
+        user.business_name,
+        schedule=schedule,
+        days_overdue=overdue_days,
+    )
+    body_html = get_body_html(
+        stage_days=stage,
+        sender_name=user.name,
+        business_name=user.business_name,
+        client_name=invoice.client_name,
+        invoice_number=invoice.invoice_number or "N/A",
+        amount=invoice.amount_text,
+        due_date=invoice.due_date_text,
+        days_overdue=overdue_days,
+        schedule=schedule,
+    )
+    draft = DraftRequest(
+        key=invoice.row_number, to=invoice.client_email, subject=subject, body_html=body_html
+    )
+    return draft, stage
+
+
+async def _create_drafts(
+    creds,
+    user: User,
+    drafts: list[DraftRequest],
+    result: ProcessingResult,
+) -> list[int]:
+    """
+    Create a batch of drafts and return the row numbers that succeeded.
+
+    Per-draft failures are recorded as row_processing errors against their
+    sheet row. An auth failure (on the batch or any draft) marks the token
+    revoked; drafts that were created before it still count. The flag is
+    flushed with the rest of the run: pipeline stages share one session
+    and must not flush it concurrently.
+    """
+    try:
+        outcomes = await create_drafts_batch_async(creds, drafts)
+    except Exception as e:
+        outcomes = [DraftResult(key=d.key, error=str(e)) for d in drafts]
+
+    created: list[int] = []
+    for outcome in outcomes:
+        if outcome.ok:
+            created.append(outcome.key)
+            continue
+        logger.warning(
+            f"Draft failed for row {outcome.key}, user {user.id}: {outcome.error}"
+        )
+        # Detect auth revocation mid-processing
+        if "401" in outcome.error or "invalid_grant" in outcome.error:
+            if not user.google_token_revoked:
+                user.google_token_revoked = True
+                result.errors.append({"type": "auth_revoked", "message": outcome.error})
+            continue
+        result.errors.append({
+            "type": "row_processing",
+            "row": outcome.key,
+            "message": outcome.error,
+        })
+    return created
+
+
+async def _flush_row_updates(
+    creds,
+    user: User,
+    headers: list[str],
+    pending_updates: list[tuple[int, dict[str, str]]],
+    result: ProcessingResult,
+) -> None:
+    """
+    Write buffered row updates in one batchUpdate and clear the buffer.
+
+    A failed flush is recorded as a sheet_update error listing the affected
+    rows; the drafts behind them stay counted in result.drafts_created. An
+    auth failure marks the token revoked (flushed with the rest of the run).
+    """
+    if not pending_updates:
+        return
+    batch = list(pending_updates)
+    pending_updates.clear()
+    try:
+        await batch_update_rows_async(creds, user.sheet_id, batch, headers=headers)
+    except Exception as e:
+        error_str = str(e)
+        rows = [row_number for row_number, _ in batch]
+        logger.warning(f"Sheet write-back failed for user {user.id}, rows {rows}: {error_str}")
+        if "401" in error_str or "invalid_grant" in error_str:
+            user.google_token_revoked = True
+            result.errors.append({"type": "auth_revoked", "message": error_str})
+            return
+        result.errors.append({"type": "sheet_update", "rows": rows, "message": error_str})
+
+
 async def _record_job(user: User, result: ProcessingResult, db: AsyncSession) -> None:
     """Record processing result in job_history table."""
     job = JobHistory(
@@ -0,0 +1,272 @@
+"""
+Sharded, resumable daily run state.
+
+A day's processing run is split into user-id range shards persisted in
+``daily_run_shards``. The cron trigger claims an unfinished shard, processes
+its users in id order chunk by chunk, and checkpoints the last user id after
+every chunk. Re-calling the trigger (or running several triggers at once)
+continues whatever shards are still unfinished for the day.
+
+A claimed shard is leased: its claimed_at is renewed while a chunk runs
+(hold_shard_lease) and at every checkpoint, and a shard whose lease is older
+than DAILY_RUN_SHARD_LEASE_SECONDS is treated as abandoned and reclaimable.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.daily_run_shard import DailyRunShard
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_UUID_SPACE = 1 << 128
+
+
+@dataclass
+class DailyRunSummary:
+    """Aggregate counts for one daily processing run."""
+    processed: int = 0
+    failed: int = 0
+    drafts_created: int = 0
+    invoices_checked: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def merge(self, other: "DailyRunSummary") -> None:
+        """Add another summary's counts into this one."""
+        self.processed += other.processed
+        self.failed += other.failed
+        self.drafts_created += other.drafts_created
+        self.invoices_checked += other.invoices_checked
+        self.errors.extend(other.errors)
+
+
+def shard_bounds(shard_index: int, shard_count: int) -> tuple[UUID, UUID | None]:
+    """
+    Return the [lower, upper) user-id range covered by a shard.
+
+    The 128-bit UUID space is split into ``shard_count`` equal ranges; the
+    last shard has no upper bound. Random (v4) ids spread evenly across them.
+    """
+    lower = UUID(int=(shard_index * _UUID_SPACE) // shard_count)
+    if shard_index == shard_count - 1:
+        return lower, None
+    return lower, UUID(int=((shard_index + 1) * _UUID_SPACE) // shard_count)
+
+
+def _claimable(run_date: date, stale_before: datetime):
+    """Predicate for shards of run_date that are pending or have a stale lease."""
+    return and_(
+        DailyRunShard.run_date == run_date,
+        or_(
+            DailyRunShard.status == "pending",
+            and_(
+                DailyRunShard.status == "running",
+                or_(DailyRunShard.claimed_at.is_(None), DailyRunShard.claimed_at < stale_before),
+            ),
+        ),
+    )
+
+
+async def ensure_run_shards(db: AsyncSession, run_date: date) -> None:
+    """Create the shard rows for run_date if this is the day's first trigger."""
+    result = await db.execute(
+        select(func.count()).select_from(DailyRunShard).where(DailyRunShard.run_date == run_date)
+    )
+    if result.scalar_one() > 0:
+        return
+
+    shard_count = max(1, settings.daily_run_shard_count)
+    for index in range(shard_count):
+        db.add(DailyRunShard(run_date=run_date, shard_index=index, shard_count=shard_count))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another invocation created them first
+        await db.rollback()
+
+
+async def claim_next_shard(db: AsyncSession, run_date: date) -> DailyRunShard | None:
+    """
+    Atomically claim the next pending (or abandoned) shard for run_date.
+
+    The claim is a conditional UPDATE, so concurrent invocations never work
+    the same shard. Returns None when no shard is left to claim.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.daily_run_shard_lease_seconds)
+    result = await db.execute(
+        select(DailyRunShard.id)
+        .where(_claimable(run_date, stale_before))
+        .order_by(DailyRunShard.shard_index)
+    )
+    for shard_id in result.scalars().all():
+        claimed = await db.execute(
+            update(DailyRunShard)
+            .where(DailyRunShard.id == shard_id, _claimable(run_date, stale_before))
+            .values(status="running", claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if claimed.rowcount == 1:
+            shard = await db.get(DailyRunShard, shard_id, populate_existing=True)
+            logger.info(
+                "Claimed daily run shard %s/%s for %s (resume after %s)",
+                shard.shard_index, shard.shard_count, run_date, shard.last_user_id,
+            )
+            return shard
+    return None
+
+
+def eligible_users_clause():
+    """
+    SQL predicate for users the daily run should process.
+
+    Mirrors the partial index idx_users_processing_eligible, so shard scans
+    read only eligible ids from the index instead of loading every active row.
+    The booleans are tested bare (not IS TRUE / IS FALSE) to match the index
+    predicate text; PostgreSQL before 17 cannot otherwise prove the index
+    applies.
+    """
+    return and_(
+        User.active,
+        User.sheet_id.is_not(None),
+        User.google_refresh_token_encrypted.is_not(None),
+        ~User.google_token_revoked,
+    )
+
+
+def action_due_clause(run_date: date):
+    """Users with work due on run_date (or never evaluated yet)."""
+    return or_(User.next_action_date.is_(None), User.next_action_date <= run_date)
+
+
+async def next_user_chunk(
+    db: AsyncSession,
+    shard: DailyRunShard,
+    limit: int,
+) -> list[UUID]:
+    """
+    Fetch the next keyset page of eligible user ids in the shard.
+
+    Users whose next_action_date is after the run date have nothing to do
+    and are not selected. Only ids are selected, ordered by id after the
+    shard's checkpoint, so
+    memory per chunk stays flat however large the user table grows. The
+    last id returned is the next checkpoint.
+    """
+    lower, upper = shard_bounds(shard.shard_index, shard.shard_count)
+    query = select(User.id).where(
+        eligible_users_clause(), action_due_clause(shard.run_date), User.id >= lower
+    )
+    if upper is not None:
+        query = query.where(User.id < upper)
+    if shard.last_user_id is not None:
+        query = query.where(User.id > shard.last_user_id)
+    result = await db.execute(query.order_by(User.id).limit(limit))
+    return list(result.scalars().all())
+
+
+async def checkpoint_shard(
+    db: AsyncSession,
+    shard: DailyRunShard,
+    last_user_id: UUID,
+    chunk: DailyRunSummary,
+) -> None:
+    """Persist progress after a chunk and renew the shard's lease."""
+    shard.last_user_id = last_user_id
+    shard.users_processed += chunk.processed
+    shard.users_failed += chunk.failed
+    shard.drafts_created += chunk.drafts_created
+    shard.invoices_checked += chunk.invoices_checked
+    shard.claimed_at = datetime.utcnow()
+    await db.commit()
+
+
+async def renew_shard_lease(session_factory: async_sessionmaker, shard_id: UUID) -> bool:
+    """
+    Push a running shard's lease forward, from a session of its own.
+
+    Returns False if the shard is no longer running (e.g. it was released).
+    """
+    async with session_factory() as session:
+        result = await session.execute(
+            update(DailyRunShard)
+            .where(DailyRunShard.id == shard_id, DailyRunShard.status == "running")
+            .values(claimed_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+    return result.rowcount == 1
+
+
+@asynccontextmanager
+async def hold_shard_lease(
+    session_factory: async_sessionmaker,
+    shard: DailyRunShard,
+    interval: float | None = None,
+):
+    """
+    Keep a shard's lease fresh while the body runs.
+
+    A chunk can outlast the lease (quota waits, backoff across many users);
+    without renewal another trigger would reclaim the shard and process the
+    same users concurrently. Renews every ``interval`` seconds (default a
+    third of the lease period). The heartbeat is stopped with an event, not
+    cancelled, so a renewal in progress always finishes its commit.
+    """
+    if interval is None:
+        interval = settings.daily_run_shard_lease_seconds / 3
+    stop = asyncio.Event()
+
+    async def _heartbeat() -> None:
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await renew_shard_lease(session_factory, shard.id)
+            except Exception:
+                logger.exception("Failed to renew lease of daily run shard %s", shard.id)
+
+    task = asyncio.create_task(_heartbeat()) if interval > 0 else None
+    try:
+        yield
+    finally:
+        stop.set()
+        if task is not None:
+            await task
+
+
+async def complete_shard(db: AsyncSession, shard: DailyRunShard) -> None:
+    """Mark a shard as fully processed for the day."""
+    shard.status = "done"
+    shard.completed_at = datetime.utcnow()
+    await db.commit()
+
+
+async def release_shard(db: AsyncSession, shard: DailyRunShard) -> None:
+    """Hand an unfinished shard back so the next trigger resumes it."""
+    shard.status = "pending"
+    shard.claimed_at = None
+    await db.commit()
+
+
+async def count_unfinished_shards(db: AsyncSession, run_date: date) -> int:
+    """Number of shards for run_date that are not done yet."""
+    result = await db.execute(
+        select(func.count())
+        .select_from(DailyRunShard)
+        .where(DailyRunShard.run_date == run_date, DailyRunShard.status != "done")
+    )
+    return result.scalar_one()
@@ -0,0 +1,107 @@
+"""
+Date parsing for Google Sheet cells.
+
+Sheet dates are free text, and the same strings repeat across rows and
+across daily runs. ``parse_date`` tries the supported formats in order
+(then dateutil, if installed) and memoizes string → date in a bounded LRU.
+``SheetDateParser`` learns a sheet's format from a sample of its values
+and tries that format first, so most cells cost one cached strptime.
+"""
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Iterable, Optional
+
+try:
+    from dateutil import parser as dateutil_parser
+except ImportError:  # optional: only used as a last resort
+    dateutil_parser = None
+
+logger = logging.getLogger(__name__)
+
+# Formats tried in order; earlier formats win for ambiguous values
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d/%m/%Y", "%B %d, %Y", "%b %d, %Y")
+
+# Bound on memoized distinct strings (per cache)
+DATE_CACHE_SIZE = 8192
+
+# Values inspected when learning a sheet's format
+SNIFF_SAMPLE_SIZE = 20
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_with_format(value: str, fmt: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, fmt).date()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_stripped(value: str) -> Optional[date]:
+    for fmt in DATE_FORMATS:
+        parsed = _parse_with_format(value, fmt)
+        if parsed is not None:
+            return parsed
+    # Last resort: dateutil
+    if dateutil_parser is None:
+        return None
+    try:
+        return dateutil_parser.parse(value).date()
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse_date(value: str) -> Optional[date]:
+    """Parse a date string from a Google Sheet cell. Tries common formats."""
+    if not value or not value.strip():
+        return None
+    return _parse_stripped(value.strip())
+
+
+class SheetDateParser:
+    """
+    Date parser that prefers the format a sheet actually uses.
+
+    ``learn()`` picks the format that parses the most sampled values
+    (earlier DATE_FORMATS win ties, matching parse_date for ambiguous
+    values). Values that don't match it fall back to parse_date.
+    """
+
+    def __init__(self, date_format: Optional[str] = None):
+        self.date_format = date_format
+
+    @classmethod
+    def for_values(cls, values: Iterable[str], sample_size: int = SNIFF_SAMPLE_SIZE) -> "SheetDateParser":
+        """Build a parser that has learned the format of the given values."""
+        parser = cls()
+        parser.learn(values, sample_size)
+        return parser
+
+    def learn(self, values: Iterable[str], sample_size: int = SNIFF_SAMPLE_SIZE) -> Optional[str]:
+        """Sniff the dominant format from the first non-empty values."""
+        sample = []
+        for value in values:
+            if value and value.strip():
+                sample.append(value.strip())
+                if len(sample) >= sample_size:
+                    break
+
+        best_format, best_hits = None, 0
+        for fmt in DATE_FORMATS:
+            hits = sum(1 for value in sample if _parse_with_format(value, fmt) is not None)
+            if hits > best_hits:
+                best_format, best_hits = fmt, hits
+        self.date_format = best_format
+        logger.debug(f"Learned sheet date format {best_format!r} from {len(sample)} values")
+        return best_format
+
+    def parse(self, value: str) -> Optional[date]:
+        if not value or not value.strip():
+            return None
+        value = value.strip()
+        if self.date_format is not None:
+            parsed = _parse_with_format(value, self.date_format)
+            if parsed is not None:
+                return parsed
+        return _parse_stripped(value)
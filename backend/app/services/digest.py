@@ -2,16 +2,20 @@
 Weekly digest email service.
 
 Provides functions for calculating digest data and sending weekly summary emails.
+
+Digest data comes from one query per call: job_history for the 7-day window
+grouped by user and joined to users. The send run streams that query for all
+active users in chunks (iter_weekly_digest_rows) instead of querying per user.
 """
 import logging
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from jinja2 import Template
-from sqlalchemy import select, func
+from sqlalchemy import Row, Select, and_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 import resend
 
@@ -51,6 +55,48 @@ def _get_email_template() -> Template:
     return _EMAIL_TEMPLATE
 
 
+# Look-back window for digest activity
+DIGEST_WINDOW = timedelta(days=7)
+
+
+def _digest_query(since: datetime, outer: bool = False) -> Select:
+    """
+    Users joined to their job_history aggregates since ``since``, one row per user.
+
+    With ``outer`` users without runs in the window are kept (zero totals).
+    """
+    total_drafts = func.coalesce(func.sum(JobHistory.drafts_created), 0)
+    join_on = and_(JobHistory.user_id == User.id, JobHistory.run_at >= since)
+    return (
+        select(
+            User.id,
+            User.name,
+            User.email,
+            User.business_name,
+            User.plan,
+            total_drafts.label("total_drafts"),
+            func.max(JobHistory.total_outstanding_amount).label("latest_outstanding"),
+        )
+        .select_from(User)
+        .join(JobHistory, join_on, isouter=outer)
+        .group_by(User.id)
+    )
+
+
+def digest_from_row(row) -> DigestData:
+    """Build DigestData from a digest query row (see iter_weekly_digest_rows)."""
+    return DigestData(
+        user_id=row.id,
+        user_name=row.name,
+        user_email=row.email,
+        business_name=row.business_name,
+        plan=row.plan,
+        drafts_count=int(row.total_drafts or 0),
+        outstanding_amount=Decimal(str(row.latest_outstanding)) if row.latest_outstanding else Decimal('0.00'),
+        critical_count=0  # TODO: Calculate from invoice data when available
+    )
+
+
 async def calculate_digest(user_id: UUID, db: AsyncSession) -> Optional[DigestData]:
     """
     Calculate weekly digest data for a user.
@@ -67,47 +113,54 @@ async def calculate_digest(user_id: UUID, db: AsyncSession) -> Optional[DigestDa
     Returns:
         DigestData with aggregated information, or None if user not found
     """
-    # Fetch user
+    seven_days_ago = datetime.utcnow() - DIGEST_WINDOW
     result = await db.execute(
-        select(User).where(User.id == user_id)
+        _digest_query(seven_days_ago, outer=True).where(User.id == user_id)
     )
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    row = result.one_or_none()
+
+    if row is None:
         logger.warning(f"User {user_id} not found for digest calculation")
         return None
-    
-    # Calculate date range (past 7 days)
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    
-    # Query job history for past 7 days
-    result = await db.execute(
-        select(
-            func.sum(JobHistory.drafts_created).label('total_drafts'),
-            func.max(JobHistory.total_outstanding_amount).label('latest_outstanding')
-        )
-        .where(JobHistory.user_id == user_id)
-        .where(JobHistory.run_at >= seven_days_ago)
-    )
-    row = result.one_or_none()
-    
-    # Extract aggregated data
-    drafts_count = int(row.total_drafts) if row and row.total_drafts else 0
-    outstanding_amount = Decimal(str(row.latest_outstanding)) if row and row.latest_outstanding else Decimal('0.00')
-    
-    # Create digest data
-    digest_data = DigestData(
-        user_id=user.id,
-        user_name=user.name,
-        user_email=user.email,
-        business_name=user.business_name,
-        plan=user.plan,
-        drafts_count=drafts_count,
-        outstanding_amount=outstanding_amount,
-        critical_count=0  # TODO: Calculate from invoice data when available
+
+    return digest_from_row(row)
+
+
+async def iter_weekly_digest_rows(
+    db: AsyncSession,
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[list[Row]]:
+    """
+    Stream digest rows for every active user with drafts in the past 7 days.
+
+    Runs a single grouped query and yields its rows in chunks of
+    ``chunk_size`` (default DIGEST_CHUNK_SIZE), so the send run costs one
+    round trip per chunk rather than two queries per user. Users without
+    drafts in the window get no digest and are not returned. Turn rows into
+    DigestData with digest_from_row().
+
+    Args:
+        db: Async database session
+        chunk_size: Digests per yielded chunk
+
+    Yields:
+        Lists of rows, in user id order
+    """
+    chunk_size = max(1, chunk_size or settings.digest_chunk_size)
+    seven_days_ago = datetime.utcnow() - DIGEST_WINDOW
+    query = (
+        _digest_query(seven_days_ago)
+        .where(User.active == True)
+        .having(func.sum(JobHistory.drafts_created) > 0)
+        .order_by(User.id)
+        .execution_options(yield_per=chunk_size)
     )
-    
-    return digest_data
+    result = await db.stream(query)
+    try:
+        async for rows in result.partitions(chunk_size):
+            yield list(rows)
+    finally:
+        await result.close()
 
 
 async def send_digest_email(digest_data: DigestData) -> bool:
@@ -11,67 +11,50 @@ Escalation email templates.
 
 Template variables:
   sender_name, business_name, client_name, invoice_number, amount, due_date, days_overdue
-"""
-from app.services.escalation import STAGES
-
-# Map stage days → 1-based stage number for template selection
-_STAGE_INDEX = {days: idx + 1 for idx, days in enumerate(STAGES)}
 
+Templates are compiled once at import into CompiledTemplate renderers, so
+rendering a draft only fills the variable slots of the selected stage.
 
-def get_stage_number(stage_days: int) -> int:
-    """Convert stage days (7, 14, ...) to stage number (1, 2, ...)."""
-    return _STAGE_INDEX.get(stage_days, 1)
-
+Users with a custom escalation schedule get the template at the same
+position in their schedule (their first stage uses template 1, and so on).
+The default copy mentions the default cadence ("3 weeks", "7 days"), so
+custom schedules render cadence-neutral variants of those templates; the
+default schedule keeps the original text.
+"""
+from string import Formatter
+from typing import Any, Mapping, Optional
 
-def get_subject(stage_days: int, invoice_number: str, business_name: str) -> str:
-    """Generate email subject line based on escalation stage."""
-    n = get_stage_number(stage_days)
-    subjects = {
-        1: f"Friendly reminder: Invoice {invoice_number} from {business_name}",
-        2: f"Following up: Invoice {invoice_number} from {business_name}",
-        3: f"Urgent: Invoice {invoice_number} is now 3 weeks overdue",
-        4: f"Action needed: Invoice {invoice_number} — {business_name}",
-        5: f"Final reminder: Invoice {invoice_number} before escalation",
-        6: f"Last notice: Invoice {invoice_number} — immediate action required",
-    }
-    return subjects.get(n, subjects[1])
+from app.services.escalation import DEFAULT_SCHEDULE, EscalationSchedule
 
 
-def get_body_html(
-    stage_days: int,
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
+class CompiledTemplate:
     """
-    Generate HTML email body for the given escalation stage.
+    A ``str.format``-style template parsed once into literal text and slots.
 
-    Returns a complete HTML email body string.
+    ``render()`` copies the pre-split chunk list, drops each value into its
+    slot and joins; the template text is never re-scanned or rebuilt.
+    Values are inserted as-is (no escaping).
     """
-    n = get_stage_number(stage_days)
-    ctx = dict(
-        sender_name=sender_name,
-        business_name=business_name,
-        client_name=client_name,
-        invoice_number=invoice_number,
-        amount=amount,
-        due_date=due_date,
-        days_overdue=days_overdue,
-    )
-    templates = {
-        1: _stage_1,
-        2: _stage_2,
-        3: _stage_3,
-        4: _stage_4,
-        5: _stage_5,
-        6: _stage_6,
-    }
-    fn = templates.get(n, _stage_1)
-    return fn(**ctx)
+    __slots__ = ("_chunks", "_slots", "fields")
+
+    def __init__(self, source: str):
+        chunks: list[Optional[str]] = []
+        slots: list[tuple[int, str]] = []
+        for literal, field, _, _ in Formatter().parse(source):
+            if literal:
+                chunks.append(literal)
+            if field is not None:
+                slots.append((len(chunks), field))
+                chunks.append(None)
+        self._chunks = chunks
+        self._slots = tuple(slots)
+        self.fields = frozenset(field for _, field in slots)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        out = self._chunks.copy()
+        for index, field in self._slots:
+            out[index] = str(values[field])
+        return "".join(out)
 
 
 def _wrap(body_content: str) -> str:
@@ -84,17 +67,18 @@ def _wrap(body_content: str) -> str:
 </html>"""
 
 
-def _stage_1(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 1: Friendly check-in — casual, assumes oversight."""
-    return _wrap(f"""\
+_SUBJECT_SOURCES = {
+    1: "Friendly reminder: Invoice {invoice_number} from {business_name}",
+    2: "Following up: Invoice {invoice_number} from {business_name}",
+    3: "Urgent: Invoice {invoice_number} is now 3 weeks overdue",
+    4: "Action needed: Invoice {invoice_number} — {business_name}",
+    5: "Final reminder: Invoice {invoice_number} before escalation",
+    6: "Last notice: Invoice {invoice_number} — immediate action required",
+}
+
+_BODY_SOURCES = {
+    # Stage 1: Friendly check-in — casual, assumes oversight.
+    1: """\
 <p>Hi {client_name},</p>
 
 <p>Hope you're doing well! I wanted to quickly check in about invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong> that was due on {due_date}.</p>
@@ -105,20 +89,10 @@ def _stage_1(
 
 <p>Thanks so much,<br>
 {sender_name}<br>
-{business_name}</p>""")
-
+{business_name}</p>""",
 
-def _stage_2(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 2: Direct follow-up — polite but clear."""
-    return _wrap(f"""\
+    # Stage 2: Direct follow-up — polite but clear.
+    2: """\
 <p>Hi {client_name},</p>
 
 <p>I'm following up on invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong>, which was due on {due_date} — now {days_overdue} days ago.</p>
@@ -129,20 +103,10 @@ def _stage_2(
 
 <p>Best regards,<br>
 {sender_name}<br>
-{business_name}</p>""")
+{business_name}</p>""",
 
-
-def _stage_3(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 3: Urgent — emphasizes 3 weeks overdue."""
-    return _wrap(f"""\
+    # Stage 3: Urgent — emphasizes 3 weeks overdue.
+    3: """\
 <p>Hi {client_name},</p>
 
 <p>This is an urgent follow-up regarding invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong>. This invoice was due on {due_date} and is now <strong>{days_overdue} days overdue</strong>.</p>
@@ -153,20 +117,10 @@ def _stage_3(
 
 <p>Thank you,<br>
 {sender_name}<br>
-{business_name}</p>""")
-
+{business_name}</p>""",
 
-def _stage_4(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 4: Firm + call suggestion — requests direct contact."""
-    return _wrap(f"""\
+    # Stage 4: Firm + call suggestion — requests direct contact.
+    4: """\
 <p>Hi {client_name},</p>
 
 <p>I need to bring your attention to invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong>, now <strong>{days_overdue} days past due</strong> (originally due {due_date}).</p>
@@ -177,20 +131,10 @@ def _stage_4(
 
 <p>Regards,<br>
 {sender_name}<br>
-{business_name}</p>""")
-
+{business_name}</p>""",
 
-def _stage_5(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 5: Final before escalation — warns of next steps."""
-    return _wrap(f"""\
+    # Stage 5: Final before escalation — warns of next steps.
+    5: """\
 <p>Dear {client_name},</p>
 
 <p>This is a final reminder regarding invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong>, which has been outstanding for <strong>{days_overdue} days</strong> (due date: {due_date}).</p>
@@ -201,20 +145,10 @@ def _stage_5(
 
 <p>Sincerely,<br>
 {sender_name}<br>
-{business_name}</p>""")
-
+{business_name}</p>""",
 
-def _stage_6(
-    sender_name: str,
-    business_name: str,
-    client_name: str,
-    invoice_number: str,
-    amount: str,
-    due_date: str,
-    days_overdue: int,
-) -> str:
-    """Stage 6: Last notice — mentions collections/legal."""
-    return _wrap(f"""\
+    # Stage 6: Last notice — mentions collections/legal.
+    6: """\
 <p>Dear {client_name},</p>
 
 <p><strong>LAST NOTICE</strong> — Invoice <strong>{invoice_number}</strong> for <strong>{amount}</strong> is now <strong>{days_overdue} days past due</strong> (original due date: {due_date}).</p>
@@ -227,4 +161,97 @@ def _stage_6(
 
 <p>Regards,<br>
 {sender_name}<br>
-{business_name}</p>""")
+{business_name}</p>""",
+}
+
+# Cadence-neutral wording for custom schedules: (template, default text, replacement)
+_CUSTOM_SUBJECT_EDITS = [
+    (3, "is now 3 weeks overdue", "is now {days_overdue} days overdue"),
+]
+_CUSTOM_BODY_EDITS = [
+    (4, "This is my fourth attempt to reach you about", "I've reached out several times about"),
+    (5, "within the next 7 days", "promptly"),
+    (6, " over the past several weeks", ""),
+]
+
+
+def _apply_edits(sources: dict[int, str], edits: list[tuple[int, str, str]]) -> dict[int, str]:
+    """Copy of ``sources`` with each edit's text replaced (which must be present)."""
+    edited = dict(sources)
+    for n, old, new in edits:
+        if old not in edited[n]:
+            raise ValueError(f"Template {n} no longer contains {old!r}")
+        edited[n] = edited[n].replace(old, new)
+    return edited
+
+
+# Compiled once at import; rendering only fills the slots
+_SUBJECTS = {n: CompiledTemplate(source) for n, source in _SUBJECT_SOURCES.items()}
+_BODIES = {n: CompiledTemplate(_wrap(source)) for n, source in _BODY_SOURCES.items()}
+_CUSTOM_SUBJECTS = {
+    n: CompiledTemplate(source)
+    for n, source in _apply_edits(_SUBJECT_SOURCES, _CUSTOM_SUBJECT_EDITS).items()
+}
+_CUSTOM_BODIES = {
+    n: CompiledTemplate(_wrap(source))
+    for n, source in _apply_edits(_BODY_SOURCES, _CUSTOM_BODY_EDITS).items()
+}
+
+
+def _is_default(schedule: Optional[EscalationSchedule]) -> bool:
+    return schedule is None or schedule is DEFAULT_SCHEDULE
+
+
+def get_stage_number(stage_days: int, schedule: Optional[EscalationSchedule] = None) -> int:
+    """Convert stage days (7, 14, ...) to stage number (1, 2, ...) in ``schedule`` (default: STAGES)."""
+    return (schedule or DEFAULT_SCHEDULE).stage_number(stage_days)
+
+
+def get_subject(
+    stage_days: int,
+    invoice_number: str,
+    business_name: str,
+    schedule: Optional[EscalationSchedule] = None,
+    days_overdue: Optional[int] = None,
+) -> str:
+    """
+    Generate email subject line based on escalation stage.
+
+    ``days_overdue`` defaults to ``stage_days`` (the day the stage starts).
+    """
+    subjects = _SUBJECTS if _is_default(schedule) else _CUSTOM_SUBJECTS
+    template = subjects.get(get_stage_number(stage_days, schedule), subjects[1])
+    return template.render({
+        "invoice_number": invoice_number,
+        "business_name": business_name,
+        "days_overdue": stage_days if days_overdue is None else days_overdue,
+    })
+
+
+def get_body_html(
+    stage_days: int,
+    sender_name: str,
+    business_name: str,
+    client_name: str,
+    invoice_number: str,
+    amount: str,
+    due_date: str,
+    days_overdue: int,
+    schedule: Optional[EscalationSchedule] = None,
+) -> str:
+    """
+    Generate HTML email body for the given escalation stage.
+
+    Returns a complete HTML email body string.
+    """
+    bodies = _BODIES if _is_default(schedule) else _CUSTOM_BODIES
+    template = bodies.get(get_stage_number(stage_days, schedule), bodies[1])
+    return template.render({
+        "sender_name": sender_name,
+        "business_name": business_name,
+        "client_name": client_name,
+        "invoice_number": invoice_number,
+        "amount": amount,
+        "due_date": due_date,
+        "days_overdue": days_overdue,
+    })
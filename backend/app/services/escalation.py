@@ -7,21 +7,144 @@ This module contains the core business logic for determining:
 2. Which escalation stage should be used
 3. Whether a reminder draft should be created
 
-The 6-stage escalation sequence:
+The default 6-stage escalation sequence:
 - 7 days: Friendly check-in
 - 14 days: Direct follow-up
 - 21 days: More urgent tone
 - 28 days: Firm reminder with call suggestion
 - 35 days: Final reminder before escalation
 - 42 days: Last notice before collections/legal
+
+Users may have their own sequence (``users.escalation_stages``, e.g. for
+net-60 terms). Each distinct sequence is compiled once into an
+EscalationSchedule (``schedule_for``) whose lookups are table indexes, so
+custom schedules cost the same as the default. The module-level functions
+below evaluate the default schedule.
 """
-from datetime import date
-from typing import Optional
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
 
 
 # Escalation stages (days overdue)
 STAGES = [7, 14, 21, 28, 35, 42]
 
+# One email template per stage ordinal, so a schedule has at most this many
+MAX_STAGES = 6
+
+# Upper bound on a stage's days overdue (bounds the lookup table)
+MAX_STAGE_DAYS = 365
+
+
+def validate_stages(stages: Sequence[int]) -> tuple[int, ...]:
+    """
+    Check a stage sequence and return it as a tuple.
+
+    Raises:
+        ValueError: unless 1..MAX_STAGES strictly increasing whole days in
+            1..MAX_STAGE_DAYS
+
+    Examples:
+        >>> validate_stages([30, 45, 60])
+        (30, 45, 60)
+        >>> validate_stages([14, 7])
+        Traceback (most recent call last):
+        ...
+        ValueError: Escalation stages must be strictly increasing
+    """
+    stages = tuple(stages)
+    if not 1 <= len(stages) <= MAX_STAGES:
+        raise ValueError(f"Escalation schedule must have 1 to {MAX_STAGES} stages")
+    if any(isinstance(s, bool) or not isinstance(s, int) or not 1 <= s <= MAX_STAGE_DAYS for s in stages):
+        raise ValueError(f"Escalation stages must be whole days between 1 and {MAX_STAGE_DAYS}")
+    if any(a >= b for a, b in zip(stages, stages[1:])):
+        raise ValueError("Escalation stages must be strictly increasing")
+    return stages
+
+
+class EscalationSchedule:
+    """
+    A stage sequence compiled into lookup tables.
+
+    Holds the stage reached on each day up to the last stage (later days map
+    to the last stage), each stage's successor and its 1-based ordinal
+    (which selects the email template). Get instances from schedule_for().
+    """
+    __slots__ = ("stages", "_by_day", "_next", "_ordinal")
+
+    def __init__(self, stages: Sequence[int]):
+        self.stages = validate_stages(stages)
+        self._by_day: tuple[Optional[int], ...] = tuple(
+            max((s for s in self.stages if s <= day), default=None)
+            for day in range(self.stages[-1] + 1)
+        )
+        self._next: dict[int, int] = dict(zip(self.stages, self.stages[1:]))
+        self._ordinal: dict[int, int] = {days: index + 1 for index, days in enumerate(self.stages)}
+
+    def __repr__(self) -> str:
+        return f"EscalationSchedule({list(self.stages)})"
+
+    def stage_for(self, days: int) -> Optional[int]:
+        """Stage reached after ``days`` overdue, or None before the first."""
+        if days < 0:
+            return None
+        return self._by_day[days] if days < len(self._by_day) else self._by_day[-1]
+
+    def stage_for_many(self, days: Iterable[int]) -> list[Optional[int]]:
+        """stage_for over a whole column of days-overdue values."""
+        table = self._by_day
+        size, last = len(table), table[-1]
+        return [table[d] if 0 <= d < size else (last if d >= size else None) for d in days]
+
+    def get_next_stage(self, current_stage: Optional[int]) -> Optional[int]:
+        """Stage after ``current_stage`` (the first if None), or None at the end."""
+        if current_stage is None:
+            return self.stages[0]
+        return self._next.get(current_stage)
+
+    def next_action_date(self, due_date: date, last_stage_sent: Optional[int]) -> Optional[date]:
+        """Day the first stage above ``last_stage_sent`` is reached, or None if all were sent."""
+        index = 0 if last_stage_sent is None else bisect_right(self.stages, last_stage_sent)
+        if index >= len(self.stages):
+            return None
+        return due_date + timedelta(days=self.stages[index])
+
+    def stage_number(self, stage_days: int) -> int:
+        """1-based position of a stage in the schedule (1 for unknown stages)."""
+        return self._ordinal.get(stage_days, 1)
+
+
+DEFAULT_SCHEDULE = EscalationSchedule(STAGES)
+
+
+@lru_cache(maxsize=256)
+def _compile_schedule(stages: tuple[int, ...]) -> EscalationSchedule:
+    return EscalationSchedule(stages)
+
+
+def schedule_for(stages: Optional[Sequence[int]]) -> EscalationSchedule:
+    """
+    Compiled schedule for a stage sequence (None or empty = the default).
+
+    Compiled schedules are cached per distinct sequence, so users sharing a
+    cadence share one instance.
+
+    Examples:
+        >>> schedule_for(None) is DEFAULT_SCHEDULE
+        True
+        >>> schedule_for([30, 45, 60]).stage_for(50)
+        45
+        >>> schedule_for([30, 45, 60]) is schedule_for((30, 45, 60))
+        True
+    """
+    if not stages:
+        return DEFAULT_SCHEDULE
+    stages = tuple(stages)
+    if stages == DEFAULT_SCHEDULE.stages:
+        return DEFAULT_SCHEDULE
+    return _compile_schedule(stages)
+
 
 def days_overdue(due_date: date, today: Optional[date] = None) -> int:
     """
@@ -76,8 +199,21 @@ def stage_for(days: int) -> Optional[int]:
         >>> stage_for(50)
         42
     """
-    eligible_stages = [s for s in STAGES if days >= s]
-    return max(eligible_stages) if eligible_stages else None
+    return DEFAULT_SCHEDULE.stage_for(days)
+
+
+def stage_for_many(days: Iterable[int]) -> list[Optional[int]]:
+    """
+    stage_for over a whole column of days-overdue values.
+
+    One table lookup per value, for bulk callers (sheet-wide scans,
+    next-action precomputation).
+
+    Examples:
+        >>> stage_for_many([0, 7, 13, 14, 41, 42, 365, -1])
+        [None, 7, 7, 14, 35, 42, 42, None]
+    """
+    return DEFAULT_SCHEDULE.stage_for_many(days)
 
 
 def should_send_draft(
@@ -157,15 +293,31 @@ def get_next_stage(current_stage: Optional[int]) -> Optional[int]:
         >>> get_next_stage(42)
         
     """
-    if current_stage is None:
-        return STAGES[0] if STAGES else None
+    return DEFAULT_SCHEDULE.get_next_stage(current_stage)
 
-    try:
-        current_index = STAGES.index(current_stage)
-        if current_index < len(STAGES) - 1:
-            return STAGES[current_index + 1]
-    except (ValueError, IndexError):
-        pass
 
-    return None
+def next_action_date(due_date: date, last_stage_sent: Optional[int]) -> Optional[date]:
+    """
+    Date on which an unchanged invoice row next becomes due for a reminder.
+
+    This is the day the invoice reaches the first stage above the last one
+    sent. Until then, re-evaluating the row cannot produce a draft, so the
+    daily run can skip it.
+
+    Args:
+        due_date: The date the invoice was due
+        last_stage_sent: The last stage that was sent (None if none yet)
 
+    Returns:
+        The date the next stage is reached, or None if every stage has been sent
+
+    Examples:
+        >>> from datetime import date
+        >>> next_action_date(date(2024, 1, 1), None)
+        datetime.date(2024, 1, 8)
+        >>> next_action_date(date(2024, 1, 1), 14)
+        datetime.date(2024, 1, 22)
+        >>> next_action_date(date(2024, 1, 1), 42)
+
+    """
+    return DEFAULT_SCHEDULE.next_action_date(due_date, last_stage_sent)
@@ -0,0 +1,77 @@
+"""
+Process-wide cache of Google API service templates.
+
+``googleapiclient.discovery.build()`` re-reads and re-parses the full static
+discovery document (hundreds of KB of JSON for Sheets) every time it is
+called. The Sheets, Drive and Gmail wrappers build a service per call, so
+that cost was paid for every row update and every draft.
+
+This module parses each (api, version) document once per process and
+builds per-user services from it with ``build_from_document()``, which only
+binds credentials to a thin top-level resource. Every service shares the
+pooled keep-alive transport from app.services.google_http.
+"""
+import json
+import logging
+import threading
+from typing import Any
+
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document, fix_method_name
+from googleapiclient.http import build_http
+
+from app.services.google_http import authorized_http
+
+logger = logging.getLogger(__name__)
+
+_DOCUMENTS: dict[tuple[str, str], dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def _prime_resources(resource: Any, resource_desc: dict[str, Any]) -> None:
+    """
+    Instantiate every nested resource once.
+
+    Building a resource normalizes its method descriptions in place. Doing it
+    for the whole tree up front, under the cache lock, means later concurrent
+    builds from the shared document never see it mid-update.
+    """
+    for name, child_desc in resource_desc.get("resources", {}).items():
+        child = getattr(resource, fix_method_name(name))()
+        _prime_resources(child, child_desc)
+
+
+def _discovery_document(api: str, version: str) -> dict[str, Any]:
+    """Return the parsed discovery document for an API, loading it on first use."""
+    key = (api, version)
+    document = _DOCUMENTS.get(key)
+    if document is not None:
+        return document
+
+    with _lock:
+        document = _DOCUMENTS.get(key)
+        if document is None:
+            raw = discovery_cache.get_static_doc(api, version)
+            if raw is None:
+                raise ValueError(f"No bundled discovery document for {api} {version}")
+            document = json.loads(raw)
+            _prime_resources(build_from_document(document, http=build_http()), document)
+            _DOCUMENTS[key] = document
+            logger.debug("Cached discovery document for %s %s", api, version)
+    return document
+
+
+def get_service(api: str, version: str, creds: Credentials):
+    """
+    Build a Google API service for one user's credentials.
+
+    Args:
+        api: API name, e.g. "sheets"
+        version: API version, e.g. "v4"
+        creds: The user's OAuth credentials
+
+    Returns:
+        googleapiclient Resource bound to creds over the shared connection pool.
+    """
+    return build_from_document(_discovery_document(api, version), http=authorized_http(creds))
@@ -0,0 +1,84 @@
+"""
+Thread pool for blocking Google API calls.
+
+googleapiclient is synchronous: every ``.execute()`` blocks the calling
+thread until Google responds. Async routes and the daily cron hand those
+calls to a dedicated, bounded thread pool so the event loop keeps serving
+other requests while a slow sheet read or draft creation is in flight.
+
+Daily-run calls go through ``run_google_batch_call()`` instead, on a pool
+of their own: they can sleep in their worker thread for quota waits and
+rate-limit backoff (see google_quota), and must not starve request-path
+calls such as the OAuth callback or sheet validation.
+
+Pool sizes are controlled by GOOGLE_API_MAX_WORKERS and
+GOOGLE_API_BATCH_MAX_WORKERS.
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Lazy pool — created on first use so importing this module has no side effects
+_executor: ThreadPoolExecutor | None = None
+_batch_executor: ThreadPoolExecutor | None = None
+
+
+def get_google_executor() -> ThreadPoolExecutor:
+    """Return the process-wide Google API thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.google_api_max_workers),
+            thread_name_prefix="google-api",
+        )
+    return _executor
+
+
+def get_google_batch_executor() -> ThreadPoolExecutor:
+    """Return the daily-run Google API thread pool, creating it on first use."""
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.google_api_batch_max_workers),
+            thread_name_prefix="google-api-batch",
+        )
+    return _batch_executor
+
+
+async def run_google_call(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Google API function in the Google thread pool.
+
+    Exceptions raised by ``fn`` propagate to the awaiting coroutine unchanged.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_google_executor(),
+        functools.partial(fn, *args, **kwargs),
+    )
+
+
+async def run_google_batch_call(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Like run_google_call, but in the daily-run thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_google_batch_executor(),
+        functools.partial(fn, *args, **kwargs),
+    )
+
+
+def shutdown_google_executor() -> None:
+    """Shut down the thread pools (called from the app lifespan on shutdown)."""
+    global _executor, _batch_executor
+    for executor in (_executor, _batch_executor):
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    _executor = _batch_executor = None
@@ -2,20 +2,63 @@
 Gmail API wrapper.
 
 Provides functions for creating email drafts using the user's own OAuth credentials.
+Async callers use the ``*_async`` variants, which run in the Google API thread pool.
 """
 import base64
 import logging
+import time
+from dataclasses import dataclass
 from email.mime.text import MIMEText
+from typing import Optional
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+
+from app.core.config import settings
+from app.services.google_clients import get_service
+from app.services.google_executor import run_google_batch_call, run_google_call
+from app.services.google_quota import GMAIL_DRAFT_CREATE_UNITS, execute, is_rate_limited, retry_delay
 
 logger = logging.getLogger(__name__)
 
+# Hard cap on calls per Gmail batch request
+GMAIL_BATCH_LIMIT = 100
+
+
+@dataclass
+class DraftRequest:
+    """One draft to create in a batch. ``key`` identifies it to the caller (e.g. sheet row)."""
+    key: int
+    to: str
+    subject: str
+    body_html: str
+
+
+@dataclass
+class DraftResult:
+    """Outcome of one batched draft: ids on success, error message on failure."""
+    key: int
+    draft_id: Optional[str] = None
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 def _gmail_service(creds: Credentials):
     """Build Gmail API service."""
-    return build("gmail", "v1", credentials=creds, cache_discovery=False)
+    return get_service("gmail", "v1", creds)
+
+
+def _draft_body(to: str, subject: str, body_html: str) -> dict:
+    """Encode an HTML email as a drafts.create request body."""
+    message = MIMEText(body_html, "html")
+    message["to"] = to
+    message["subject"] = subject
+
+    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    return {"message": {"raw": raw}}
 
 
 def create_draft(
@@ -38,20 +81,126 @@ def create_draft(
     """
     service = _gmail_service(creds)
 
-    message = MIMEText(body_html, "html")
-    message["to"] = to
-    message["subject"] = subject
-
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-
-    draft = (
-        service.users()
-        .drafts()
-        .create(userId="me", body={"message": {"raw": raw}})
-        .execute()
+    draft = execute(
+        service.users().drafts().create(userId="me", body=_draft_body(to, subject, body_html)),
+        "gmail",
+        cost=GMAIL_DRAFT_CREATE_UNITS,
     )
 
     return {
         "draft_id": draft["id"],
         "message_id": draft["message"]["id"],
     }
+
+
+def create_drafts_batch(
+    creds: Credentials,
+    drafts: list[DraftRequest],
+) -> list[DraftResult]:
+    """
+    Create several Gmail drafts using batch HTTP requests.
+
+    Drafts are grouped into multipart batch requests of GMAIL_DRAFT_BATCH_SIZE
+    (at most GMAIL_BATCH_LIMIT), so N drafts cost ceil(N / size) round trips
+    instead of N. A failure of one draft does not affect the others. Each
+    batch is charged its drafts' quota units; drafts rejected with a rate
+    limit are re-sent after backoff, up to GOOGLE_API_MAX_RETRIES times.
+
+    Args:
+        creds: Google OAuth credentials
+        drafts: Drafts to create
+
+    Returns:
+        One DraftResult per request, in request order.
+
+    Raises:
+        Exception if a whole batch request fails (network error, token
+        refresh failure) before any draft was created. Once some drafts
+        exist, a failed batch is recorded as the error of every draft not
+        yet created and the results are returned, so created drafts are
+        never reported as failed.
+    """
+    if not drafts:
+        return []
+
+    service = _gmail_service(creds)
+    size = max(1, min(settings.gmail_draft_batch_size, GMAIL_BATCH_LIMIT))
+    results: list[DraftResult] = [DraftResult(key=d.key) for d in drafts]
+    throttled: dict[int, Exception] = {}
+
+    def on_response(request_id: str, response: dict, exception: Exception) -> None:
+        index = int(request_id)
+        item = results[index]
+        if exception is not None:
+            item.error = str(exception)
+            if is_rate_limited(exception):
+                throttled[index] = exception
+        else:
+            item.draft_id = response["id"]
+            item.message_id = response["message"]["id"]
+            item.error = None
+
+    pending = list(range(len(drafts)))
+    max_retries = max(0, settings.google_api_max_retries)
+    for attempt in range(max_retries + 1):
+        throttled.clear()
+        for start in range(0, len(pending), size):
+            chunk = pending[start:start + size]
+            batch = service.new_batch_http_request(callback=on_response)
+            for index in chunk:
+                draft = drafts[index]
+                batch.add(
+                    service.users().drafts().create(
+                        userId="me",
+                        body=_draft_body(draft.to, draft.subject, draft.body_html),
+                    ),
+                    request_id=str(index),
+                )
+            try:
+                execute(batch, "gmail", cost=GMAIL_DRAFT_CREATE_UNITS * len(chunk), creds=creds)
+            except Exception as e:
+                if not any(item.draft_id is not None for item in results):
+                    raise
+                # Keep drafts created so far; fail only those not sent or not yet created
+                failed = [index for index in pending[start:] if results[index].draft_id is None]
+                for index in failed:
+                    results[index].error = str(e)
+                logger.warning(f"Draft batch failed, {len(failed)} drafts not created: {e}")
+                return results
+
+        if not throttled or attempt >= max_retries:
+            break
+        delays = [retry_delay(error, attempt) for error in throttled.values()]
+        if None in delays:
+            break
+        delay = max(delays)
+        logger.warning(
+            f"{len(throttled)} drafts rate limited, retrying in {delay:.1f}s "
+            f"(attempt {attempt + 1}/{max_retries})"
+        )
+        time.sleep(delay)
+        pending = sorted(throttled)
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Async variants
+# ---------------------------------------------------------------------------
+
+async def create_draft_async(
+    creds: Credentials,
+    to: str,
+    subject: str,
+    body_html: str,
+) -> dict:
+    """Async variant of create_draft."""
+    return await run_google_call(create_draft, creds, to, subject, body_html)
+
+
+async def create_drafts_batch_async(
+    creds: Credentials,
+    drafts: list[DraftRequest],
+) -> list[DraftResult]:
+    """Async variant of create_drafts_batch (daily-run pool)."""
+    return await run_google_batch_call(create_drafts_batch, creds, drafts)
@@ -0,0 +1,107 @@
+"""
+Shared, keep-alive HTTP transport for all Google API traffic.
+
+By default every googleapiclient service and every credential refresh gets
+its own ``httplib2.Http``, so each user paid a fresh TLS handshake to
+sheets.googleapis.com, gmail.googleapis.com and oauth2.googleapis.com.
+
+This module exposes one process-wide ``requests.Session`` (urllib3
+connection pool, safe to share across the Google API thread pool) behind
+an httplib2-compatible adapter, which is what googleapiclient and
+google-auth-httplib2 expect. Pool size and timeouts come from settings.
+"""
+import logging
+import threading
+
+import google_auth_httplib2
+import httplib2
+import requests
+from google.oauth2.credentials import Credentials
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pooled_http: "PooledHttp | None" = None
+_lock = threading.Lock()
+
+
+class PooledHttp:
+    """
+    Minimal ``httplib2.Http`` stand-in backed by a pooled requests session.
+
+    Only the surface used by googleapiclient and google-auth-httplib2 is
+    implemented: ``request()`` returning ``(httplib2.Response, bytes)`` plus
+    the attributes AuthorizedHttp proxies.
+    """
+
+    def __init__(self, session: requests.Session, timeout: tuple[float, float]):
+        self._session = session
+        self.timeout = timeout
+        self.follow_redirects = True
+        self.redirect_codes = frozenset((300, 301, 302, 303, 307, 308))
+        self.connections = {}
+
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body=None,
+        headers: dict | None = None,
+        redirections: int = 5,
+        connection_type=None,
+    ) -> tuple[httplib2.Response, bytes]:
+        response = self._session.request(
+            method,
+            uri,
+            data=body,
+            headers=headers,
+            timeout=self.timeout,
+            allow_redirects=self.follow_redirects and redirections > 0,
+        )
+        info = {key.lower(): value for key, value in response.headers.items()}
+        info["status"] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+
+    def add_certificate(self, key, cert, domain, password=None) -> None:
+        raise NotImplementedError("Client certificates are not supported by the pooled transport")
+
+    def close(self) -> None:
+        # The session is shared process-wide; individual services must not close it.
+        pass
+
+
+def get_pooled_http() -> PooledHttp:
+    """Return the process-wide pooled transport, creating it on first use."""
+    global _pooled_http
+    if _pooled_http is None:
+        with _lock:
+            if _pooled_http is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,  # one pool per Google host we talk to
+                    pool_maxsize=max(1, settings.google_http_pool_maxsize),
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                _pooled_http = PooledHttp(
+                    session,
+                    timeout=(
+                        settings.google_http_connect_timeout_seconds,
+                        settings.google_http_read_timeout_seconds,
+                    ),
+                )
+    return _pooled_http
+
+
+def authorized_http(creds: Credentials) -> google_auth_httplib2.AuthorizedHttp:
+    """Wrap the pooled transport with a user's credentials (auto-refreshing)."""
+    return google_auth_httplib2.AuthorizedHttp(creds, http=get_pooled_http())
+
+
+def google_auth_request() -> google_auth_httplib2.Request:
+    """google-auth transport request for explicit credential refreshes over the pool."""
+    return google_auth_httplib2.Request(get_pooled_http())
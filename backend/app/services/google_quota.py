@@ -0,0 +1,233 @@
+"""
+Client-side quota limiting for Google API calls.
+
+Google enforces per-project and per-user quotas: Sheets counts read and
+write requests per minute, Gmail counts quota units (drafts.create costs
+10). With many users processed concurrently the backend would otherwise
+burst past them and get throttled.
+
+Wrappers run each request through ``execute()``. It takes tokens from two
+token buckets for the API — one shared by the process (project quota) and
+one for the Google user the request is authorized as — sleeping in the
+calling worker thread until both allow it. The daily run's calls, which do
+most of the waiting, use their own thread pool (run_google_batch_call) so
+those sleeps never hold request-path workers. Rate-limit responses (429, or
+403 rateLimitExceeded/userRateLimitExceeded) are retried with jittered
+exponential backoff that never retries sooner than the server's
+Retry-After.
+
+Limits come from settings; a limit of 0 disables that bucket.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+from googleapiclient.errors import HttpError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Quota units per Gmail drafts.create call
+GMAIL_DRAFT_CREATE_UNITS = 10
+
+# Buckets hold this many seconds of quota, so a short burst (one user's run)
+# passes unthrottled while the per-minute rate still holds
+BURST_SECONDS = 10.0
+
+# Per-user buckets kept (LRU); an evicted user starts again with a full bucket
+MAX_USER_BUCKETS = 4096
+
+_RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``per_minute`` tokens per minute.
+
+    ``reserve()`` takes the tokens immediately, going into debt if needed,
+    and returns how long the caller must wait; debt makes concurrent callers
+    queue in arrival order.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float = 1) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def _limits(api: str) -> tuple[int, int]:
+    """(per-project, per-user) limit per minute for an API; 0 = unlimited."""
+    limits = {
+        "sheets_read": (
+            settings.google_sheets_reads_per_minute,
+            settings.google_sheets_reads_per_minute_per_user,
+        ),
+        "sheets_write": (
+            settings.google_sheets_writes_per_minute,
+            settings.google_sheets_writes_per_minute_per_user,
+        ),
+        "gmail": (
+            settings.google_gmail_units_per_minute,
+            settings.google_gmail_units_per_minute_per_user,
+        ),
+    }
+    return limits.get(api, (0, 0))
+
+
+class QuotaLimiter:
+    """Token buckets per API: one for the project, one per Google user."""
+
+    def __init__(self):
+        self._project: dict[str, TokenBucket] = {}
+        self._users: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _buckets(self, api: str, user_key: Optional[str]) -> list[TokenBucket]:
+        project_limit, user_limit = _limits(api)
+        buckets = []
+        with self._lock:
+            if project_limit > 0:
+                bucket = self._project.get(api)
+                if bucket is None:
+                    bucket = self._project[api] = TokenBucket(project_limit)
+                buckets.append(bucket)
+            if user_limit > 0 and user_key is not None:
+                key = (api, user_key)
+                bucket = self._users.get(key)
+                if bucket is None:
+                    bucket = self._users[key] = TokenBucket(user_limit)
+                    if len(self._users) > MAX_USER_BUCKETS:
+                        self._users.popitem(last=False)
+                else:
+                    self._users.move_to_end(key)
+                buckets.append(bucket)
+        return buckets
+
+    def acquire(self, api: str, user_key: Optional[str] = None, cost: float = 1) -> float:
+        """Block until ``cost`` tokens are available in every bucket; returns the wait."""
+        wait = max((bucket.reserve(cost) for bucket in self._buckets(api, user_key)), default=0.0)
+        if wait > 0:
+            logger.debug(f"Throttling {api} call for {wait:.2f}s to stay within quota")
+            time.sleep(wait)
+        return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._project.clear()
+            self._users.clear()
+
+
+_limiter = QuotaLimiter()
+
+
+def quota_user(creds: Any) -> Optional[str]:
+    """Stable, non-secret key for the Google user behind ``creds`` (None if unknown)."""
+    token = getattr(creds, "refresh_token", None)
+    if not isinstance(token, str) or not token:
+        return None
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+
+def is_rate_limited(error: Optional[BaseException]) -> bool:
+    """True for Google's rate-limit responses (429, or 403 with a rate-limit reason)."""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status == 429:
+        return True
+    content = error.content if isinstance(error.content, bytes) else str(error.content).encode()
+    return status == 403 and any(reason in content for reason in _RATE_LIMIT_REASONS)
+
+
+def _retry_after_seconds(error: HttpError) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date), if present."""
+    value = error.resp.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(error: HttpError, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retry ``attempt`` (0-based) of a rate-limited call.
+
+    Exponential backoff with jitter over the upper half of the window,
+    waiting at least the server's Retry-After. Returns None if Retry-After
+    asks for longer than GOOGLE_API_BACKOFF_MAX_SECONDS (don't hold a worker
+    thread that long).
+    """
+    base = settings.google_api_backoff_seconds
+    ceiling = min(settings.google_api_backoff_max_seconds, base * 2 ** attempt)
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+    retry_after = _retry_after_seconds(error)
+    if retry_after is not None:
+        if retry_after > settings.google_api_backoff_max_seconds:
+            return None
+        delay = max(delay, retry_after + random.uniform(0, base))
+    return delay
+
+
+def execute(request: Any, api: str, cost: float = 1, creds: Any = None) -> Any:
+    """
+    Run ``request.execute()`` within quota, retrying rate-limit errors.
+
+    Args:
+        request: googleapiclient HttpRequest or BatchHttpRequest
+        api: Quota bucket: "sheets_read", "sheets_write", "gmail" or "drive"
+        cost: Tokens taken per attempt (requests, or Gmail quota units)
+        creds: Credentials the request runs as (default: the request's own)
+
+    Raises:
+        HttpError once GOOGLE_API_MAX_RETRIES is exhausted, or for any
+        error that is not a rate limit.
+    """
+    if creds is None:
+        creds = getattr(getattr(request, "http", None), "credentials", None)
+    user_key = quota_user(creds)
+    max_retries = max(0, settings.google_api_max_retries)
+    for attempt in range(max_retries + 1):
+        _limiter.acquire(api, user_key, cost)
+        try:
+            return request.execute()
+        except HttpError as e:
+            if not is_rate_limited(e) or attempt >= max_retries:
+                raise
+            delay = retry_delay(e, attempt)
+            if delay is None:
+                raise
+            logger.warning(
+                f"Rate limited on {api} (HTTP {e.resp.status}), retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{max_retries})"
+            )
+            time.sleep(delay)
+
+
+def reset_quota_buckets() -> None:
+    """Forget all bucket state (tests)."""
+    _limiter.reset()
@@ -3,12 +3,34 @@ Google Sheets API wrapper.
 
 Provides functions for listing, validating, creating, reading, and updating
 Google Sheets using the user's own OAuth credentials.
+
+Every function is blocking. Async callers use the ``*_async`` variants,
+which run the same call in the Google API thread pool. Requests go through
+google_quota.execute (per-project / per-user read and write quotas, 429
+backoff).
+
+Large sheets are streamed in fixed-size row windows (``iter_invoice_sheet``).
+Callers that only need some columns pass ``columns``: header positions are
+resolved once per sheet and cached, and each window is a single
+values.batchGet of just those column ranges (column-major), instead of
+every cell in A:Z.
+Parsed sheets are kept in a size-bounded, in-process snapshot cache keyed by
+the spreadsheet's Drive ``modifiedTime``, so an unchanged sheet is served
+from memory after a cheap metadata request instead of a full read.
 """
 import logging
-from typing import Any
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from app.core.config import settings
+from app.services.google_clients import get_service
+from app.services.google_executor import run_google_batch_call, run_google_call
+from app.services.google_quota import execute
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +50,12 @@ TEMPLATE_HEADERS = [
 
 def _sheets_service(creds: Credentials):
     """Build Google Sheets API service."""
-    return build("sheets", "v4", credentials=creds, cache_discovery=False)
+    return get_service("sheets", "v4", creds)
 
 
 def _drive_service(creds: Credentials):
     """Build Google Drive API service (for listing spreadsheets)."""
-    return build("drive", "v3", credentials=creds, cache_discovery=False)
+    return get_service("drive", "v3", creds)
 
 
 def list_user_sheets(creds: Credentials) -> list[dict[str, str]]:
@@ -44,15 +66,14 @@ def list_user_sheets(creds: Credentials) -> list[dict[str, str]]:
         List of dicts with 'id' and 'name' keys.
     """
     service = _drive_service(creds)
-    results = (
-        service.files()
-        .list(
+    results = execute(
+        service.files().list(
             q="mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
             fields="files(id, name)",
             orderBy="modifiedTime desc",
             pageSize=50,
-        )
-        .execute()
+        ),
+        "drive",
     )
     files = results.get("files", [])
     return [{"id": f["id"], "name": f["name"]} for f in files]
@@ -70,16 +91,16 @@ def validate_sheet_columns(creds: Credentials, sheet_id: str) -> list[str]:
         List of column name strings from row 1.
     """
     service = _sheets_service(creds)
-    result = (
-        service.spreadsheets()
-        .values()
-        .get(spreadsheetId=sheet_id, range="A1:Z1")
-        .execute()
+    result = execute(
+        service.spreadsheets().values().get(spreadsheetId=sheet_id, range="A1:Z1"),
+        "sheets_read",
     )
     values = result.get("values", [])
     if not values:
         return []
-    return [str(v).strip() for v in values[0]]
+    headers = [str(v).strip() for v in values[0]]
+    _headers.put(sheet_id, headers)
+    return headers
 
 
 def create_template_sheet(creds: Credentials) -> dict[str, str]:
@@ -117,13 +138,218 @@ def create_template_sheet(creds: Credentials) -> dict[str, str]:
         ],
     }
 
-    result = service.spreadsheets().create(body=spreadsheet_body).execute()
+    result = execute(service.spreadsheets().create(body=spreadsheet_body), "sheets_write")
     sheet_id = result["spreadsheetId"]
     sheet_url = result["spreadsheetUrl"]
 
     return {"sheet_id": sheet_id, "sheet_url": sheet_url}
 
 
+@dataclass
+class InvoiceSheet:
+    """
+    Header row and data rows from a single read of an invoice sheet.
+
+    Stored column-wise: one list of cell strings per header, padded to the
+    number of data rows, plus the 1-indexed sheet row number of each data
+    row. Whole-column passes avoid building a dict per row; ``row()`` and
+    ``rows`` materialize dicts for the rows that need them.
+    """
+    headers: list[str]
+    columns: dict[str, list[str]]
+    row_numbers: list[int]
+    modified_time: Optional[str] = None  # Drive modifiedTime the rows were read at
+
+    @classmethod
+    def from_values(cls, values: list[list[Any]]) -> "InvoiceSheet":
+        """Build from a values.get result (row 1 = headers)."""
+        if not values:
+            return cls(headers=[], columns={}, row_numbers=[])
+        headers = [str(h).strip() for h in values[0]]
+        return cls.from_data(headers, values[1:], first_row=2)
+
+    @classmethod
+    def from_data(cls, headers: list[str], data: list[list[Any]], first_row: int) -> "InvoiceSheet":
+        """Build from data rows only; ``first_row`` is the sheet row of data[0]."""
+        # Later duplicate headers win, as they did for row dicts
+        columns = {
+            header: [row[j] if j < len(row) else "" for row in data]
+            for j, header in enumerate(headers)
+        }
+        return cls(
+            headers=headers,
+            columns=columns,
+            row_numbers=list(range(first_row, first_row + len(data))),
+        )
+
+    @classmethod
+    def from_columns(cls, headers: list[str], columns: dict[str, list[Any]], first_row: int) -> "InvoiceSheet":
+        """
+        Build from column-major values (a subset of ``headers``).
+
+        ``first_row`` is the sheet row of each column's first value; columns
+        are padded with '' to the longest one.
+        """
+        count = max((len(values) for values in columns.values()), default=0)
+        return cls(
+            headers=headers,
+            columns={name: values + [""] * (count - len(values)) for name, values in columns.items()},
+            row_numbers=list(range(first_row, first_row + count)),
+        )
+
+    @classmethod
+    def concat(cls, parts: list["InvoiceSheet"]) -> "InvoiceSheet":
+        """Join consecutive windows of the same sheet into one."""
+        if not parts:
+            return cls(headers=[], columns={}, row_numbers=[])
+        headers = parts[0].headers
+        columns = {name: [value for part in parts for value in part.column(name)] for name in parts[0].columns}
+        row_numbers = [number for part in parts for number in part.row_numbers]
+        return cls(headers=headers, columns=columns, row_numbers=row_numbers, modified_time=parts[0].modified_time)
+
+    @classmethod
+    def from_rows(cls, headers: list[str], rows: list[dict[str, Any]]) -> "InvoiceSheet":
+        """Build from row dicts carrying '_row_number' (tests, legacy callers)."""
+        columns = {header: [row.get(header, "") for row in rows] for header in headers}
+        return cls(headers=headers, columns=columns, row_numbers=[row["_row_number"] for row in rows])
+
+    def __len__(self) -> int:
+        return len(self.row_numbers)
+
+    def column(self, name: str) -> list[str]:
+        """Cell values of one column ('' for every row if the column is missing)."""
+        values = self.columns.get(name)
+        return values if values is not None else [""] * len(self.row_numbers)
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Materialize data row ``index`` (0-based) as a dict with '_row_number'."""
+        row_dict = {header: values[index] for header, values in self.columns.items()}
+        row_dict["_row_number"] = self.row_numbers[index]
+        return row_dict
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        return [self.row(i) for i in range(len(self.row_numbers))]
+
+
+class SheetSnapshotCache:
+    """
+    LRU cache of parsed invoice sheets, bounded by the total number of rows.
+
+    An entry is only served if the caller's current Drive modifiedTime
+    matches the one it was read at. Entries are keyed by sheet and the
+    column subset that was read. Cached sheets are shared between runs and
+    must be treated as read-only.
+    """
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self._entries: OrderedDict[tuple[str, Optional[tuple[str, ...]]], InvoiceSheet] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        sheet_id: str,
+        modified_time: str,
+        columns: Optional[tuple[str, ...]] = None,
+    ) -> Optional[InvoiceSheet]:
+        key = (sheet_id, columns)
+        with self._lock:
+            sheet = self._entries.get(key)
+            if sheet is None or sheet.modified_time != modified_time:
+                return None
+            self._entries.move_to_end(key)
+            return sheet
+
+    def put(self, sheet_id: str, sheet: InvoiceSheet, columns: Optional[tuple[str, ...]] = None) -> None:
+        key = (sheet_id, columns)
+        size = len(sheet) + 1
+        with self._lock:
+            self._pop(key)
+            if size > self.max_rows:
+                return
+            self._entries[key] = sheet
+            self._rows += size
+            while self._rows > self.max_rows:
+                self._pop(next(iter(self._entries)))
+
+    def discard(self, sheet_id: str) -> None:
+        """Drop every entry for the sheet, whatever columns were read."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == sheet_id]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._rows = 0
+
+    def _pop(self, key: tuple[str, Optional[tuple[str, ...]]]) -> None:
+        sheet = self._entries.pop(key, None)
+        if sheet is not None:
+            self._rows -= len(sheet) + 1
+
+
+class SheetHeaderCache:
+    """
+    LRU map of sheet ID → header row, so column positions are resolved once.
+
+    Entries may go stale when a user edits row 1; column reads verify the
+    header cell of every column they fetch and re-resolve on a mismatch.
+    """
+
+    def __init__(self, max_sheets: int):
+        self.max_sheets = max_sheets
+        self._entries: OrderedDict[str, list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sheet_id: str) -> Optional[list[str]]:
+        with self._lock:
+            headers = self._entries.get(sheet_id)
+            if headers is not None:
+                self._entries.move_to_end(sheet_id)
+            return headers
+
+    def put(self, sheet_id: str, headers: list[str]) -> None:
+        if not headers:
+            return
+        with self._lock:
+            self._entries[sheet_id] = headers
+            self._entries.move_to_end(sheet_id)
+            while len(self._entries) > self.max_sheets:
+                self._entries.popitem(last=False)
+
+    def discard(self, sheet_id: str) -> None:
+        with self._lock:
+            self._entries.pop(sheet_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_snapshots = SheetSnapshotCache(settings.sheet_snapshot_cache_max_rows)
+
+# Header rows are a few dozen strings each
+_headers = SheetHeaderCache(max_sheets=4096)
+
+
+def read_invoice_sheet(creds: Credentials, sheet_id: str) -> InvoiceSheet:
+    """
+    Read the header row and all data rows with one values.get request.
+
+    The result is column-wise; short rows are padded with ''. Row numbers
+    are 1-indexed, where row 1 = headers, row 2 = first data row.
+    """
+    service = _sheets_service(creds)
+    result = execute(
+        service.spreadsheets().values().get(spreadsheetId=sheet_id, range="A:Z"),
+        "sheets_read",
+    )
+    return InvoiceSheet.from_values(result.get("values", []))
+
+
 def read_invoice_rows(creds: Credentials, sheet_id: str) -> list[dict[str, Any]]:
     """
     Read all rows from the invoice sheet and return as list of dicts.
@@ -132,27 +358,250 @@ def read_invoice_rows(creds: Credentials, sheet_id: str) -> list[dict[str, Any]]
     Returns list of dicts keyed by header names, with a '_row_number' field
     (1-indexed, where row 1 = headers, row 2 = first data row).
     """
-    service = _sheets_service(creds)
-    result = (
-        service.spreadsheets()
-        .values()
-        .get(spreadsheetId=sheet_id, range="A:Z")
-        .execute()
+    return read_invoice_sheet(creds, sheet_id).rows
+
+
+def get_sheet_modified_time(creds: Credentials, sheet_id: str) -> str:
+    """Return the spreadsheet's Drive modifiedTime (RFC 3339 string)."""
+    service = _drive_service(creds)
+    result = execute(
+        service.files().get(fileId=sheet_id, fields="modifiedTime", supportsAllDrives=True),
+        "drive",
     )
-    values = result.get("values", [])
-    if len(values) < 2:
-        return []
+    return result["modifiedTime"]
+
+
+def _sheet_row_count(service, sheet_id: str) -> int:
+    """Grid row count of the spreadsheet's first sheet (what 'A:Z' reads)."""
+    result = execute(
+        service.spreadsheets().get(spreadsheetId=sheet_id, fields="sheets.properties.gridProperties.rowCount"),
+        "sheets_read",
+    )
+    return result["sheets"][0]["properties"]["gridProperties"]["rowCount"]
+
+
+def _later_windows(service, sheet_id: str, window_rows: int) -> Iterator[tuple[int, int]]:
+    """
+    (first_row, last_row) of each window after the first, up to the grid row count.
+
+    The row count is fetched lazily, after the first window has been
+    yielded. A short first window does not prove the sheet ends there: the
+    API trims trailing blank rows, so a blank row on the window boundary
+    hides any data below it.
+    """
+    row_count = _sheet_row_count(service, sheet_id)
+    start = window_rows + 2
+    while start <= row_count:
+        end = min(start + window_rows - 1, row_count)
+        yield start, end
+        start = end + 1
+
+
+def _resolve_headers(service, sheet_id: str) -> list[str]:
+    """Header row of the sheet, from the header cache or a values.get of A1:Z1."""
+    headers = _headers.get(sheet_id)
+    if headers is None:
+        result = execute(
+            service.spreadsheets().values().get(spreadsheetId=sheet_id, range="A1:Z1"),
+            "sheets_read",
+        )
+        values = result.get("values", [])
+        headers = [str(v).strip() for v in values[0]] if values else []
+        _headers.put(sheet_id, headers)
+    return headers
+
+
+def _column_letters(headers: list[str], columns: tuple[str, ...]) -> dict[str, str]:
+    """Column letter of each requested column present in ``headers``."""
+    # Later duplicate headers win, as in InvoiceSheet.from_data
+    positions = {header: index for index, header in enumerate(headers)}
+    return {name: chr(ord("A") + positions[name]) for name in columns if name in positions}
+
+
+def _read_columns(
+    service,
+    sheet_id: str,
+    headers: list[str],
+    columns: tuple[str, ...],
+    first_row: int,
+    last_row: int,
+    with_header_row: bool = False,
+) -> tuple[dict[str, list[Any]], Optional[list[str]]]:
+    """
+    Fetch rows first_row..last_row of the named columns in one values.batchGet.
+
+    Columns missing from ``headers`` are not requested. Each returned list
+    is trimmed of trailing blanks by the API. With ``with_header_row`` the
+    same request also reads A1:Z1 and returns it as the current header row
+    (else None).
+    """
+    letters = _column_letters(headers, columns)
+    ranges = [f"{letter}{first_row}:{letter}{last_row}" for letter in letters.values()]
+    if with_header_row:
+        ranges.append("A1:Z1")
+    if not ranges:
+        return {}, None
+    result = execute(
+        service.spreadsheets().values().batchGet(
+            spreadsheetId=sheet_id,
+            ranges=ranges,
+            majorDimension="COLUMNS",
+            # Cell text as displayed, which is what the row parsers expect
+            valueRenderOption="FORMATTED_VALUE",
+        ),
+        "sheets_read",
+    )
+    value_ranges = result.get("valueRanges", [])
+    cells = {
+        name: (value_range.get("values") or [[]])[0]
+        for name, value_range in zip(letters, value_ranges)
+    }
+    header_row = None
+    if with_header_row:
+        header_cells = value_ranges[-1].get("values", []) if len(value_ranges) == len(ranges) else []
+        header_row = [str(column[0]).strip() if column else "" for column in header_cells]
+    return cells, header_row
+
+
+def _iter_sheet_columns(
+    service,
+    sheet_id: str,
+    columns: tuple[str, ...],
+    window_rows: int,
+) -> Iterator[InvoiceSheet]:
+    """Column-subset windows for iter_invoice_sheet."""
+    # With cached headers, the first window's request also reads the whole
+    # header row, so cached positions are checked on every read at no extra
+    # request: moved columns and newly added ones (e.g. Last_Sent_At) are
+    # picked up. On a cache miss the headers were just read; don't re-read.
+    cached = _headers.get(sheet_id) is not None
+    headers = _resolve_headers(service, sheet_id)
+    cells, current = _read_columns(
+        service, sheet_id, headers, columns, 1, window_rows + 1, with_header_row=cached
+    )
+    if current is not None and current != headers:
+        logger.info(f"Header row of sheet {sheet_id} changed, re-resolving columns")
+        _headers.discard(sheet_id)
+        _headers.put(sheet_id, current)
+        stale_letters = _column_letters(headers, columns)
+        headers = current
+        if _column_letters(headers, columns) != stale_letters:
+            cells, _ = _read_columns(service, sheet_id, headers, columns, 1, window_rows + 1)
+    yield InvoiceSheet.from_columns(headers, {name: values[1:] for name, values in cells.items()}, first_row=2)
+    if not headers:
+        return
+
+    for start, end in _later_windows(service, sheet_id, window_rows):
+        cells, _ = _read_columns(service, sheet_id, headers, columns, start, end)
+        yield InvoiceSheet.from_columns(headers, cells, first_row=start)
+
+
+def iter_invoice_sheet(
+    creds: Credentials,
+    sheet_id: str,
+    window_rows: Optional[int] = None,
+    columns: Optional[tuple[str, ...]] = None,
+) -> Iterator[InvoiceSheet]:
+    """
+    Read the invoice sheet in fixed-size row windows.
+
+    The first request reads the header row with the first window
+    (A1:Z{n+1}); later ones read A{start}:Z{start+n-1} up to the sheet's grid
+    row count (one spreadsheets.get, made after the first window is yielded),
+    so blank gaps between rows don't end the read early. Only one window is
+    decoded and held at a time. Each yielded InvoiceSheet carries the
+    headers and its own row numbers.
+
+    With ``columns``, each window is instead one values.batchGet of just
+    those columns (by their cached header positions), and the yielded
+    sheets hold only those columns; ``headers`` is still the full row.
+
+    Args:
+        creds: Google OAuth credentials
+        sheet_id: Google Sheet ID
+        window_rows: Data rows per request (default SHEET_READ_WINDOW_ROWS)
+        columns: Header names to read (default: every column in A:Z)
+    """
+    window_rows = max(1, window_rows or settings.sheet_read_window_rows)
+    service = _sheets_service(creds)
+    if columns is not None:
+        yield from _iter_sheet_columns(service, sheet_id, columns, window_rows)
+        return
+
+    values_api = service.spreadsheets().values()
+
+    first = execute(values_api.get(spreadsheetId=sheet_id, range=f"A1:Z{window_rows + 1}"), "sheets_read")
+    window = InvoiceSheet.from_values(first.get("values", []))
+    yield window
+    headers = window.headers
+    if not headers:
+        return
+
+    for start, end in _later_windows(service, sheet_id, window_rows):
+        result = execute(values_api.get(spreadsheetId=sheet_id, range=f"A{start}:Z{end}"), "sheets_read")
+        yield InvoiceSheet.from_data(headers, result.get("values", []), first_row=start)
 
-    headers = [str(h).strip() for h in values[0]]
-    rows = []
-    for i, row in enumerate(values[1:], start=2):
-        # Pad row to match header length
-        padded = row + [""] * (len(headers) - len(row))
-        row_dict = {headers[j]: padded[j] for j in range(len(headers))}
-        row_dict["_row_number"] = i
-        rows.append(row_dict)
 
-    return rows
+def iter_invoice_sheet_cached(
+    creds: Credentials,
+    sheet_id: str,
+    columns: Optional[tuple[str, ...]] = None,
+) -> Iterator[InvoiceSheet]:
+    """
+    Stream the invoice sheet, reusing the cached parse if it has not changed.
+
+    Checks the file's Drive modifiedTime first (a small metadata request)
+    and, if it matches the cached snapshot's, yields that snapshot as a
+    single window. Otherwise streams windows from iter_invoice_sheet and
+    caches the joined sheet once fully read, if it fits the cache. If the
+    modifiedTime lookup itself fails for a reason other than auth, streams
+    without caching. ``columns`` is passed through to iter_invoice_sheet.
+    """
+    try:
+        modified_time = get_sheet_modified_time(creds, sheet_id)
+    except HttpError as e:
+        if e.resp.status == 401:
+            raise
+        logger.warning(f"modifiedTime lookup failed for sheet {sheet_id}, reading in full: {e}")
+        yield from iter_invoice_sheet(creds, sheet_id, columns=columns)
+        return
+
+    sheet = _snapshots.get(sheet_id, modified_time, columns)
+    if sheet is not None:
+        logger.debug(f"Sheet {sheet_id} unchanged since {modified_time}, using cached snapshot")
+        yield sheet
+        return
+
+    # Keep windows for the snapshot only while the sheet still fits the cache
+    parts: Optional[list[InvoiceSheet]] = []
+    cached_rows = 1  # header row
+    for window in iter_invoice_sheet(creds, sheet_id, columns=columns):
+        window.modified_time = modified_time
+        if parts is not None:
+            cached_rows += len(window)
+            parts = parts + [window] if cached_rows <= _snapshots.max_rows else None
+        yield window
+    if parts is not None:
+        _snapshots.put(sheet_id, InvoiceSheet.concat(parts), columns)
+
+
+def _row_update_data(
+    headers: list[str],
+    row_number: int,
+    updates: dict[str, str],
+) -> list[dict[str, Any]]:
+    """Build values.batchUpdate data entries for one row's column updates."""
+    data = []
+    for col_name, value in updates.items():
+        if col_name not in headers:
+            logger.warning(f"Column '{col_name}' not found in sheet headers, skipping")
+            continue
+        col_index = headers.index(col_name)
+        # Convert 0-indexed column to A1 notation (A=0, B=1, etc.)
+        col_letter = chr(ord("A") + col_index) if col_index < 26 else "A"
+        cell_range = f"{col_letter}{row_number}"
+        data.append({"range": cell_range, "values": [[value]]})
+    return data
 
 
 def update_row_cells(
@@ -172,24 +621,111 @@ def update_row_cells(
         updates: Dict mapping column names to new values
         headers: Optional pre-fetched headers. If None, reads row 1.
     """
+    batch_update_rows(creds, sheet_id, [(row_number, updates)], headers=headers)
+
+
+def batch_update_rows(
+    creds: Credentials,
+    sheet_id: str,
+    row_updates: list[tuple[int, dict[str, str]]],
+    headers: list[str] | None = None,
+) -> None:
+    """
+    Update cells across many rows in a single values.batchUpdate request.
+
+    Args:
+        creds: Google OAuth credentials
+        sheet_id: Google Sheet ID
+        row_updates: List of (1-indexed row number, {column name: new value})
+        headers: Optional pre-fetched headers. If None, reads row 1.
+    """
+    if not row_updates:
+        return
+
     if not headers:
         headers = validate_sheet_columns(creds, sheet_id)
 
-    service = _sheets_service(creds)
     data = []
-
-    for col_name, value in updates.items():
-        if col_name not in headers:
-            logger.warning(f"Column '{col_name}' not found in sheet headers, skipping")
-            continue
-        col_index = headers.index(col_name)
-        # Convert 0-indexed column to A1 notation (A=0, B=1, etc.)
-        col_letter = chr(ord("A") + col_index) if col_index < 26 else "A"
-        cell_range = f"{col_letter}{row_number}"
-        data.append({"range": cell_range, "values": [[value]]})
+    for row_number, updates in row_updates:
+        data.extend(_row_update_data(headers, row_number, updates))
 
     if data:
-        service.spreadsheets().values().batchUpdate(
-            spreadsheetId=sheet_id,
-            body={"valueInputOption": "USER_ENTERED", "data": data},
-        ).execute()
+        service = _sheets_service(creds)
+        execute(
+            service.spreadsheets().values().batchUpdate(
+                spreadsheetId=sheet_id,
+                body={"valueInputOption": "USER_ENTERED", "data": data},
+            ),
+            "sheets_write",
+        )
+        # Our own write changes the sheet; drop the now-stale snapshot
+        _snapshots.discard(sheet_id)
+
+
+# ---------------------------------------------------------------------------
+# Async variants (run in the Google API thread pool)
+# ---------------------------------------------------------------------------
+
+
+async def list_user_sheets_async(creds: Credentials) -> list[dict[str, str]]:
+    """Async variant of list_user_sheets."""
+    return await run_google_call(list_user_sheets, creds)
+
+
+async def validate_sheet_columns_async(creds: Credentials, sheet_id: str) -> list[str]:
+    """Async variant of validate_sheet_columns."""
+    return await run_google_call(validate_sheet_columns, creds, sheet_id)
+
+
+async def create_template_sheet_async(creds: Credentials) -> dict[str, str]:
+    """Async variant of create_template_sheet."""
+    return await run_google_call(create_template_sheet, creds)
+
+
+async def read_invoice_sheet_async(creds: Credentials, sheet_id: str) -> InvoiceSheet:
+    """Async variant of read_invoice_sheet."""
+    return await run_google_call(read_invoice_sheet, creds, sheet_id)
+
+
+async def iter_invoice_sheet_cached_async(
+    creds: Credentials,
+    sheet_id: str,
+    columns: Optional[tuple[str, ...]] = None,
+) -> AsyncIterator[InvoiceSheet]:
+    """Async variant of iter_invoice_sheet_cached; each window is fetched in the daily-run pool."""
+    windows = iter_invoice_sheet_cached(creds, sheet_id, columns)
+    done = object()
+    try:
+        while True:
+            window = await run_google_batch_call(next, windows, done)
+            if window is done:
+                return
+            yield window
+    finally:
+        windows.close()
+
+
+async def read_invoice_rows_async(creds: Credentials, sheet_id: str) -> list[dict[str, Any]]:
+    """Async variant of read_invoice_rows."""
+    return await run_google_call(read_invoice_rows, creds, sheet_id)
+
+
+async def update_row_cells_async(
+    creds: Credentials,
+    sheet_id: str,
+    row_number: int,
+    updates: dict[str, str],
+    headers: list[str] | None = None,
+) -> None:
+    """Async variant of update_row_cells."""
+    await run_google_call(update_row_cells, creds, sheet_id, row_number, updates, headers=headers)
+
+
+async def batch_update_rows_async(
+    creds: Credentials,
+    sheet_id: str,
+    row_updates: list[tuple[int, dict[str, str]]],
+    headers: list[str] | None = None,
+) -> None:
+    """Async variant of batch_update_rows (daily-run pool)."""
+    await run_google_batch_call(batch_update_rows, creds, sheet_id, row_updates, headers=headers)
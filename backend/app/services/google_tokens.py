@@ -3,16 +3,31 @@ Google OAuth token encryption and credential management.
 
 Handles Fernet encryption/decryption of refresh tokens and
 building Google API credentials from stored tokens.
+
+Short-lived access tokens are cached per user so API calls reuse them until
+shortly before expiry instead of hitting the token endpoint on every call:
+in process memory (TTL = expiry minus the refresh margin) and, encrypted
+like the refresh token, on the user row so the cache survives cold starts
+and carries over between cron runs.
 """
 import logging
+import threading
+from datetime import datetime, timedelta
+from uuid import UUID
 
 from cryptography.fernet import Fernet, InvalidToken
 from google.oauth2.credentials import Credentials
 
 from app.core.config import settings
+from app.services.google_executor import run_google_call
+from app.services.google_http import google_auth_request
 
 logger = logging.getLogger(__name__)
 
+# user_id -> (access token, expiry in naive UTC)
+_access_token_cache: dict[UUID, tuple[str, datetime]] = {}
+_cache_lock = threading.Lock()
+
 # Google OAuth scopes required by the application
 # drive.file = only files the user explicitly selects or the app creates (non-sensitive)
 # gmail.compose = create drafts (sensitive, but no read access)
@@ -48,7 +63,8 @@ def get_google_credentials(user) -> Credentials:
     """
     Build Google API credentials from a user's stored refresh token.
 
-    The access token is not stored — it auto-refreshes via the refresh token.
+    A cached access token is attached when one is still comfortably valid;
+    otherwise the token is left empty and auto-refreshes via the refresh token.
 
     Args:
         user: User model instance with google_refresh_token_encrypted
@@ -66,12 +82,85 @@ def get_google_credentials(user) -> Credentials:
         raise ValueError(f"User {user.id} Google token has been revoked")
 
     refresh_token = decrypt_token(user.google_refresh_token_encrypted)
+    token, expiry = _cached_access_token(user)
 
     return Credentials(
-        token=None,  # Will be auto-refreshed
+        token=token,  # None → auto-refreshed on first use
+        expiry=expiry,
         refresh_token=refresh_token,
         token_uri="https://oauth2.googleapis.com/token",
         client_id=settings.google_client_id,
         client_secret=settings.google_client_secret,
         scopes=GOOGLE_SCOPES,
     )
+
+
+def _refresh_margin() -> timedelta:
+    return timedelta(seconds=settings.google_access_token_refresh_margin_seconds)
+
+
+def _is_fresh(expiry: datetime | None) -> bool:
+    """True if a token with this expiry is usable beyond the refresh margin."""
+    return expiry is not None and expiry - _refresh_margin() > datetime.utcnow()
+
+
+def _cached_access_token(user) -> tuple[str | None, datetime | None]:
+    """Look up a still-fresh access token: process memory first, then the user row."""
+    with _cache_lock:
+        cached = _access_token_cache.get(user.id)
+    if cached and _is_fresh(cached[1]):
+        return cached
+
+    if user.google_access_token_encrypted and _is_fresh(user.google_access_token_expires_at):
+        try:
+            token = decrypt_token(user.google_access_token_encrypted)
+        except ValueError:
+            logger.warning(f"Discarding undecryptable cached access token for user {user.id}")
+            return None, None
+        with _cache_lock:
+            _access_token_cache[user.id] = (token, user.google_access_token_expires_at)
+        return token, user.google_access_token_expires_at
+
+    return None, None
+
+
+def remember_access_token(user, creds: Credentials) -> bool:
+    """
+    Cache the credentials' current access token for the user.
+
+    Updates the in-process cache and the encrypted columns on the user row
+    (the caller's session persists them). Returns True if the row changed.
+    """
+    if not creds.token or creds.expiry is None:
+        return False
+
+    with _cache_lock:
+        _access_token_cache[user.id] = (creds.token, creds.expiry)
+
+    if user.google_access_token_expires_at == creds.expiry:
+        return False
+    user.google_access_token_encrypted = encrypt_token(creds.token)
+    user.google_access_token_expires_at = creds.expiry
+    return True
+
+
+def forget_access_token(user) -> None:
+    """Drop any cached access token for the user (disconnect / reconnect)."""
+    with _cache_lock:
+        _access_token_cache.pop(user.id, None)
+    user.google_access_token_encrypted = None
+    user.google_access_token_expires_at = None
+
+
+async def ensure_fresh_credentials(user, creds: Credentials) -> Credentials:
+    """
+    Refresh the access token ahead of expiry, then cache it for the user.
+
+    The refresh runs in the Google API thread pool over the shared
+    connection pool. Raises google.auth.exceptions.RefreshError if Google
+    rejects the refresh token (e.g. invalid_grant after revocation).
+    """
+    if not creds.token or not _is_fresh(creds.expiry):
+        await run_google_call(creds.refresh, google_auth_request())
+    remember_access_token(user, creds)
+    return creds
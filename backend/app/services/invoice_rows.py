@@ -0,0 +1,117 @@
+"""
+Typed invoice records parsed once from sheet cells.
+
+``InvoiceRow`` is a slotted dataclass (no per-instance ``__dict__``) holding
+the parsed values the reminder pipeline works with. Records are built
+column-wise from an ``InvoiceSheet`` so each cell is parsed exactly once at
+ingestion; downstream code reads typed fields instead of re-parsing strings.
+"""
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Optional
+
+from app.services.date_parsing import SheetDateParser
+from app.services.google_sheets import InvoiceSheet
+
+PAID_VALUES = frozenset(("TRUE", "YES", "PAID", "1"))
+
+
+@dataclass(slots=True)
+class InvoiceRow:
+    """One data row of an invoice sheet, parsed."""
+    row_number: int
+    invoice_number: str
+    client_name: str
+    client_email: str
+    amount: Decimal
+    due_date: Optional[date]
+    paid: bool
+    last_stage: Optional[int]
+    last_sent: Optional[date]
+    # As entered in the sheet, for reminder copy
+    amount_text: str = ""
+    due_date_text: str = ""
+
+
+@lru_cache(maxsize=8192)
+def parse_amount(value: str) -> Decimal:
+    """Parse an amount string, stripping currency symbols (memoized; Decimal is immutable)."""
+    if not value or not value.strip():
+        return Decimal("0")
+    cleaned = value.strip().replace("$", "").replace(",", "").replace(" ", "")
+    try:
+        return Decimal(cleaned)
+    except InvalidOperation:
+        return Decimal("0")
+
+
+def is_paid(value: str) -> bool:
+    """Check if the Paid column indicates payment."""
+    return value.strip().upper() in PAID_VALUES
+
+
+def parse_last_stage(value: str) -> Optional[int]:
+    """Parse Last_Stage_Sent column to int."""
+    if not value or not value.strip():
+        return None
+    try:
+        return int(value.strip())
+    except ValueError:
+        return None
+
+
+def invoice_rows(
+    sheet: InvoiceSheet,
+    indices: Optional[list[int]] = None,
+    dates: Optional[SheetDateParser] = None,
+) -> list[InvoiceRow]:
+    """
+    Parse data rows of a sheet into InvoiceRow records, one column at a time.
+
+    Args:
+        sheet: Column-wise sheet contents
+        indices: 0-based data row indices to parse (default: all rows)
+        dates: Date parser to use (default: one that learns from Due_Date)
+
+    Returns:
+        Records in the order of ``indices``.
+    """
+    if indices is None:
+        indices = list(range(len(sheet)))
+    if dates is None:
+        dates = SheetDateParser.for_values(sheet.column("Due_Date"))
+
+    def cells(name: str) -> list[str]:
+        column = sheet.column(name)
+        return [str(column[i]) for i in indices]
+
+    amount_text = cells("Amount")
+    due_text = cells("Due_Date")
+    return [
+        InvoiceRow(
+            row_number=sheet.row_numbers[i],
+            invoice_number=number.strip(),
+            client_name=name.strip(),
+            client_email=email.strip(),
+            amount=parse_amount(amount),
+            due_date=dates.parse(due),
+            paid=is_paid(paid),
+            last_stage=parse_last_stage(stage),
+            last_sent=dates.parse(sent),
+            amount_text=amount,
+            due_date_text=due,
+        )
+        for i, number, name, email, amount, due, paid, stage, sent in zip(
+            indices,
+            cells("Invoice_Number"),
+            cells("Client_Name"),
+            cells("Client_Email"),
+            amount_text,
+            due_text,
+            cells("Paid"),
+            cells("Last_Stage_Sent"),
+            cells("Last_Sent_At"),
+        )
+    ]
@@ -0,0 +1,145 @@
+"""
+Per-user store of invoice sheet row fingerprints.
+
+Lets the daily run skip rows it has already evaluated: each row's
+reminder-relevant columns are hashed and compared with the hash stored on
+the previous run. Rows whose hash and invoice number are unchanged reuse the
+stored paid flag and amount, and only need re-evaluation once their stored
+next-action date (next escalation stage) arrives.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sheet_row_fingerprint import SheetRowFingerprint
+from app.models.user import User
+from app.services.google_sheets import InvoiceSheet
+
+logger = logging.getLogger(__name__)
+
+# Columns whose values decide whether and which reminder a row gets
+FINGERPRINT_COLUMNS = (
+    "Invoice_Number",
+    "Client_Name",
+    "Client_Email",
+    "Amount",
+    "Due_Date",
+    "Paid",
+    "Last_Stage_Sent",
+    "Last_Sent_At",
+)
+
+
+@dataclass
+class RowState:
+    """Evaluated state of one sheet row, as persisted for the next run."""
+    row_number: int
+    invoice_number: str
+    fingerprint: str
+    paid: bool
+    amount: Decimal
+    next_action_date: Optional[date]
+
+
+def _hash_values(values: Iterable[Any]) -> str:
+    joined = "\x1f".join(str(value).strip() for value in values)
+    return hashlib.blake2b(joined.encode(), digest_size=16).hexdigest()
+
+
+def row_fingerprint(row: dict) -> str:
+    """Stable hash of a row's reminder-relevant cell values."""
+    return _hash_values(row.get(col, "") for col in FINGERPRINT_COLUMNS)
+
+
+def sheet_fingerprints(sheet: InvoiceSheet) -> list[str]:
+    """row_fingerprint for every data row, computed column-wise."""
+    return [_hash_values(values) for values in zip(*(sheet.column(col) for col in FINGERPRINT_COLUMNS))]
+
+
+def is_unchanged(stored: Optional[SheetRowFingerprint], invoice_number: str, fingerprint: str) -> bool:
+    """True if the stored entry describes this exact row content."""
+    return (
+        stored is not None
+        and stored.fingerprint == fingerprint
+        and stored.invoice_number == invoice_number
+    )
+
+
+async def load_row_fingerprints(db: AsyncSession, user: User) -> dict[int, SheetRowFingerprint]:
+    """Stored fingerprints for the user's current sheet, keyed by row number."""
+    result = await db.execute(
+        select(SheetRowFingerprint).where(SheetRowFingerprint.user_id == user.id)
+    )
+    return {
+        entry.row_number: entry
+        for entry in result.scalars().all()
+        if entry.sheet_id == user.sheet_id
+    }
+
+
+async def clear_row_fingerprints(db: AsyncSession, user: User) -> None:
+    """
+    Drop all of the user's stored fingerprints (flushed, not committed).
+
+    Needed when stored next-action dates no longer hold, e.g. after the
+    user's escalation schedule changes; the next run re-evaluates every row.
+    """
+    await db.execute(delete(SheetRowFingerprint).where(SheetRowFingerprint.user_id == user.id))
+    await db.flush()
+
+
+async def save_row_fingerprints(
+    db: AsyncSession,
+    user: User,
+    known: dict[int, SheetRowFingerprint],
+    states: list[RowState],
+    row_numbers: Optional[set[int]],
+) -> None:
+    """
+    Upsert re-evaluated row states and drop entries for rows that are gone.
+
+    Works from the entries load_row_fingerprints returned at the start of
+    the run instead of reloading them; stale entries are removed with one
+    DELETE.
+
+    Args:
+        db: Async database session (flushed, not committed)
+        user: Owner of the sheet
+        known: load_row_fingerprints() result for this run
+        states: Rows evaluated on this run
+        row_numbers: Every row number present in the sheet on this run, or
+            None if the sheet was only partly read (no rows are dropped)
+    """
+    # Entries of a previous sheet always go; rows of this sheet only once
+    # the whole sheet was read and they were not in it
+    stale = [SheetRowFingerprint.sheet_id != user.sheet_id]
+    if row_numbers is not None:
+        vanished = [row_number for row_number in known if row_number not in row_numbers]
+        if vanished:
+            stale.append(SheetRowFingerprint.row_number.in_(vanished))
+    await db.execute(
+        delete(SheetRowFingerprint)
+        .where(SheetRowFingerprint.user_id == user.id, or_(*stale))
+        .execution_options(synchronize_session=False)
+    )
+
+    for state in states:
+        entry = known.get(state.row_number)
+        if entry is None:
+            entry = SheetRowFingerprint(user_id=user.id, row_number=state.row_number)
+            db.add(entry)
+        entry.sheet_id = user.sheet_id
+        entry.invoice_number = state.invoice_number
+        entry.fingerprint = state.fingerprint
+        entry.paid = state.paid
+        entry.amount = state.amount
+        entry.next_action_date = state.next_action_date
+
+    await db.flush()
+    logger.debug(f"Stored {len(states)} row fingerprints for user {user.id}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: sheet date parsing over a synthetic invoice sheet.
+
+Compares the old per-call strptime sweep (with an in-function dateutil
+import on misses) with app.services.date_parsing's learned-format parser
+and LRU cache. Each row parses Due_Date twice and Last_Sent_At once, as a
+daily run does.
+
+Usage:
+    python scripts/bench_date_parsing.py [--rows 10000] [--format "%d/%m/%Y"]
+"""
+import argparse
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from app.services import date_parsing
+from app.services.date_parsing import SheetDateParser
+
+
+def legacy_parse_date(value: str) -> Optional[date]:
+    """The pre-cache implementation from daily_processing._parse_date."""
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d/%m/%Y", "%B %d, %Y", "%b %d, %Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    try:
+        from dateutil import parser as dateutil_parser
+        return dateutil_parser.parse(value).date()
+    except Exception:
+        return None
+
+
+def synthetic_rows(count: int, due_format: str) -> list[dict[str, str]]:
+    rng = random.Random(42)
+    start = date(2025, 1, 1)
+    rows = []
+    for _ in range(count):
+        due = start + timedelta(days=rng.randrange(450))
+        sent = due + timedelta(days=rng.choice((7, 14, 21)))
+        rows.append({
+            "Due_Date": due.strftime(due_format),
+            "Last_Sent_At": sent.isoformat() if rng.random() < 0.5 else "",
+        })
+    return rows
+
+
+def run_legacy(rows: list[dict[str, str]]) -> None:
+    for row in rows:
+        legacy_parse_date(row["Due_Date"])
+        legacy_parse_date(row["Due_Date"])
+        legacy_parse_date(row["Last_Sent_At"])
+
+
+def run_cached(rows: list[dict[str, str]]) -> None:
+    dates = SheetDateParser.for_values(row["Due_Date"] for row in rows)
+    for row in rows:
+        dates.parse(row["Due_Date"])
+        dates.parse(row["Due_Date"])
+        dates.parse(row["Last_Sent_At"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--format", default="%B %d, %Y", help="strftime format of Due_Date")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.format)
+    mismatches = sum(
+        legacy_parse_date(row["Due_Date"]) != SheetDateParser.for_values([row["Due_Date"]]).parse(row["Due_Date"])
+        for row in rows[:500]
+    )
+
+    legacy = min(timeit.repeat(lambda: run_legacy(rows), number=1, repeat=args.repeat))
+    date_parsing._parse_with_format.cache_clear()
+    date_parsing._parse_stripped.cache_clear()
+    cold = timeit.timeit(lambda: run_cached(rows), number=1)
+    warm = min(timeit.repeat(lambda: run_cached(rows), number=1, repeat=args.repeat))
+
+    print(f"rows={args.rows} format={args.format!r} mismatches(first 500)={mismatches}")
+    print(f"{'legacy':<14}{legacy * 1000:>10.1f} ms")
+    print(f"{'cached (cold)':<14}{cold * 1000:>10.1f} ms  {legacy / cold:>6.1f}x")
+    print(f"{'cached (warm)':<14}{warm * 1000:>10.1f} ms  {legacy / warm:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: escalation email rendering over a synthetic batch of invoices.
+
+Renders a subject and HTML body per invoice, cycling through all six
+stages, as the daily run does when drafting. Compares the compiled
+templates in app.services.email_templates with formatting the same
+template sources from scratch on every call (str.format_map), which is
+what rendering costs without the compile step.
+
+Usage:
+    python scripts/bench_email_templates.py [--invoices 10000] [--repeat 5]
+"""
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from app.services import email_templates
+from app.services.email_templates import get_body_html, get_subject
+from app.services.escalation import STAGES
+
+_SUBJECT_SOURCES = email_templates._SUBJECT_SOURCES
+_BODY_SOURCES = {n: email_templates._wrap(source) for n, source in email_templates._BODY_SOURCES.items()}
+
+
+def synthetic_invoices(count: int) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "stage_days": STAGES[i % len(STAGES)],
+            "sender_name": "Sam Rivera",
+            "business_name": "Rivera Design Co",
+            "client_name": f"Client {rng.randrange(500)}",
+            "invoice_number": f"INV-{1000 + i}",
+            "amount": f"${rng.randrange(100, 20_000):,}.00",
+            "due_date": "2026-02-01",
+            "days_overdue": STAGES[i % len(STAGES)] + rng.randrange(7),
+        }
+        for i in range(count)
+    ]
+
+
+def run_uncompiled(invoices: list[dict]) -> None:
+    for invoice in invoices:
+        n = email_templates.get_stage_number(invoice["stage_days"])
+        _SUBJECT_SOURCES[n].format_map(invoice)
+        _BODY_SOURCES[n].format_map(invoice)
+
+
+def run_compiled(invoices: list[dict]) -> None:
+    for invoice in invoices:
+        get_subject(
+            invoice["stage_days"],
+            invoice["invoice_number"],
+            invoice["business_name"],
+            days_overdue=invoice["days_overdue"],
+        )
+        get_body_html(**invoice)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    invoices = synthetic_invoices(args.invoices)
+    sample = invoices[: len(STAGES)]
+    mismatches = sum(
+        _BODY_SOURCES[email_templates.get_stage_number(inv["stage_days"])].format_map(inv) != get_body_html(**inv)
+        for inv in sample
+    )
+
+    uncompiled = min(timeit.repeat(lambda: run_uncompiled(invoices), number=1, repeat=args.repeat))
+    compiled = min(timeit.repeat(lambda: run_compiled(invoices), number=1, repeat=args.repeat))
+
+    per_invoice = 1e6 / args.invoices
+    print(f"invoices={args.invoices} mismatches={mismatches}")
+    print(f"{'uncompiled':<12}{uncompiled * 1000:>10.1f} ms  {uncompiled * per_invoice:>6.2f} µs/invoice")
+    print(
+        f"{'compiled':<12}{compiled * 1000:>10.1f} ms  {compiled * per_invoice:>6.2f} µs/invoice"
+        f"  {uncompiled / compiled:>5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call cost of building Google API service objects.
+
+Compares the old per-call ``discovery.build(..., cache_discovery=False)``
+with the cached-template path in app.services.google_clients. No network
+calls are made; both paths only construct service objects.
+
+Usage:
+    python scripts/bench_google_services.py [--iterations 200]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from app.services.google_clients import get_service
+
+APIS = [("sheets", "v4"), ("drive", "v3"), ("gmail", "v1")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    creds = Credentials(
+        token="bench-token",
+        refresh_token="bench-refresh",
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id="bench-client",
+        client_secret="bench-secret",
+    )
+
+    print(f"{'api':<12}{'build() ms':>14}{'cached ms':>14}{'speedup':>10}")
+    for api, version in APIS:
+        get_service(api, version, creds)  # warm the cache outside the timing
+        before = timeit.timeit(
+            lambda api=api, version=version: build(
+                api, version, credentials=creds, cache_discovery=False
+            ),
+            number=args.iterations,
+        )
+        after = timeit.timeit(
+            lambda api=api, version=version: get_service(api, version, creds),
+            number=args.iterations,
+        )
+        before_ms = before / args.iterations * 1000
+        after_ms = after / args.iterations * 1000
+        print(f"{api + ' ' + version:<12}{before_ms:>14.3f}{after_ms:>14.3f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
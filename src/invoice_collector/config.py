@@ -11,6 +11,45 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+# Default reminder stages (days overdue), one template file per stage
+DEFAULT_STAGES = [7, 14, 21, 28, 35, 42]
+MAX_STAGES = 6
+MAX_STAGE_DAYS = 365
+
+
+def parse_stages(value: str) -> list[int]:
+    """
+    Parse a REMINDER_STAGES value such as "30, 45, 60,".
+
+    Blank entries are ignored; an empty value means the default stages.
+
+    Raises:
+        ValueError: unless 1-6 strictly increasing whole days in 1..365
+    """
+    parts = [part.strip() for part in value.split(",") if part.strip()]
+    if not parts:
+        return list(DEFAULT_STAGES)
+    try:
+        stages = [int(part) for part in parts]
+    except ValueError:
+        raise ValueError(f"REMINDER_STAGES must be comma-separated whole days, got {value!r}")
+    if len(stages) > MAX_STAGES:
+        raise ValueError(f"REMINDER_STAGES must have 1 to {MAX_STAGES} stages")
+    if any(not 1 <= days <= MAX_STAGE_DAYS for days in stages):
+        raise ValueError(f"REMINDER_STAGES must be days between 1 and {MAX_STAGE_DAYS}")
+    if any(a >= b for a, b in zip(stages, stages[1:])):
+        raise ValueError("REMINDER_STAGES must be strictly increasing")
+    return stages
+
+
+def _stages_or_default(value: str) -> list[int]:
+    """parse_stages, falling back to the defaults (validate() reports the error)."""
+    try:
+        return parse_stages(value)
+    except ValueError:
+        return list(DEFAULT_STAGES)
+
+
 class Settings:
     """
     Application settings loaded from environment variables
@@ -41,8 +80,9 @@ class Settings:
     TOKEN_SHEETS_FILE: Path = PROJECT_ROOT / "token_sheets.json"
     TOKEN_GMAIL_FILE: Path = PROJECT_ROOT / "token_gmail.json"
 
-    # Reminder Stages (days overdue)
-    STAGES = [7, 14, 21, 28, 35, 42]
+    # Reminder Stages (days overdue), e.g. REMINDER_STAGES="30,45,60" for net-60 clients
+    REMINDER_STAGES: str = os.getenv("REMINDER_STAGES", "")
+    STAGES = _stages_or_default(REMINDER_STAGES)
 
     # Draft Safety Limits
     MAX_DRAFTS_PER_RUN: int = int(os.getenv("MAX_DRAFTS_PER_RUN", "50"))
@@ -71,6 +111,11 @@ class Settings:
         if not cls.CLIENT_SECRET_FILE.exists():
             errors.append(f"client_secret.json not found at {cls.CLIENT_SECRET_FILE}")
 
+        try:
+            parse_stages(cls.REMINDER_STAGES)
+        except ValueError as e:
+            errors.append(str(e))
+
         if not cls.TEMPLATES_DIR.exists():
             errors.append(f"Templates directory not found at {cls.TEMPLATES_DIR}")
 
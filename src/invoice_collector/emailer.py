@@ -19,7 +19,7 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from .config import settings
+from .config import DEFAULT_STAGES, settings
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +109,50 @@ def has_email_been_contacted_today(to_email: str, day: str | None = None) -> boo
     return _normalize_email(to_email) in _load_email_ledger(day)
 
 
+# {{name}} placeholders; the name is looked up verbatim in the render context
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}")
+_SUBJECT_RE = re.compile(r"Subject:\s*(.*?)\n\n(.*)", flags=re.DOTALL)
+
+# Parsed templates by path, reused while the file's (mtime_ns, size) is unchanged
+_template_cache: dict[Path, tuple[tuple[int, int], Tuple[list, list]]] = {}
+
+
+def _load_template(template_path: Path) -> Tuple[list, list]:
+    """
+    Return a template's (subject, body) segments, reading the file only if it changed.
+
+    Segments alternate literal text and placeholder names (even / odd
+    indices), as split once by _PLACEHOLDER_RE.
+    """
+    template_path = Path(template_path)
+    stat = template_path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _template_cache.get(template_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(template_path, "r", encoding="utf-8") as f:
+        raw_content = f.read()
+
+    # Extract Subject line (first line) and body (rest after blank line)
+    match = _SUBJECT_RE.match(raw_content)
+    if not match:
+        raise ValueError(f"Template {template_path} must start with 'Subject:' line followed by blank line")
+
+    segments = (_PLACEHOLDER_RE.split(match.group(1)), _PLACEHOLDER_RE.split(match.group(2)))
+    _template_cache[template_path] = (version, segments)
+    return segments
+
+
+def _substitute(segments: list, context: dict) -> str:
+    """Fill placeholder segments in one pass; unknown placeholders are left as-is."""
+    out = segments.copy()
+    for i in range(1, len(out), 2):
+        name = out[i]
+        out[i] = str(context[name]) if name in context else f"{{{{{name}}}}}"
+    return "".join(out)
+
+
 def render_template(template_path: Path, context: dict) -> Tuple[str, str]:
     """
     Render an email template with the given context
@@ -118,6 +162,9 @@ def render_template(template_path: Path, context: dict) -> Tuple[str, str]:
     - Blank line
     - Rest: Email body with {{placeholders}}
 
+    Parsed templates are cached per file and re-read when the file's
+    modification time or size changes.
+
     Args:
         template_path: Path to the template file
         context: Dictionary of values to substitute
@@ -125,42 +172,33 @@ def render_template(template_path: Path, context: dict) -> Tuple[str, str]:
     Returns:
         Tuple of (subject, body)
     """
-    with open(template_path, "r", encoding="utf-8") as f:
-        raw_content = f.read()
+    subject_segments, body_segments = _load_template(template_path)
+    return _substitute(subject_segments, context), _substitute(body_segments, context)
 
-    # Extract Subject line (first line) and body (rest after blank line)
-    match = re.match(r"Subject:\s*(.*?)\n\n(.*)", raw_content, flags=re.DOTALL)
-    if not match:
-        raise ValueError(f"Template {template_path} must start with 'Subject:' line followed by blank line")
-
-    subject_template = match.group(1)
-    body_template = match.group(2)
 
-    # Render using simple {{variable}} substitution (compatible with template files)
-    def substitute_variables(text: str, context: dict) -> str:
-        """Simple template substitution for {{variable}} syntax"""
-        result = text
-        for key, value in context.items():
-            result = result.replace(f"{{{{{key}}}}}", str(value))
-        return result
-
-    subject = substitute_variables(subject_template, context)
-    body = substitute_variables(body_template, context)
-
-    return subject, body
+# Stages that ship with a template file, in escalation order
+_DEFAULT_TEMPLATE_STAGES = tuple(DEFAULT_STAGES)
 
 
 def template_path_for(stage: int) -> Path:
     """
     Get the template file path for a given stage
 
+    With custom REMINDER_STAGES that have no template file of their own,
+    the default stage at the same position is used (the first custom stage
+    gets stage_07.txt, and so on).
+
     Args:
-        stage: Stage number (7, 14, 21, 28, 35, or 42)
+        stage: Stage in days overdue (7, 14, 21, 28, 35, or 42 by default)
 
     Returns:
         Path to the template file
     """
-    return settings.TEMPLATES_DIR / f"stage_{stage:02d}.txt"
+    path = settings.TEMPLATES_DIR / f"stage_{stage:02d}.txt"
+    if path.exists() or stage not in settings.STAGES:
+        return path
+    ordinal = min(settings.STAGES.index(stage), len(_DEFAULT_TEMPLATE_STAGES) - 1)
+    return settings.TEMPLATES_DIR / f"stage_{_DEFAULT_TEMPLATE_STAGES[ordinal]:02d}.txt"
 
 
 def create_draft(
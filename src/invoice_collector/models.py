@@ -6,11 +6,14 @@ from datetime import date
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Invoice:
     """
     Represents an invoice with all tracking information
 
+    Slotted (no per-instance __dict__): one instance per sheet row is built
+    at ingestion, with dates and numbers already parsed.
+
     Attributes:
         invoice_id: Unique identifier for the invoice
         client_name: Name of the client
@@ -56,7 +59,7 @@ class Invoice:
         return self.status.lower() == "overdue" or self.days_overdue(today) > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftCreated:
     """
     Represents a draft that was created during a run
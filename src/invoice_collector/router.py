@@ -3,10 +3,26 @@ Routing logic for determining which reminder stage to send
 Based on days overdue: 7, 14, 21, 28, 35, 42 days
 """
 from datetime import date
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional
 from .config import settings
 
 
+@lru_cache(maxsize=8)
+def _stage_tables(stages: tuple) -> tuple:
+    """
+    Lookup tables for a stage sequence, built once per distinct sequence
+
+    Returns:
+        (stage reached on each day up to the last stage, {stage: next stage})
+    """
+    by_day = tuple(
+        max((s for s in stages if s <= day), default=None)
+        for day in range(max(stages, default=-1) + 1)
+    )
+    return by_day, dict(zip(stages, stages[1:]))
+
+
 def days_overdue(due_date: date, today: date = None) -> int:
     """
     Calculate how many days an invoice is overdue
@@ -41,8 +57,27 @@ def stage_for(days: int) -> Optional[int]:
     Returns:
         The stage number (7, 14, 21, 28, 35, or 42) or None if not yet time for first reminder
     """
-    eligible_stages = [s for s in settings.STAGES if days >= s]
-    return max(eligible_stages) if eligible_stages else None
+    by_day, _ = _stage_tables(tuple(settings.STAGES))
+    if days < 0 or not by_day:
+        return None
+    return by_day[days] if days < len(by_day) else by_day[-1]
+
+
+def stage_for_many(days: Iterable[int]) -> List[Optional[int]]:
+    """
+    Determine the reminder stage for a whole column of days-overdue values
+
+    Args:
+        days: Days overdue per invoice (list, pandas Series, ...)
+
+    Returns:
+        One stage (or None) per value, same as stage_for
+    """
+    by_day, _ = _stage_tables(tuple(settings.STAGES))
+    if not by_day:
+        return [None for _ in days]
+    size, last = len(by_day), by_day[-1]
+    return [by_day[d] if 0 <= d < size else (last if d >= size else None) for d in days]
 
 
 def should_send(
@@ -102,14 +137,8 @@ def get_next_stage(current_stage: Optional[int]) -> Optional[int]:
     if current_stage is None:
         return settings.STAGES[0] if settings.STAGES else None
 
-    try:
-        current_index = settings.STAGES.index(current_stage)
-        if current_index < len(settings.STAGES) - 1:
-            return settings.STAGES[current_index + 1]
-    except (ValueError, IndexError):
-        pass
-
-    return None
+    _, next_stage = _stage_tables(tuple(settings.STAGES))
+    return next_stage.get(current_stage)
 
 
 def days_until_next_stage(days: int) -> Optional[int]:
@@ -7,16 +7,29 @@ Make.com / Stripe external calls are mocked — no real API credits consumed.
 Run with:
     uv run pytest tests/test_api_lifecycle.py -v
 """
+import asyncio
 import logging
+from datetime import date, datetime, timedelta
 import json
 import pytest
 from unittest.mock import patch, AsyncMock
 from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.stripe_event import StripeEvent
-from app.models.user import User
+from app.models.user import PROCESSING_ELIGIBLE_SQL, User
+from app.services.daily_processing import ProcessingResult
+from app.db.session import session_factory_for
+from app.services.daily_run import (
+    claim_next_shard,
+    eligible_users_clause,
+    ensure_run_shards,
+    hold_shard_lease,
+    release_shard,
+    renew_shard_lease,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -53,6 +66,40 @@ async def test_auth_me_returns_inactive_by_default(test_client: AsyncClient):
     assert body["active"] is False
 
 
+@pytest.mark.asyncio
+async def test_patch_sheet_id_resets_next_action_date(test_client: AsyncClient, test_user: User):
+    """Switching sheets through PATCH makes the next run read the new sheet."""
+    test_user.next_action_date = date(2026, 3, 8)
+
+    response = await test_client.patch(f"/api/users/{test_user.id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert test_user.next_action_date == date(2026, 3, 8)
+
+    response = await test_client.patch(f"/api/users/{test_user.id}", json={"sheet_id": "sheet-new"})
+    assert response.status_code == 200
+    assert test_user.next_action_date is None
+
+
+@pytest.mark.asyncio
+async def test_patch_escalation_stages_validates_and_resets_schedule_state(
+    test_client: AsyncClient, test_user: User
+):
+    """A new escalation schedule is validated and forces a full re-evaluation."""
+    test_user.next_action_date = date(2026, 3, 8)
+
+    response = await test_client.patch(f"/api/users/{test_user.id}", json={"escalation_stages": [30, 14]})
+    assert response.status_code == 422
+
+    response = await test_client.patch(f"/api/users/{test_user.id}", json={"escalation_stages": [30, 45, 60]})
+    assert response.status_code == 200
+    assert response.json()["escalation_stages"] == [30, 45, 60]
+    assert test_user.next_action_date is None
+
+    response = await test_client.patch(f"/api/users/{test_user.id}", json={"escalation_stages": None})
+    assert response.status_code == 200
+    assert response.json()["escalation_stages"] is None
+
+
 # ---------------------------------------------------------------------------
 # Billing
 # ---------------------------------------------------------------------------
@@ -132,6 +179,209 @@ async def test_cron_trigger_reports_user_processing_exception(
     report_exception.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_cron_trigger_processes_users_concurrently(
+    test_client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    monkeypatch,
+):
+    """Daily cron fans out up to the configured concurrency and aggregates counts."""
+    test_user.active = True
+    test_user.sheet_id = "sheet-123"
+    test_user.google_refresh_token_encrypted = "encrypted-refresh-token"
+    for i in range(3):
+        test_db.add(User(
+            auth0_user_id=f"test|fanout{i}",
+            email=f"fanout{i}@example.com",
+            name="Fanout User",
+            business_name="Fanout Co",
+            active=True,
+            sheet_id=f"sheet-{i}",
+            google_refresh_token_encrypted="encrypted-refresh-token",
+        ))
+    await test_db.commit()
+
+    monkeypatch.setattr(settings, "digest_cron_secret", "cron-secret")
+    monkeypatch.setattr(settings, "daily_processing_concurrency", 2)
+    monkeypatch.setattr(settings, "daily_run_shard_count", 1)
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_process(user, db):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ProcessingResult(user_id=user.id, invoices_checked=5, drafts_created=2)
+
+    with patch("app.api.cron.process_user_invoices", fake_process):
+        response = await test_client.post(
+            "/api/cron/trigger-daily",
+            headers={"x-cron-secret": "cron-secret"},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["users_total"] == 4
+    assert body["processed"] == 4
+    assert body["drafts_created"] == 8
+    assert body["invoices_checked"] == 20
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_cron_trigger_resumes_unfinished_shards(
+    test_client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    monkeypatch,
+):
+    """A trigger that runs out of time checkpoints its shard; the next call resumes it."""
+    for i in range(3):
+        test_db.add(User(
+            auth0_user_id=f"test|resume{i}",
+            email=f"resume{i}@example.com",
+            name="Resume User",
+            business_name="Resume Co",
+            active=True,
+            sheet_id=f"sheet-{i}",
+            google_refresh_token_encrypted="encrypted-refresh-token",
+        ))
+    await test_db.commit()
+
+    monkeypatch.setattr(settings, "digest_cron_secret", "cron-secret")
+    monkeypatch.setattr(settings, "daily_run_shard_count", 1)
+    monkeypatch.setattr(settings, "daily_run_chunk_size", 1)
+    monkeypatch.setattr(settings, "daily_run_time_budget_seconds", 0)
+
+    seen = []
+
+    async def fake_process(user, db):
+        seen.append(user.id)
+        return ProcessingResult(user_id=user.id, invoices_checked=1, drafts_created=1)
+
+    bodies = []
+    with patch("app.api.cron.process_user_invoices", fake_process):
+        for _ in range(6):
+            response = await test_client.post(
+                "/api/cron/trigger-daily",
+                headers={"x-cron-secret": "cron-secret"},
+            )
+            assert response.status_code == 200
+            bodies.append(response.json())
+            if bodies[-1]["shards_remaining"] == 0:
+                break
+
+    assert [b["users_total"] for b in bodies] == [1, 1, 1, 0]
+    assert bodies[-1]["shards_remaining"] == 0
+    assert len(seen) == 3
+    assert len(set(seen)) == 3
+    assert sum(b["drafts_created"] for b in bodies) == 3
+
+
+@pytest.mark.asyncio
+async def test_shard_lease_is_renewed_while_a_chunk_runs(test_db: AsyncSession):
+    """The heartbeat keeps renewing until the chunk ends, then stops cleanly."""
+    run_date = date.today()
+    await ensure_run_shards(test_db, run_date)
+    shard = await claim_next_shard(test_db, run_date)
+    renewed = asyncio.Event()
+    renewals = []
+
+    async def fake_renew(session_factory, shard_id):
+        renewals.append(shard_id)
+        if len(renewals) == 2:
+            renewed.set()
+        return True
+
+    with patch("app.services.daily_run.renew_shard_lease", fake_renew):
+        async with hold_shard_lease(session_factory_for(test_db), shard, interval=0.001):
+            await renewed.wait()
+        stopped_at = len(renewals)
+        await asyncio.sleep(0.01)
+
+    assert renewals[:2] == [shard.id, shard.id]
+    assert len(renewals) == stopped_at
+
+
+@pytest.mark.asyncio
+async def test_renewed_shard_lease_cannot_be_reclaimed(test_db: AsyncSession):
+    """A stale lease is reclaimable until it is renewed."""
+    run_date = date.today()
+    await ensure_run_shards(test_db, run_date)
+    shard = await claim_next_shard(test_db, run_date)
+    shard.claimed_at = datetime.utcnow() - timedelta(seconds=settings.daily_run_shard_lease_seconds + 60)
+    await test_db.commit()
+    session_factory = session_factory_for(test_db)
+
+    assert await renew_shard_lease(session_factory, shard.id) is True
+    async with session_factory() as other_trigger:
+        claimed = await claim_next_shard(other_trigger, run_date)
+    assert claimed is not None and claimed.id != shard.id
+
+    await release_shard(test_db, shard)
+    assert await renew_shard_lease(session_factory, shard.id) is False
+
+
+def test_eligible_users_clause_matches_partial_index_predicate():
+    """Postgres only uses the partial index when the query implies its predicate."""
+    clause = str(eligible_users_clause().compile(dialect=postgresql.dialect()))
+    assert clause.replace("users.", "") == PROCESSING_ELIGIBLE_SQL
+
+
+@pytest.mark.asyncio
+async def test_cron_trigger_only_loads_eligible_users(
+    test_client: AsyncClient,
+    test_db: AsyncSession,
+    test_user: User,
+    monkeypatch,
+):
+    """Ineligible users and users with nothing due yet are filtered out in SQL."""
+    variants = {
+        "eligible": {},
+        "due-today": {"next_action_date": date.today()},
+        "not-due": {"next_action_date": date.today() + timedelta(days=1)},
+        "inactive": {"active": False},
+        "no-sheet": {"sheet_id": None},
+        "no-token": {"google_refresh_token_encrypted": None},
+        "revoked": {"google_token_revoked": True},
+    }
+    for label, overrides in variants.items():
+        fields = dict(
+            auth0_user_id=f"test|{label}",
+            email=f"{label}@example.com",
+            name="Eligibility User",
+            business_name=label,
+            active=True,
+            sheet_id="sheet-1",
+            google_refresh_token_encrypted="encrypted-refresh-token",
+        )
+        fields.update(overrides)
+        test_db.add(User(**fields))
+    await test_db.commit()
+
+    monkeypatch.setattr(settings, "digest_cron_secret", "cron-secret")
+    seen = []
+
+    async def fake_process(user, db):
+        seen.append(user.business_name)
+        return ProcessingResult(user_id=user.id)
+
+    with patch("app.api.cron.process_user_invoices", fake_process):
+        response = await test_client.post(
+            "/api/cron/trigger-daily",
+            headers={"x-cron-secret": "cron-secret"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["users_total"] == 2
+    assert sorted(seen) == ["due-today", "eligible"]
+
+
 # ---------------------------------------------------------------------------
 # Onboarding — sender-info activates user
 # ---------------------------------------------------------------------------
@@ -0,0 +1,402 @@
+"""
+Tests for the daily invoice processing pipeline.
+
+Google Sheets / Gmail calls are mocked at the daily_processing import site,
+so these run against the in-memory DB without touching Google.
+"""
+import asyncio
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User
+from app.services import daily_processing
+from app.services.daily_processing import process_user_invoices
+from app.services.google_gmail import DraftResult
+from app.services.google_sheets import TEMPLATE_HEADERS, InvoiceSheet
+from app.services.row_fingerprints import load_row_fingerprints
+
+TODAY = date(2026, 3, 1)
+
+
+def _sheet_row(row_number: int, invoice_number: str, due_date: str, **overrides) -> dict:
+    row = {
+        "Invoice_Number": invoice_number,
+        "Client_Name": "Acme",
+        "Client_Email": "billing@acme.test",
+        "Amount": "$1,000.00",
+        "Due_Date": due_date,
+        "Sent_Date": "2026-01-01",
+        "Paid": "",
+        "Last_Stage_Sent": "",
+        "Last_Sent_At": "",
+        "_row_number": row_number,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def google_user(test_user: User) -> User:
+    test_user.active = True
+    test_user.sheet_id = "sheet-123"
+    test_user.google_refresh_token_encrypted = "encrypted-refresh-token"
+    return test_user
+
+
+def _drafts_ok(creds, drafts):
+    return [DraftResult(key=d.key, draft_id="d", message_id="m") for d in drafts]
+
+
+async def _windows(rows, window_rows=None):
+    """Yield the rows as InvoiceSheet windows, like iter_invoice_sheet_cached_async."""
+    window_rows = window_rows or max(1, len(rows))
+    for start in range(0, max(1, len(rows)), window_rows):
+        yield InvoiceSheet.from_rows(list(TEMPLATE_HEADERS), rows[start:start + window_rows])
+
+
+@contextmanager
+def _mock_google(rows, batch_update=None, create_drafts=None):
+    """Patch every Google call made by process_user_invoices."""
+    targets = {
+        "get_google_credentials": MagicMock(return_value=object()),
+        "ensure_fresh_credentials": AsyncMock(),
+        "remember_access_token": MagicMock(return_value=False),
+        "iter_invoice_sheet_cached_async": MagicMock(side_effect=lambda creds, sheet_id, columns=None: _windows(rows)),
+        "create_drafts_batch_async": create_drafts or AsyncMock(side_effect=_drafts_ok),
+        "batch_update_rows_async": batch_update or AsyncMock(return_value=None),
+    }
+    with ExitStack() as stack:
+        for name, mock in targets.items():
+            stack.enter_context(patch(f"app.services.daily_processing.{name}", mock))
+        yield
+
+
+@pytest.mark.asyncio
+async def test_row_updates_are_flushed_in_batches(google_user, test_db, monkeypatch):
+    """Write-backs are buffered and sent in chunks of SHEET_WRITE_BATCH_SIZE."""
+    monkeypatch.setattr(settings, "sheet_write_batch_size", 2)
+    google_user.plan = "paid"
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 7)]
+    batch_update = AsyncMock(return_value=None)
+
+    with _mock_google(rows, batch_update=batch_update):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 5
+    assert result.errors == []
+    batch_sizes = [len(call.args[2]) for call in batch_update.await_args_list]
+    assert batch_sizes == [2, 2, 1]
+    written_rows = [row for call in batch_update.await_args_list for row, _ in call.args[2]]
+    assert written_rows == [2, 3, 4, 5, 6]
+    assert batch_update.await_args_list[0].args[2][0][1] == {
+        "Last_Stage_Sent": "28",
+        "Last_Sent_At": "2026-03-01",
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_drafts_counted(google_user, test_db):
+    """A failed batch write is recorded as an error but drafts still count."""
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 4)]
+    batch_update = AsyncMock(side_effect=RuntimeError("sheets 500"))
+
+    with _mock_google(rows, batch_update=batch_update):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 2
+    assert result.errors == [
+        {"type": "sheet_update", "rows": [2, 3], "message": "sheets 500"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_limit_row_is_still_written_back(google_user, test_db):
+    """The draft that reaches the plan limit gets its sheet row updated too."""
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 8)]
+    batch_update = AsyncMock(return_value=None)
+    create_drafts = AsyncMock(side_effect=_drafts_ok)
+
+    with _mock_google(rows, batch_update=batch_update, create_drafts=create_drafts):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 3  # free plan limit
+    assert create_drafts.await_count == 1
+    assert [d.key for d in create_drafts.await_args.args[1]] == [2, 3, 4]
+    written_rows = [row for call in batch_update.await_args_list for row, _ in call.args[2]]
+    assert written_rows == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_failed_draft_maps_to_its_row_and_frees_a_slot(google_user, test_db):
+    """A per-item batch failure is recorded on its row; the next row takes its slot."""
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 8)]
+    batch_update = AsyncMock(return_value=None)
+
+    def drafts_with_failure(creds, drafts):
+        return [
+            DraftResult(key=d.key, error="<HttpError 400 Invalid To header>")
+            if d.key == 3 else DraftResult(key=d.key, draft_id="d", message_id="m")
+            for d in drafts
+        ]
+
+    create_drafts = AsyncMock(side_effect=drafts_with_failure)
+
+    with _mock_google(rows, batch_update=batch_update, create_drafts=create_drafts):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 3
+    assert [[d.key for d in call.args[1]] for call in create_drafts.await_args_list] == [[2, 3, 4], [5]]
+    assert result.errors == [
+        {"type": "row_processing", "row": 3, "message": "<HttpError 400 Invalid To header>"},
+    ]
+    written_rows = [row for call in batch_update.await_args_list for row, _ in call.args[2]]
+    assert written_rows == [2, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_batched_draft_auth_failure_revokes_token(google_user, test_db):
+    """A 401 inside a draft batch marks the token revoked; earlier drafts still count."""
+    google_user.plan = "paid"
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 5)]
+    batch_update = AsyncMock(return_value=None)
+
+    def drafts_with_auth_failure(creds, drafts):
+        return [DraftResult(key=2, draft_id="d", message_id="m")] + [
+            DraftResult(key=d.key, error="<HttpError 401 Invalid Credentials>") for d in drafts[1:]
+        ]
+
+    with _mock_google(
+        rows, batch_update=batch_update, create_drafts=AsyncMock(side_effect=drafts_with_auth_failure)
+    ):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 1
+    assert google_user.google_token_revoked is True
+    assert result.errors == [{"type": "auth_revoked", "message": "<HttpError 401 Invalid Credentials>"}]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rows_are_skipped_on_the_next_run(google_user, test_db):
+    """Fingerprinted rows are not re-evaluated until their next stage is due."""
+    google_user.plan = "paid"
+    rows = [
+        _sheet_row(2, "INV-2", "2026-02-01"),
+        _sheet_row(3, "INV-3", "2026-02-25", Amount="$250.00"),  # 4 days overdue: no stage yet
+        _sheet_row(4, "INV-4", "2026-01-01", Paid="TRUE"),
+    ]
+    with _mock_google(rows):
+        first = await process_user_invoices(google_user, test_db, today=TODAY)
+    assert first.drafts_created == 1
+
+    # Next day: the sheet reflects the write-back for row 2 and nothing else changed
+    rows[0].update({"Last_Stage_Sent": "28", "Last_Sent_At": TODAY.isoformat()})
+    next_day = date(2026, 3, 2)
+    with _mock_google(rows), patch(
+        "app.services.daily_processing._plan_draft", wraps=daily_processing._plan_draft
+    ) as plan_draft:
+        second = await process_user_invoices(google_user, test_db, today=next_day)
+
+    assert second.drafts_created == 0
+    assert plan_draft.call_count == 0
+    assert second.invoices_checked == 2
+    assert second.total_outstanding == Decimal("1250.00")
+
+    # Row 3 reaches its first stage 7 days after its due date → evaluated then
+    with _mock_google(rows), patch(
+        "app.services.daily_processing._plan_draft", wraps=daily_processing._plan_draft
+    ) as plan_draft:
+        third = await process_user_invoices(google_user, test_db, today=date(2026, 3, 4))
+
+    assert [c.args[0].row_number for c in plan_draft.call_args_list] == [3]
+    assert third.drafts_created == 1
+
+
+@pytest.mark.asyncio
+async def test_fingerprints_are_loaded_once_and_vanished_rows_deleted(google_user, test_db):
+    """Saving reuses the run's loaded fingerprints; stale rows go in one DELETE."""
+    rows = [_sheet_row(2, "INV-2", "2026-02-25"), _sheet_row(3, "INV-3", "2026-02-25")]
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+
+    statements = []
+    engine = test_db.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+        if "sheet_row_fingerprints" not in statement:
+            statements.pop()
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with _mock_google(rows[:1]):
+            await process_user_invoices(google_user, test_db, today=TODAY)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements.count("SELECT") == 1
+    assert statements.count("DELETE") == 1
+    assert set(await load_row_fingerprints(test_db, google_user)) == {2}
+
+    # Entries of a previous sheet are replaced, not collided with
+    google_user.sheet_id = "sheet-456"
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+    stored = await load_row_fingerprints(test_db, google_user)
+    assert {n: e.sheet_id for n, e in stored.items()} == {2: "sheet-456", 3: "sheet-456"}
+
+
+@pytest.mark.asyncio
+async def test_edited_row_is_re_evaluated(google_user, test_db):
+    """Changing a reminder-relevant cell invalidates the row's fingerprint."""
+    rows = [_sheet_row(2, "INV-2", "2026-02-25")]  # 4 days overdue: no stage yet
+    with _mock_google(rows):
+        first = await process_user_invoices(google_user, test_db, today=TODAY)
+    assert first.drafts_created == 0
+
+    rows[0]["Due_Date"] = "2026-02-01"
+    with _mock_google(rows):
+        second = await process_user_invoices(google_user, test_db, today=TODAY)
+    assert second.drafts_created == 1
+
+
+@pytest.mark.asyncio
+async def test_user_next_action_date_is_earliest_stage_boundary(google_user, test_db, monkeypatch):
+    """The user's next_action_date is the earliest next stage, capped by the rescan window."""
+    monkeypatch.setattr(settings, "next_action_rescan_days", 7)
+    google_user.plan = "paid"
+    rows = [
+        _sheet_row(2, "INV-2", "2026-02-01"),  # drafted at 28 → next stage on 2026-03-08
+        _sheet_row(3, "INV-3", "2026-02-25"),  # first stage on 2026-03-04
+    ]
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+    assert google_user.next_action_date == date(2026, 3, 4)
+
+    rows.pop()
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+    assert google_user.next_action_date == date(2026, 3, 8)
+
+    monkeypatch.setattr(settings, "next_action_rescan_days", 3)
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+    assert google_user.next_action_date == date(2026, 3, 4)
+
+
+@pytest.mark.asyncio
+async def test_custom_escalation_stages_drive_drafts_and_next_action(google_user, test_db):
+    """A user's own schedule replaces the default stages for the whole run."""
+    google_user.plan = "paid"
+    google_user.escalation_stages = [30, 60]
+    rows = [
+        _sheet_row(2, "INV-2", "2026-02-01"),  # 28 days overdue: a default stage, not a custom one
+        _sheet_row(3, "INV-3", "2026-01-20"),  # 40 days overdue: first custom stage
+    ]
+    batch_update = AsyncMock(return_value=None)
+    with _mock_google(rows, batch_update=batch_update):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 1
+    [(row_number, updates)] = batch_update.await_args.args[2]
+    assert (row_number, updates["Last_Stage_Sent"]) == (3, "30")
+    assert google_user.next_action_date == date(2026, 3, 3)  # INV-2 reaches 30 days
+
+
+@pytest.mark.asyncio
+async def test_run_with_errors_is_retried_next_day(google_user, test_db):
+    """Any error leaves the user due again on the next run."""
+    rows = [_sheet_row(2, "INV-2", "2026-02-01")]
+    with _mock_google(rows, batch_update=AsyncMock(side_effect=RuntimeError("sheets 500"))):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+    assert google_user.next_action_date == TODAY
+
+
+@pytest.mark.asyncio
+async def test_drafts_start_before_later_windows_arrive(google_user, test_db):
+    """Each streamed window is drafted before the next one is fetched."""
+    google_user.plan = "paid"
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 6)]
+    events = []
+
+    async def windows(creds, sheet_id, columns=None):
+        async for window in _windows(rows, window_rows=2):
+            events.append(("window", window.row_numbers))
+            yield window
+
+    async def create_drafts(creds, drafts):
+        events.append(("drafts", [d.key for d in drafts]))
+        return _drafts_ok(creds, drafts)
+
+    with _mock_google(rows, create_drafts=AsyncMock(side_effect=create_drafts)), patch(
+        "app.services.daily_processing.iter_invoice_sheet_cached_async", windows
+    ):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 4
+    assert result.invoices_checked == 4
+    assert events == [
+        ("window", [2, 3]),
+        ("drafts", [2, 3]),
+        ("window", [4, 5]),
+        ("drafts", [4, 5]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_later_window_keeps_unread_fingerprints(google_user, test_db):
+    """A read error mid-stream is recorded and rows not read are not forgotten."""
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-25") for i in range(2, 6)]
+    with _mock_google(rows):
+        await process_user_invoices(google_user, test_db, today=TODAY)
+
+    async def failing_windows(creds, sheet_id, columns=None):
+        async for window in _windows(rows, window_rows=2):
+            yield window
+            raise RuntimeError("sheets 503")
+
+    with _mock_google(rows), patch(
+        "app.services.daily_processing.iter_invoice_sheet_cached_async", failing_windows
+    ):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.errors == [{"type": "sheet_read", "message": "sheets 503"}]
+    assert google_user.next_action_date == TODAY
+    stored = await load_row_fingerprints(test_db, google_user)
+    assert sorted(stored) == [2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_draft_batches_overlap_without_exceeding_limit(google_user, test_db, monkeypatch):
+    """Draft batches run concurrently, but in-flight plus created never passes the limit."""
+    monkeypatch.setattr(settings, "gmail_draft_batch_size", 1)
+    monkeypatch.setattr(settings, "draft_pipeline_depth", 2)
+    rows = [_sheet_row(i, f"INV-{i}", "2026-02-01") for i in range(2, 8)]
+    state = {"in_flight": 0, "created": 0, "max_in_flight": 0}
+
+    async def create_drafts(creds, drafts):
+        state["in_flight"] += len(drafts)
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        assert state["created"] + state["in_flight"] <= 3  # free plan limit
+        await asyncio.sleep(0)
+        state["in_flight"] -= len(drafts)
+        outcomes = [
+            DraftResult(key=d.key, error="<HttpError 400 Invalid To header>")
+            if d.key == 3 else DraftResult(key=d.key, draft_id="d", message_id="m")
+            for d in drafts
+        ]
+        state["created"] += sum(outcome.ok for outcome in outcomes)
+        return outcomes
+
+    create_mock = AsyncMock(side_effect=create_drafts)
+    with _mock_google(rows, create_drafts=create_mock):
+        result = await process_user_invoices(google_user, test_db, today=TODAY)
+
+    assert result.drafts_created == 3
+    assert state["max_in_flight"] == 2
+    assert sorted(call.args[1][0].key for call in create_mock.await_args_list) == [2, 3, 4, 5]
@@ -0,0 +1,26 @@
+from datetime import date
+
+from app.services.date_parsing import SheetDateParser, parse_date
+
+
+def test_parse_date_supported_formats():
+    assert parse_date("2026-03-01") == date(2026, 3, 1)
+    assert parse_date(" 03/01/2026 ") == date(2026, 3, 1)
+    assert parse_date("March 1, 2026") == date(2026, 3, 1)
+    assert parse_date("Mar 1, 2026") == date(2026, 3, 1)
+    assert parse_date("") is None
+    assert parse_date("not a date") is None
+
+
+def test_ambiguous_values_keep_us_order_without_evidence():
+    parser = SheetDateParser.for_values(["03/04/2026", "01/02/2026"])
+    assert parser.date_format == "%m/%d/%Y"
+    assert parser.parse("03/04/2026") == date(2026, 3, 4)
+
+
+def test_learns_day_first_sheets():
+    parser = SheetDateParser.for_values(["", "25/12/2025", "03/04/2026", "31/01/2026"])
+    assert parser.date_format == "%d/%m/%Y"
+    assert parser.parse("03/04/2026") == date(2026, 4, 3)
+    # Cells in other formats still parse through the fallback sweep
+    assert parser.parse("2026-03-01") == date(2026, 3, 1)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.job_history import JobHistory
+from app.models.user import User
+from app.services.digest import calculate_digest
+
+
+def _user(email: str, active: bool = True, **fields) -> User:
+    return User(
+        id=uuid4(),
+        auth0_user_id=f"test|{email}",
+        email=email,
+        name="Sam",
+        business_name="Acme",
+        active=active,
+        **fields,
+    )
+
+
+def _run(user: User, drafts: int, outstanding: str, days_ago: int = 1) -> JobHistory:
+    return JobHistory(
+        user_id=user.id,
+        run_at=datetime.utcnow() - timedelta(days=days_ago),
+        invoices_checked=drafts,
+        drafts_created=drafts,
+        total_outstanding_amount=Decimal(outstanding),
+    )
+
+
+@pytest.fixture
+def statements(test_db):
+    """SQL statements executed on the test engine."""
+    executed = []
+    engine = test_db.bind.sync_engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_digest_send_uses_one_grouped_query_streamed_in_chunks(
+    test_client: AsyncClient, test_db, statements, monkeypatch
+):
+    monkeypatch.setattr(settings, "digest_cron_secret", "cron-secret")
+    monkeypatch.setattr(settings, "digest_chunk_size", 2)
+    busy = [_user(f"busy{i}@example.com") for i in range(5)]
+    quiet = _user("quiet@example.com")
+    stale = _user("stale@example.com")
+    inactive = _user("inactive@example.com", active=False)
+    test_db.add_all([*busy, quiet, stale, inactive])
+    await test_db.flush()
+    for i, user in enumerate(busy):
+        test_db.add_all([_run(user, 2, "100.00"), _run(user, i + 1, "250.50", days_ago=3)])
+    test_db.add_all([
+        _run(quiet, 0, "80.00"),
+        _run(stale, 4, "80.00", days_ago=9),
+        _run(inactive, 3, "80.00"),
+    ])
+    await test_db.commit()
+
+    send = AsyncMock(return_value=True)
+    statements.clear()
+    with patch("app.api.digest.send_digest_email", send):
+        response = await test_client.post("/api/digest/send", json={"secret": "cron-secret"})
+
+    assert response.status_code == 200
+    assert response.json()["emails_sent"] == 5
+    assert len([s for s in statements if "job_history" in s]) == 1
+    digests = [call.args[0] for call in send.await_args_list]
+    assert sorted(d.user_email for d in digests) == sorted(u.email for u in busy)
+    by_email = {d.user_email: d for d in digests}
+    assert by_email["busy3@example.com"].drafts_count == 6
+    assert by_email["busy3@example.com"].outstanding_amount == Decimal("250.50")
+
+
+@pytest.mark.asyncio
+async def test_calculate_digest_for_user_without_recent_runs(test_user, test_db):
+    digest = await calculate_digest(test_user.id, test_db)
+
+    assert (digest.user_email, digest.drafts_count, digest.outstanding_amount) == (
+        "test@example.com", 0, Decimal("0.00")
+    )
+    assert await calculate_digest(UUID(int=0), test_db) is None
@@ -0,0 +1,74 @@
+import hashlib
+
+from app.services.email_templates import CompiledTemplate, get_body_html, get_subject
+from app.services.escalation import STAGES, schedule_for
+
+_ARGS = dict(
+    sender_name="Sam",
+    business_name="Acme & Co",
+    client_name="Client {x}",
+    invoice_number="INV-1",
+    amount="$1,250.00",
+    due_date="2026-02-01",
+    days_overdue=17,
+)
+
+
+def test_compiled_template_fills_slots_only():
+    template = CompiledTemplate("{a} and {{literal}} then {b}{a}")
+
+    assert template.fields == {"a", "b"}
+    assert template.render({"a": "x", "b": 2}) == "x and {literal} then 2x"
+    assert template.render({"a": "{b}", "b": ""}) == "{b} and {literal} then {b}"
+
+
+def test_every_stage_renders_all_variables():
+    for stage_days in STAGES:
+        body = get_body_html(stage_days, **_ARGS)
+        assert body.startswith("<html>") and body.endswith("</html>")
+        for value in ("Sam", "Acme & Co", "Client {x}", "INV-1", "$1,250.00", "2026-02-01", "17"):
+            assert value in body
+        assert "INV-1" in get_subject(stage_days, "INV-1", "Acme & Co")
+
+
+def test_unknown_stage_falls_back_to_first_template():
+    assert get_subject(3, "INV-1", "Acme") == get_subject(STAGES[0], "INV-1", "Acme")
+    assert get_body_html(3, **_ARGS) == get_body_html(STAGES[0], **_ARGS)
+
+
+def test_custom_schedule_selects_templates_by_position():
+    schedule = schedule_for([30, 60])
+
+    assert get_subject(60, "INV-1", "Acme", schedule=schedule) == get_subject(14, "INV-1", "Acme")
+    assert get_body_html(30, **_ARGS, schedule=schedule) == get_body_html(7, **_ARGS)
+
+
+def test_template_text_does_not_assume_the_default_cadence():
+    schedule = schedule_for([30, 45, 60, 75, 90, 120])
+    args = {**_ARGS, "days_overdue": 63}
+
+    assert get_subject(60, "INV-1", "Acme", schedule=schedule, days_overdue=63) == (
+        "Urgent: Invoice INV-1 is now 63 days overdue"
+    )
+    bodies = " ".join(get_body_html(days, **args, schedule=schedule) for days in schedule.stages)
+    for cadence_phrase in ("3 weeks", "fourth", "7 days", "several weeks"):
+        assert cadence_phrase not in bodies
+
+
+# Default-schedule output as shipped before per-user schedules (sha256 prefix of each body)
+_BASELINE = {
+    7: ("Friendly reminder: Invoice INV-1 from Acme & Co", "8bea241bb42e7d55"),
+    14: ("Following up: Invoice INV-1 from Acme & Co", "24e84725b005d394"),
+    21: ("Urgent: Invoice INV-1 is now 3 weeks overdue", "d993a27573f366ef"),
+    28: ("Action needed: Invoice INV-1 — Acme & Co", "374cb6886526f0a6"),
+    35: ("Final reminder: Invoice INV-1 before escalation", "4939fabc05a43e15"),
+    42: ("Last notice: Invoice INV-1 — immediate action required", "f72002547533bdce"),
+}
+
+
+def test_default_schedule_output_matches_baseline_text():
+    for schedule in (None, schedule_for(None), schedule_for(STAGES)):
+        for stage_days, (subject, body_digest) in _BASELINE.items():
+            body = get_body_html(stage_days, **_ARGS, schedule=schedule)
+            assert get_subject(stage_days, "INV-1", "Acme & Co", schedule=schedule) == subject
+            assert hashlib.sha256(body.encode()).hexdigest()[:16] == body_digest
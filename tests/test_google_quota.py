@@ -0,0 +1,172 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.core.config import settings
+from app.services import google_executor, google_gmail, google_quota
+from app.services.google_gmail import DraftRequest
+from app.services.google_quota import QuotaLimiter, TokenBucket, execute, is_rate_limited
+
+
+def _http_error(status: int, content: bytes = b"{}", **headers) -> HttpError:
+    resp = httplib2.Response({"status": status, **headers})
+    return HttpError(resp, content)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record time.sleep calls made by the quota module instead of sleeping."""
+    slept = []
+    monkeypatch.setattr(google_quota.time, "sleep", slept.append)
+    monkeypatch.setattr(google_quota, "_limiter", QuotaLimiter())
+    return slept
+
+
+def test_token_bucket_allows_burst_then_paces_at_rate():
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, clock=lambda: now[0])  # 1/s, burst of 10
+
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)  # queued behind the previous caller
+
+    now[0] = 12.0
+    assert bucket.reserve() == 0.0
+
+
+def test_per_user_buckets_are_separate(sleeps, monkeypatch):
+    monkeypatch.setattr(settings, "google_sheets_reads_per_minute", 0)
+    monkeypatch.setattr(settings, "google_sheets_reads_per_minute_per_user", 6)  # burst of 1
+    limiter = google_quota._limiter
+
+    assert limiter.acquire("sheets_read", "alice") == 0.0
+    assert limiter.acquire("sheets_read", "bob") == 0.0
+    assert limiter.acquire("sheets_read", "alice") == pytest.approx(10.0, abs=0.1)
+    assert limiter.acquire("drive", "alice") == 0.0  # no quota configured
+
+
+def test_rate_limit_detection():
+    assert is_rate_limited(_http_error(429))
+    assert is_rate_limited(_http_error(403, b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'))
+    assert not is_rate_limited(_http_error(403, b'{"error": {"errors": [{"reason": "forbidden"}]}}'))
+    assert not is_rate_limited(RuntimeError("429"))
+
+
+def test_execute_retries_429_honoring_retry_after(sleeps):
+    request = MagicMock()
+    request.execute.side_effect = [_http_error(429, **{"retry-after": "7"}), _http_error(429), {"ok": True}]
+
+    assert execute(request, "sheets_read") == {"ok": True}
+
+    assert request.execute.call_count == 3
+    first, second = sleeps
+    assert 7.0 <= first <= 7.0 + settings.google_api_backoff_seconds
+    assert settings.google_api_backoff_seconds <= second <= 2 * settings.google_api_backoff_seconds
+
+
+def test_execute_gives_up_on_other_errors_and_long_retry_after(sleeps, monkeypatch):
+    request = MagicMock()
+    request.execute.side_effect = _http_error(500)
+    with pytest.raises(HttpError):
+        execute(request, "sheets_write")
+    assert request.execute.call_count == 1
+
+    request.execute.side_effect = _http_error(429, **{"retry-after": "3600"})
+    with pytest.raises(HttpError):
+        execute(request, "sheets_write")
+    assert request.execute.call_count == 2
+    assert sleeps == []
+
+    monkeypatch.setattr(settings, "google_api_max_retries", 2)
+    request.execute.side_effect = _http_error(429)
+    with pytest.raises(HttpError):
+        execute(request, "sheets_write")
+    assert request.execute.call_count == 5
+    assert len(sleeps) == 2
+
+
+def test_batched_drafts_rejected_by_rate_limit_are_resent(sleeps):
+    calls = []
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.items = []
+
+        def add(self, request, request_id):
+            self.items.append(request_id)
+
+        def execute(self):
+            calls.append(list(self.items))
+            for request_id in self.items:
+                if request_id == "1" and len(calls) == 1:
+                    self.callback(request_id, None, _http_error(429))
+                else:
+                    self.callback(request_id, {"id": f"d{request_id}", "message": {"id": "m"}}, None)
+
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+    drafts = [DraftRequest(key=row, to="c@d.test", subject="s", body_html="b") for row in (2, 3, 4)]
+
+    with patch.object(google_gmail, "_gmail_service", return_value=service):
+        results = google_gmail.create_drafts_batch(object(), drafts)
+
+    assert calls == [["0", "1", "2"], ["1"]]
+    assert [r.draft_id for r in results] == ["d0", "d1", "d2"]
+    assert all(r.ok for r in results)
+    assert len(sleeps) == 1
+
+
+def test_failed_retry_pass_keeps_drafts_already_created(sleeps):
+    class FakeBatch:
+        passes = 0
+
+        def __init__(self, callback):
+            self.callback = callback
+            self.items = []
+
+        def add(self, request, request_id):
+            self.items.append(request_id)
+
+        def execute(self):
+            FakeBatch.passes += 1
+            if FakeBatch.passes > 1:
+                raise OSError("connection reset")
+            for request_id in self.items:
+                if request_id == "0":
+                    self.callback(request_id, {"id": "d0", "message": {"id": "m"}}, None)
+                else:
+                    self.callback(request_id, None, _http_error(429))
+
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = lambda callback: FakeBatch(callback)
+    drafts = [DraftRequest(key=row, to="c@d.test", subject="s", body_html="b") for row in (2, 3, 4)]
+
+    with patch.object(google_gmail, "_gmail_service", return_value=service):
+        results = google_gmail.create_drafts_batch(object(), drafts)
+
+    assert [(r.ok, r.draft_id) for r in results] == [(True, "d0"), (False, None), (False, None)]
+    assert results[1].error == "connection reset"
+
+
+@pytest.mark.asyncio
+async def test_throttled_daily_run_calls_do_not_starve_request_path_calls(monkeypatch):
+    monkeypatch.setattr(settings, "google_api_max_workers", 1)
+    monkeypatch.setattr(settings, "google_api_batch_max_workers", 1)
+    google_executor.shutdown_google_executor()
+    throttled = threading.Event()
+    try:
+        batch_call = asyncio.ensure_future(google_executor.run_google_batch_call(throttled.wait, 5))
+        thread = await asyncio.wait_for(
+            google_executor.run_google_call(lambda: threading.current_thread().name), 1
+        )
+        assert thread.startswith("google-api_")
+        assert not batch_call.done()
+    finally:
+        throttled.set()
+        assert await batch_call is True
+        google_executor.shutdown_google_executor()
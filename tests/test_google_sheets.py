@@ -0,0 +1,228 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import google_sheets
+from app.services.google_sheets import InvoiceSheet, SheetSnapshotCache
+from app.services.invoice_rows import InvoiceRow, invoice_rows
+
+
+def _sheet(rows: int, modified_time: str = "t1") -> InvoiceSheet:
+    sheet = InvoiceSheet.from_rows(
+        ["Invoice_Number"],
+        [{"Invoice_Number": f"INV-{i}", "_row_number": i + 2} for i in range(rows)],
+    )
+    sheet.modified_time = modified_time
+    return sheet
+
+
+def test_snapshot_cache_evicts_least_recently_used_by_row_count():
+    cache = SheetSnapshotCache(max_rows=10)
+    cache.put("a", _sheet(3))
+    cache.put("b", _sheet(3))
+    assert cache.get("a", "t1") is not None  # a is now most recent
+
+    cache.put("c", _sheet(3))  # 12 rows incl. headers > 10 → evict b
+
+    assert cache.get("b", "t1") is None
+    assert cache.get("a", "t1") is not None
+    assert cache.get("c", "t1") is not None
+
+
+def test_snapshot_cache_ignores_stale_and_oversized_entries():
+    cache = SheetSnapshotCache(max_rows=10)
+    cache.put("a", _sheet(3, modified_time="t1"))
+    assert cache.get("a", "t2") is None
+
+    cache.put("big", _sheet(20))
+    assert cache.get("big", "t1") is None
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    cache = SheetSnapshotCache(max_rows=100)
+    monkeypatch.setattr(google_sheets, "_snapshots", cache)
+    return cache
+
+
+def test_cached_stream_skips_full_read_while_unchanged(snapshots):
+    read = MagicMock(side_effect=lambda creds, sheet_id, columns=None: iter([_sheet(2, modified_time=None)]))
+    modified = MagicMock(return_value="2026-03-01T00:00:00.000Z")
+
+    with patch.object(google_sheets, "iter_invoice_sheet", read), patch.object(
+        google_sheets, "get_sheet_modified_time", modified
+    ):
+        [first] = list(google_sheets.iter_invoice_sheet_cached(object(), "sheet-1"))
+        [second] = list(google_sheets.iter_invoice_sheet_cached(object(), "sheet-1"))
+        modified.return_value = "2026-03-02T00:00:00.000Z"
+        [third] = list(google_sheets.iter_invoice_sheet_cached(object(), "sheet-1"))
+
+    assert read.call_count == 2
+    assert second.row_numbers == first.row_numbers
+    assert snapshots.get("sheet-1", "2026-03-01T00:00:00.000Z") is None
+    assert third.modified_time == "2026-03-02T00:00:00.000Z"
+
+
+def _fake_sheets_service(values: list[list[str]], row_count: int):
+    """Sheets service stub serving values.get ranges like 'A1:Z3' from ``values``."""
+    ranges = []
+
+    def values_get(spreadsheetId, range):
+        ranges.append(range)
+        first, last = (int(part.lstrip("AZ")) for part in range.split(":"))
+        request = MagicMock()
+        request.execute.return_value = {"values": values[first - 1:last]} if values[first - 1:last] else {}
+        return request
+
+    def values_batch_get(spreadsheetId, ranges, majorDimension, valueRenderOption):
+        assert majorDimension == "COLUMNS"
+        batch_ranges.append(ranges)
+        value_ranges = []
+        for cell_range in ranges:
+            start, stop = cell_range.split(":")
+            first, last = int(start[1:]), int(stop[1:])
+            columns = []
+            for column in range(ord(start[0]) - ord("A"), ord(stop[0]) - ord("A") + 1):
+                cells = [row[column] if column < len(row) else "" for row in values[first - 1:last]]
+                while cells and cells[-1] == "":
+                    cells.pop()
+                columns.append(cells)
+            while columns and not columns[-1]:
+                columns.pop()
+            value_ranges.append({"range": cell_range, "values": columns} if columns else {"range": cell_range})
+        request = MagicMock()
+        request.execute.return_value = {"valueRanges": value_ranges}
+        return request
+
+    batch_ranges = []
+    service = MagicMock()
+    service.spreadsheets.return_value.get.return_value.execute.return_value = {
+        "sheets": [{"properties": {"gridProperties": {"rowCount": row_count}}}]
+    }
+    service.spreadsheets.return_value.values.return_value.get.side_effect = values_get
+    service.spreadsheets.return_value.values.return_value.batchGet.side_effect = values_batch_get
+    service.batch_ranges = batch_ranges
+    return service, ranges
+
+
+def test_iter_invoice_sheet_reads_fixed_windows_to_grid_end():
+    values = [["Invoice_Number", "Amount"]] + [[f"INV-{n}", "1"] for n in range(2, 8)]
+    values[3] = []  # blank row 4 inside the data
+    service, ranges = _fake_sheets_service(values, row_count=9)
+
+    with patch.object(google_sheets, "_sheets_service", return_value=service):
+        windows = list(google_sheets.iter_invoice_sheet(object(), "sheet-1", window_rows=3))
+
+    assert ranges == ["A1:Z4", "A5:Z7", "A8:Z9"]
+    assert [w.row_numbers for w in windows] == [[2, 3, 4], [5, 6, 7], []]
+    assert windows[1].column("Invoice_Number") == ["INV-5", "INV-6", "INV-7"]
+    assert windows[0].column("Invoice_Number") == ["INV-2", "INV-3", ""]
+
+
+@pytest.mark.parametrize("columns", [None, ("Invoice_Number",)])
+def test_blank_row_on_window_boundary_does_not_end_the_read(columns, monkeypatch):
+    monkeypatch.setattr(google_sheets, "_headers", google_sheets.SheetHeaderCache(max_sheets=10))
+    # Row 4 (the last row of the first window) is blank; the API trims it
+    values = [["Invoice_Number", "Amount"], ["INV-2", "1"], ["INV-3", "1"], [], ["INV-5", "1"]]
+    service, _ = _fake_sheets_service(values, row_count=6)
+
+    with patch.object(google_sheets, "_sheets_service", return_value=service):
+        windows = list(google_sheets.iter_invoice_sheet(object(), "sheet-1", window_rows=3, columns=columns))
+
+    invoices = [v for w in windows for v in w.column("Invoice_Number") if v]
+    assert invoices == ["INV-2", "INV-3", "INV-5"]
+
+
+def test_column_reads_fetch_only_requested_columns_with_cached_headers(monkeypatch):
+    monkeypatch.setattr(google_sheets, "_headers", google_sheets.SheetHeaderCache(max_sheets=10))
+    values = [
+        ["Notes", "Invoice_Number", "Formula", "Paid"],
+        ["x", "INV-2", "=1", "TRUE"],
+        ["x", "INV-3", "=1"],
+        ["x", "", "=1"],
+        ["x", "INV-5", "=1", "yes"],
+    ]
+    service, ranges = _fake_sheets_service(values, row_count=6)
+    columns = ("Invoice_Number", "Paid", "Missing")
+
+    def read():
+        with patch.object(google_sheets, "_sheets_service", return_value=service):
+            return list(google_sheets.iter_invoice_sheet(object(), "sheet-1", window_rows=2, columns=columns))
+
+    # Cache miss: the header row is read once, not again in the first batchGet
+    first, second, third = read()
+    assert ranges == ["A1:Z1"]
+    assert service.batch_ranges == [["B1:B3", "D1:D3"], ["B4:B5", "D4:D5"], ["B6:B6", "D6:D6"]]
+    assert first.headers == values[0]
+    assert set(first.columns) == {"Invoice_Number", "Paid"}
+    assert first.column("Paid") == ["TRUE", ""]
+    assert second.row_numbers == [4, 5]
+    assert second.column("Invoice_Number") == ["", "INV-5"]
+    assert third.row_numbers == []
+
+    # Headers are cached: the next read goes straight to batchGet, which
+    # re-checks the header row
+    read()
+    assert ranges == ["A1:Z1"]
+    assert service.batch_ranges[-3] == ["B1:B3", "D1:D3", "A1:Z1"]
+
+    # A moved column is caught by the header check in the first request
+    for row in values:
+        row.insert(0, "")
+    [first, _, _] = read()
+    assert ranges == ["A1:Z1"]
+    assert service.batch_ranges[-4:-2] == [["B1:B3", "D1:D3", "A1:Z1"], ["C1:C3", "E1:E3"]]
+    assert first.column("Invoice_Number") == ["INV-2", "INV-3"]
+
+    # So is a requested column added after the headers were cached
+    values[0].append("Missing")
+    values[1].append("x")
+    [first, _, _] = read()
+    assert service.batch_ranges[-4:-2] == [["C1:C3", "E1:E3", "A1:Z1"], ["C1:C3", "E1:E3", "F1:F3"]]
+    assert first.column("Missing") == ["x", ""]
+    read()
+    assert service.batch_ranges[-3] == ["C1:C3", "E1:E3", "F1:F3", "A1:Z1"]
+
+
+def test_from_values_pads_short_rows_column_wise():
+    sheet = InvoiceSheet.from_values([
+        ["Invoice_Number", "Amount", "Paid"],
+        ["INV-1", "$10"],
+        ["INV-2", "$20", "TRUE"],
+        [],
+    ])
+
+    assert sheet.row_numbers == [2, 3, 4]
+    assert sheet.column("Paid") == ["", "TRUE", ""]
+    assert sheet.column("Missing") == ["", "", ""]
+    assert sheet.row(0) == {"Invoice_Number": "INV-1", "Amount": "$10", "Paid": "", "_row_number": 2}
+    assert len(sheet.rows) == 3
+
+
+def test_invoice_rows_parse_each_cell_once_into_slotted_records():
+    sheet = InvoiceSheet.from_values([
+        ["Invoice_Number", "Client_Email", "Amount", "Due_Date", "Paid", "Last_Stage_Sent", "Last_Sent_At"],
+        [" INV-1 ", "a@b.test", "$1,250.50", "02/01/2026", "", "14", "2026-02-20"],
+        ["INV-2", "c@d.test", "oops", "", "yes"],
+    ])
+
+    first, second = invoice_rows(sheet)
+
+    assert not hasattr(first, "__dict__")
+    assert first == InvoiceRow(
+        row_number=2,
+        invoice_number="INV-1",
+        client_name="",
+        client_email="a@b.test",
+        amount=Decimal("1250.50"),
+        due_date=date(2026, 2, 1),
+        paid=False,
+        last_stage=14,
+        last_sent=date(2026, 2, 20),
+        amount_text="$1,250.50",
+        due_date_text="02/01/2026",
+    )
+    assert (second.amount, second.due_date, second.paid, second.last_stage) == (Decimal("0"), None, True, None)
+    assert [r.row_number for r in invoice_rows(sheet, [1])] == [3]
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from cryptography.fernet import Fernet
+
+from app.services import google_tokens
+
+
+@pytest.fixture(autouse=True)
+def encryption_key(monkeypatch):
+    monkeypatch.setattr(google_tokens.settings, "google_token_encryption_key", Fernet.generate_key().decode())
+    monkeypatch.setattr(google_tokens, "_access_token_cache", {})
+
+
+def _user(**overrides):
+    user = SimpleNamespace(
+        id=uuid4(),
+        google_refresh_token_encrypted=None,
+        google_token_revoked=False,
+        google_access_token_encrypted=None,
+        google_access_token_expires_at=None,
+    )
+    user.google_refresh_token_encrypted = google_tokens.encrypt_token("refresh-token")
+    for key, value in overrides.items():
+        setattr(user, key, value)
+    return user
+
+
+def test_persisted_access_token_is_reused_across_processes():
+    user = _user()
+    expiry = datetime.utcnow() + timedelta(hours=1)
+    creds = SimpleNamespace(token="access-1", expiry=expiry)
+
+    assert google_tokens.remember_access_token(user, creds) is True
+    assert google_tokens.remember_access_token(user, creds) is False  # unchanged row
+
+    google_tokens._access_token_cache.clear()  # simulate a cold start
+    rebuilt = google_tokens.get_google_credentials(user)
+    assert rebuilt.token == "access-1"
+    assert rebuilt.expiry == expiry
+
+
+def test_token_inside_refresh_margin_is_not_reused():
+    user = _user()
+    google_tokens.remember_access_token(
+        user, SimpleNamespace(token="access-1", expiry=datetime.utcnow() + timedelta(seconds=30))
+    )
+
+    assert google_tokens.get_google_credentials(user).token is None
+
+
+@pytest.mark.asyncio
+async def test_ensure_fresh_credentials_skips_refresh_for_cached_token():
+    user = _user()
+    google_tokens.remember_access_token(
+        user, SimpleNamespace(token="access-1", expiry=datetime.utcnow() + timedelta(hours=1))
+    )
+    creds = google_tokens.get_google_credentials(user)
+    refresh = MagicMock()
+
+    with patch.object(type(creds), "refresh", refresh):
+        await google_tokens.ensure_fresh_credentials(user, creds)
+
+    refresh.assert_not_called()
+
+
+def test_forget_access_token_clears_both_caches():
+    user = _user()
+    google_tokens.remember_access_token(
+        user, SimpleNamespace(token="access-1", expiry=datetime.utcnow() + timedelta(hours=1))
+    )
+
+    google_tokens.forget_access_token(user)
+
+    assert user.google_access_token_encrypted is None
+    assert user.id not in google_tokens._access_token_cache
+    assert google_tokens.get_google_credentials(user).token is None
@@ -12,10 +12,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from invoice_collector.router import (
     days_overdue,
     stage_for,
+    stage_for_many,
     should_send,
     get_next_stage,
     days_until_next_stage,
 )
+from invoice_collector.config import DEFAULT_STAGES, parse_stages
 
 
 class TestDaysOverdue:
@@ -79,6 +81,10 @@ class TestStageFor:
         assert stage_for(1) is None
         assert stage_for(6) is None
 
+    def test_stage_for_many_matches_stage_for(self):
+        days = list(range(-3, 60)) + [365]
+        assert stage_for_many(days) == [stage_for(d) for d in days]
+
 
 class TestShouldSend:
     """Test should_send logic"""
@@ -130,6 +136,22 @@ class TestGetNextStage:
     def test_final_stage(self):
         assert get_next_stage(42) is None
 
+    def test_unknown_stage(self):
+        assert get_next_stage(10) is None
+
+
+class TestParseStages:
+    """Test REMINDER_STAGES parsing"""
+
+    def test_blank_entries_and_empty_value(self):
+        assert parse_stages(" 30, 45,60, ") == [30, 45, 60]
+        assert parse_stages("") == DEFAULT_STAGES
+
+    @pytest.mark.parametrize("value", ["14,7", "7,7", "0,7", "7,abc", "1,2,3,4,5,6,7", "400"])
+    def test_invalid_values(self, value):
+        with pytest.raises(ValueError, match="REMINDER_STAGES"):
+            parse_stages(value)
+
 
 class TestDaysUntilNextStage:
     """Test days until next stage calculation"""
@@ -1,6 +1,7 @@
 """
 Tests for template rendering
 """
+import os
 import pytest
 from pathlib import Path
 import sys
@@ -9,6 +10,7 @@ from tempfile import NamedTemporaryFile
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from invoice_collector import emailer
 from invoice_collector.emailer import render_template, template_path_for
 
 
@@ -86,6 +88,42 @@ class TestTemplateRendering:
 
             Path(f.name).unlink()
 
+    def test_values_are_substituted_in_one_pass(self):
+        """Placeholder text inside a value is not substituted again"""
+        with NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write("Subject: {{a}}\n\n{{a}} / {{b}}")
+            f.flush()
+
+            subject, body = render_template(Path(f.name), {"a": "{{b}}", "b": "B"})
+
+            assert subject == "{{b}}"
+            assert body == "{{b}} / B"
+
+            Path(f.name).unlink()
+
+    def test_parsed_template_is_cached_until_file_changes(self, tmp_path, monkeypatch):
+        """The file is re-read only when its mtime or size changes"""
+        template = tmp_path / "stage_07.txt"
+        template.write_text("Subject: Hi {{name}}\n\nOld body")
+        reads = []
+        real_open = open
+        monkeypatch.setattr(
+            "builtins.open",
+            lambda path, *a, **kw: reads.append(path) or real_open(path, *a, **kw),
+        )
+
+        assert render_template(template, {"name": "A"}) == ("Hi A", "Old body")
+        assert render_template(template, {"name": "B"}) == ("Hi B", "Old body")
+        assert len(reads) == 1
+
+        template.write_text("Subject: Hello {{name}}\n\nNew body")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert render_template(template, {"name": "C"}) == ("Hello C", "New body")
+        assert len(reads) == 2
+        assert emailer._template_cache[template][0][0] == template.stat().st_mtime_ns
+
 
 class TestActualTemplates:
     """Test actual template files exist and are valid"""